@@ -0,0 +1,176 @@
+"""
+Benchmark of the ArgumentParser.parse() overhead (tokenizing is cached, so it measures the arguments
+checking, type-casting and the result object creation) for a command with 6 arguments and 4 stack arguments:
+
+* baseline parsing (as it was before the compiled plan: the plan is recomputed on every parse, arguments are
+  type-casted with the exceptions and stored in the :class:`Context`)
+* parsing by the compiled plan (eager and lazy arguments). Lazy arguments are not accessed by the command,
+  so they are never type-casted
+* parsing of the command with the one expensive argument (list of the 1000 ints), that is not accessed
+  by the command, eager and lazy
+
+Before the measuring, it checks that the subcommands with the arguments are parsed (by both tokenizers)
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/bench_argumentparser.py
+"""
+
+import asyncio
+import timeit
+
+from ezbotf.argumentparser import _casts, Argument, ArgumentParser, ArgumentParseError, Cast, ReplyToArgument
+from ezbotf.context import Context
+from ezbotf.plugin import Plugin
+
+PARSES  = 20_000
+NUMBER  = 5
+
+LIST_VALUES  = 1000
+LIST_PARSES  = 2000
+
+
+class FakeEvent:
+    reply_to  = None
+    chat_id   = 0
+
+
+async def command(event, args):
+    pass
+
+
+class BaselineParser(ArgumentParser):
+    """Parser with the parsing as it was before the compiled plan (subcommands and reply-to are not used)"""
+
+    async def parse(self, text, event, command_func):
+        self.logger.debug('ArgumentParser called with text: {}', text)
+
+        args = text.split(maxsplit=2)
+
+        output_args         = Context()
+        output_args.PREFIX  = args[0]
+        output_args.CMD     = args[1]
+        temp_args           = self._cached_check(args[2]) if len(args) > 2 else []
+
+        if len(self.arguments) > 0 and isinstance(self.arguments[0], ReplyToArgument):
+            raise NotImplementedError
+
+        if len(temp_args) < self.position_arguments:
+            return ArgumentParseError.TooLittleArguments
+
+        if len(temp_args) > self.position_arguments + self.default_arguments + self.stack_arguments:
+            return ArgumentParseError.TooManyArguments
+
+        for arg in self.arguments:
+            if arg.default:
+                setattr(output_args, arg.arg_name, arg.default)
+
+        for arg, targ in zip(self.arguments, temp_args):
+            error, result = arg.typecast(targ)
+
+            if error:
+                return ArgumentParseError.IncorrectType
+
+            setattr(output_args, arg.arg_name, result)
+
+        if self.stack_arguments != 0:
+            output_args.STACK = []
+
+            for arg, targ in zip([None] * len(self.arguments) + [0] * self.stack_arguments, temp_args):
+                if arg is None:
+                    continue
+
+                output_args.STACK.append(targ)
+
+        await command_func(event, output_args)
+
+
+def check_subcommands() -> bool:
+    """Checks, that the subcommands get their arguments and the wrong subcommands are rejected"""
+
+    correct = True
+
+    for legacy_tokenizer in [False, True]:
+        plugin         = Plugin()
+        plugin.config  = {'name': 'bench'}
+        parser         = ArgumentParser(plugin, [], subcommands=True, main_command_aliases='m',
+                                        legacy_tokenizer=legacy_tokenizer)
+        calls          = []
+
+        @parser.subcommand('s', [Argument('a', Cast.IntCast), Argument('b', Cast.StrCast, default='b')])
+        async def sub(event, args):
+            calls.append((args.CMD, args.a, args.b))
+
+        for text, expected_result, expected_calls in [('ez m s 5', None, [('s', 5, 'b')]),
+                                                      ('ez m s 5 x', None, [('s', 5, 'x')]),
+                                                      ('ez m s', ArgumentParseError.TooLittleArguments, []),
+                                                      ('ez m', ArgumentParseError.TooLittleArguments, []),
+                                                      ('ez m t 5', ArgumentParseError.IncorrectSubcommand, [])]:
+            calls.clear()
+            result = asyncio.run(parser.parse(text, FakeEvent(), plugin.commands['m']))
+
+            if result != expected_result or calls != expected_calls:
+                correct = False
+                print(f'  wrong parsing of {text!r} (legacy tokenizer: {legacy_tokenizer}): {result}, {calls}')
+
+    print(f'subcommands are parsed {"correctly" if correct else "incorrectly"}')
+
+    return correct
+
+
+def make_parser(lazy: bool, parser_class: type[ArgumentParser] = ArgumentParser) -> ArgumentParser:
+    return parser_class(None,
+                          [Argument('a', Cast.IntCast, lazy=lazy),
+                           Argument('b', Cast.FloatCast, lazy=lazy),
+                           Argument('c', Cast.StrCast, lazy=lazy),
+                           Argument('d', Cast.IntCast, default=5, lazy=lazy),
+                           Argument('e', Cast.StrCast, default='e', lazy=lazy),
+                           Argument('f', Cast.FloatCast, default=1.5, lazy=lazy)],
+                          stack_arguments=4)
+
+
+def make_list_parser(lazy: bool) -> ArgumentParser:
+    return ArgumentParser(None, [Argument('values', _casts.ListCast(',', Cast.IntCast), lazy=lazy)])
+
+
+def measure(parser: ArgumentParser, text: str, parses: int) -> float:
+    event = FakeEvent()
+
+    async def run():
+        for _ in range(parses):
+            assert await parser.parse(text, event, command) is None
+
+    return min(timeit.repeat(lambda: asyncio.run(run()), number=1, repeat=NUMBER)) / parses
+
+
+def main():
+    if not check_subcommands():
+        raise SystemExit(1)
+
+    text     = 'ez cmd 1 2.5 text 7 word 3.5 s1 s2 s3 s4'
+    results  = {}
+
+    print('6 arguments and 4 stack arguments:')
+
+    for name, parser in [('baseline', make_parser(False, BaselineParser)),
+                         ('eager', make_parser(False)),
+                         ('lazy', make_parser(True))]:
+        results[name] = measure(parser, text, PARSES)
+
+        print(f'  {name:8} {results[name] * 1e6:8.2f} us per parse')
+
+    print(f'  speedup (baseline / eager): {results["baseline"] / results["eager"]:.2f}x')
+    print(f'  speedup (eager / lazy):     {results["eager"] / results["lazy"]:.2f}x')
+
+    text = 'ez cmd ' + ','.join(str(i) for i in range(LIST_VALUES))
+
+    print(f'1 list argument with {LIST_VALUES} ints (not accessed):')
+
+    for name, lazy in [('eager', False), ('lazy', True)]:
+        results[name] = measure(make_list_parser(lazy), text, LIST_PARSES)
+
+        print(f'  {name:8} {results[name] * 1e6:8.2f} us per parse')
+
+    print(f'  speedup (eager / lazy):     {results["eager"] / results["lazy"]:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
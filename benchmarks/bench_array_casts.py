@@ -0,0 +1,90 @@
+"""
+Benchmark of the type-casting of the long lists of the numbers. Compares the ListCast (list of the boxed numbers)
+with the ArrayCast (compact array), parsed by NumPy (if it is installed) and by the pure-Python bulk path.
+Before the measuring, it checks that both paths of the ArrayCast accept the same strings with the same results
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/bench_array_casts.py
+"""
+
+import sys
+import random
+import timeit
+
+from ezbotf.argumentparser import _casts, Cast
+
+VALUES  = 10_000
+NUMBER  = 50
+
+# strings to check, that both paths of the ArrayCast accept the same input set
+CHECKED_STRINGS = ['1, 2, 3', '-1, +2, 3', '1,2,3', '1, 2,3', ' 1, 2', '1, 2 ', '1,  2', '', ', ', '1, ', '1_000, 2',
+                   '1.5, 2', '1e3, 2', '.5, 5., -0.0', 'inf, -inf, nan, NaN, Infinity', '0x10, 1', '١, 2',
+                   '9' * 30 + ', 1', '1e400, 1', '1 2 3', '1\n2', '1, 2\n3, 4', '"1", 2', '1#2', 'a, b']
+
+# random strings of these characters are checked too
+RANDOM_STRINGS   = 2000
+RANDOM_ALPHABET  = '0123456789+-.eE, _inaf\n\t"#\u0661'
+
+
+def list_size(values: list) -> int:
+    return sys.getsizeof(values) + sum(sys.getsizeof(v) for v in values)
+
+
+def check_paths() -> bool:
+    """Checks, that both paths of the ArrayCast accept the same strings with the same results"""
+
+    if _casts.numpy is None:
+        print('NumPy is not installed, paths of the ArrayCast are not compared')
+        return True
+
+    rnd      = random.Random(0)
+    strings  = CHECKED_STRINGS + [''.join(rnd.choice(RANDOM_ALPHABET) for _ in range(rnd.randrange(12)))
+                                  for _ in range(RANDOM_STRINGS)]
+    agree    = True
+
+    for typecode in 'qd':
+        for splitter in [', ', ',', ' ']:
+            pure   = _casts.ArrayCast(typecode, splitter, use_numpy=False)
+            numpy  = _casts.ArrayCast(typecode, splitter)
+
+            for string in strings:
+                results = [pure.try_cast(string), numpy.try_cast(string)]
+                results = [r if r is _casts.INVALID else r.tobytes() for r in results]
+
+                if results[0] != results[1]:
+                    agree = False
+                    print(f'  paths disagree: type code {typecode!r}, splitter {splitter!r}, string {string!r}')
+
+    print(f'paths of the ArrayCast {"agree" if agree else "disagree"} on {len(strings)} strings')
+
+    return agree
+
+
+def main():
+    if not check_paths():
+        raise SystemExit(1)
+
+    rnd = random.Random(0)
+
+    for name, values, list_cast, typecode in [
+        ('int', [str(rnd.randrange(-10**9, 10**9)) for _ in range(VALUES)], Cast.IntCast, 'q'),
+        ('float', [repr(rnd.uniform(-1e6, 1e6)) for _ in range(VALUES)], Cast.FloatCast, 'd')
+    ]:
+        string  = ', '.join(values)
+        casts   = [('ListCast', _casts.ListCast(values_type=list_cast)),
+                   ('ArrayCast (pure)', _casts.ArrayCast(typecode, use_numpy=False))]
+
+        if _casts.numpy is not None:
+            casts.append(('ArrayCast (numpy)', _casts.ArrayCast(typecode)))
+
+        print(f'{VALUES} {name} values:')
+
+        for cast_name, cast in casts:
+            seconds  = min(timeit.repeat(lambda: cast.typecast(string), number=NUMBER, repeat=5)) / NUMBER
+            result   = cast.typecast(string)
+            size     = list_size(result) if isinstance(result, list) else sys.getsizeof(result)
+
+            print(f'  {cast_name:18} {seconds * 1000:7.3f} ms  {size / 1024:7.1f} KB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark of the senders resolving under the burst of the disallowed commands (raid).
+Compares the per-message resolving (every update is handled by own task, as Telethon does) with the
+UpdateBatcher, that resolves senders of the whole batch by one request.
+Client is simulated: requests are executed one by one with the fixed latency
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/bench_batching.py
+"""
+
+import time
+import random
+import asyncio
+
+from ezbotf.batcher import UpdateBatcher
+from ezbotf.entitycache import EntityCache
+
+MESSAGES  = 2000
+SENDERS   = 400
+LATENCY   = 0.002
+WINDOW    = 0.005
+
+
+class FakeEntity:
+    def __init__(self, entity_id: int):
+        self.id = entity_id
+
+
+class FakeClient:
+    """Executes requests one by one with the fixed latency and counts them"""
+
+    def __init__(self):
+        self.requests  = 0
+        self.lock      = asyncio.Lock()
+
+    async def get_entity(self, entity):
+        async with self.lock:
+            self.requests += 1
+            await asyncio.sleep(LATENCY)
+
+        if isinstance(entity, list):
+            return [FakeEntity(e) for e in entity]
+
+        return FakeEntity(entity)
+
+
+class FakeEvent:
+    def __init__(self, client: FakeClient, sender_id: int):
+        self.client     = client
+        self.sender_id  = sender_id
+
+    async def get_sender(self):
+        return await self.client.get_entity(self.sender_id)
+
+
+async def burst(handler, events: list[FakeEvent], interval: float):
+    """Delivers the events with the interval, as the client does"""
+
+    for event in events:
+        await handler(event)
+
+        if interval:
+            await asyncio.sleep(interval)
+
+
+async def per_message(senders: list[int]) -> tuple[float, int]:
+    client  = FakeClient()
+    cache   = EntityCache(client)
+    events  = [FakeEvent(client, s) for s in senders]
+    tasks   = []
+
+    async def handler(event: FakeEvent):
+        tasks.append(asyncio.get_running_loop().create_task(cache.resolve_sender(event)))
+
+    start = time.perf_counter()
+
+    await burst(handler, events, 0)
+    await asyncio.gather(*tasks)
+
+    return time.perf_counter() - start, client.requests
+
+
+async def batched(senders: list[int]) -> tuple[float, int]:
+    client  = FakeClient()
+    cache   = EntityCache(client)
+    events  = [FakeEvent(client, s) for s in senders]
+    done    = asyncio.Event()
+    handled = 0
+
+    async def handle_batch(batch: list[FakeEvent]):
+        nonlocal handled
+
+        await cache.resolve_many({e.sender_id for e in batch})
+
+        for event in batch:
+            await cache.resolve_sender(event)
+
+        handled += len(batch)
+
+        if handled == len(events):
+            done.set()
+
+    batcher = UpdateBatcher(handle_batch, WINDOW)
+
+    start = time.perf_counter()
+
+    await burst(batcher, events, 0)
+    await done.wait()
+
+    return time.perf_counter() - start, client.requests
+
+
+def main():
+    rnd      = random.Random(0)
+    senders  = [rnd.randrange(SENDERS) for _ in range(MESSAGES)]
+
+    old_time, old_requests = asyncio.run(per_message(senders))
+    new_time, new_requests = asyncio.run(batched(senders))
+
+    print(f'Burst of {MESSAGES} messages from {SENDERS} senders, request latency {LATENCY * 1000:.1f} ms')
+    print(f'per-message:  {old_time * 1000:9.1f} ms  {old_requests:5d} requests')
+    print(f'batched:      {new_time * 1000:9.1f} ms  {new_requests:5d} requests  (window {WINDOW * 1000:.1f} ms)')
+    print(f'speedup:      {old_time / new_time:9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark of the failed type-casts. Compares the exception-based Argument.typecast() (as the ArgumentParser
+did it before) with the validating ArgTypeCast.try_cast(), called by the compiled plan of the ArgumentParser,
+for the different rates of the correct arguments.
+Incorrect numbers are checked in two kinds: words and typos, that start as a number. Both are rejected
+without the exception
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/bench_casts.py
+"""
+
+import timeit
+
+from ezbotf.argumentparser import _casts, Argument, Cast
+
+ARGUMENTS  = 10_000
+NUMBER     = 20
+REPEAT     = 9
+RATES      = [1.0, 0.9, 0.5, 0.0]
+
+
+def make_inputs(valid: str, invalid: str, rate: float) -> list[str]:
+    return [valid if i < ARGUMENTS * rate else invalid for i in range(ARGUMENTS)]
+
+
+def main():
+    print(f'{ARGUMENTS} arguments, us per argument (old: typecast with exception, new: try_cast)')
+    print(f'{"cast":10} {"valid":>6} {"old":>8} {"new":>8} {"speedup":>8}')
+
+    for name, cast, valid, invalid in [('int word', Cast.IntCast, '12345', 'twelve'),
+                                       ('int typo', Cast.IntCast, '12345', '12a45'),
+                                       ('float word', Cast.FloatCast, '3.1415', 'pi'),
+                                       ('float typo', Cast.FloatCast, '3.1415', '3,1415'),
+                                       ('float dots', Cast.FloatCast, '3.1415', '3.14.15'),
+                                       ('bool', Cast.BoolCast, 'Yes', 'maybe')]:
+        argument  = Argument('arg', cast)
+        try_cast  = argument.arg_type.try_cast
+        default   = argument.default
+
+        for rate in RATES:
+            inputs = make_inputs(valid, invalid, rate)
+
+            def old():
+                for string in inputs:
+                    error, result = argument.typecast(string)
+
+            def new():
+                for string in inputs:
+                    result = try_cast(string) if string != '' else default
+                    error  = result is _casts.INVALID
+
+            old_time = min(timeit.repeat(old, number=NUMBER, repeat=REPEAT)) / NUMBER / ARGUMENTS
+            new_time = min(timeit.repeat(new, number=NUMBER, repeat=REPEAT)) / NUMBER / ARGUMENTS
+
+            print(f'{name:10} {rate:6.0%} {old_time * 1e6:8.3f} {new_time * 1e6:8.3f} {old_time / new_time:7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark of the ezlog records:
+
+* records of the disabled level (the handler has higher level), as the debug records of the framework in production
+* throughput (records per second) of the enabled records with the old formatting (``str.format()`` of the
+  formatter strings on every record) and with the compiled formatters
+* time of the logging thread to record to the slow IO (the write and flush have a latency, as the disk)
+  with the synchronous handler and with the background writer (:class:`ezlog.QueueLoggerHandler`)
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/bench_ezlog.py
+"""
+
+import io
+import time
+import timeit
+import colorama
+
+from datetime import datetime
+
+from ezbotf import ezlog
+
+RECORDS  = 100_000
+NUMBER   = 5
+
+SLOW_RECORDS  = 2000
+IO_LATENCY    = 0.0002
+
+
+class OldFormatLogger(ezlog.Logger):
+    """Logger with the formatting as it was before the compiled formatters"""
+
+    def format_now(self) -> str:
+        return self.format_time(datetime.now())
+
+    def format_time(self, time: datetime) -> str:
+        return self.time_formatter.format(year=time.year,
+                                          month=time.month,
+                                          day=time.day,
+                                          hour=time.hour,
+                                          minute=time.minute,
+                                          second=time.second,
+                                          microsecond=str(time.microsecond)[:4])
+
+    def format_message(self, message: str, args_str: list[str], level_str: str, time_str: str) -> str:
+        return self.formatter.format(message=message.format(*args_str),
+                                     time=time_str,
+                                     name=self.name,
+                                     group_name=self.group.name if self.group is not None else 'NoGroup',
+                                     level=level_str,
+                                     color=colorama.Fore,
+                                     reset=ezlog.reset)
+
+
+class SlowIO(io.StringIO):
+    """IO with the latency of every flush"""
+
+    def flush(self):
+        time.sleep(IO_LATENCY)
+
+
+def measure_slow_io(handler: ezlog.LoggerHandler) -> float:
+    logger  = ezlog.Logger('Logger', handlers=[handler])
+    start   = time.perf_counter()
+
+    for i in range(SLOW_RECORDS):
+        logger.info('Command {} is executed', i)
+
+    return time.perf_counter() - start
+
+
+def measure(logger: ezlog.Logger, level: int) -> float:
+    text = 'ez cmd 1 2.5 text 7 word 3.5 s1 s2 s3 s4'
+
+    def run():
+        for _ in range(RECORDS):
+            logger.record('ArgumentParser called with text: {}', text, level=level)
+
+    return min(timeit.repeat(run, number=1, repeat=NUMBER))
+
+
+def main():
+    group = ezlog.LoggerGroup('Bench', handlers=[ezlog.LoggerHandler(io.StringIO(), log_level=ezlog.LogLevel.INFO),
+                                                 ezlog.LoggerHandler(io.StringIO(), log_level=ezlog.LogLevel.INFO,
+                                                                     colors=False)])
+
+    seconds = measure(ezlog.Logger('Logger', group=group), ezlog.LogLevel.DEBUG)
+    print(f'disabled level:  {seconds / RECORDS * 1e6:.3f} us per record')
+
+    print('enabled level (colored and plain handlers):')
+
+    results = {}
+
+    for name, logger_class in [('old', OldFormatLogger), ('compiled', ezlog.Logger)]:
+        for handler in group.handlers:
+            handler.io = io.StringIO()
+
+        results[name] = RECORDS / measure(logger_class('Logger', group=group), ezlog.LogLevel.INFO)
+
+        print(f'  {name:9} {results[name]:10.0f} records/s')
+
+    print(f'  speedup   {results["compiled"] / results["old"]:10.2f}x')
+
+    print(f'slow IO ({IO_LATENCY * 1e6:.0f} us per flush), time of the logging thread:')
+
+    sync_seconds   = measure_slow_io(ezlog.LoggerHandler(SlowIO(), log_level=ezlog.LogLevel.INFO, colors=False))
+    queue_handler  = ezlog.QueueLoggerHandler(SlowIO(), log_level=ezlog.LogLevel.INFO, colors=False)
+    queue_seconds  = measure_slow_io(queue_handler)
+
+    queue_handler.close()
+
+    print(f'  sync      {sync_seconds / SLOW_RECORDS * 1e6:10.2f} us per record')
+    print(f'  queued    {queue_seconds / SLOW_RECORDS * 1e6:10.2f} us per record '
+          f'({queue_handler.writes} writes of {queue_handler.written} records)')
+
+
+if __name__ == '__main__':
+    main()
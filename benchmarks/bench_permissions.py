@@ -0,0 +1,71 @@
+"""
+Benchmark of the permissions check with 100k users.
+Compares the utils.have_permissions() scan with the PermissionIndex
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/bench_permissions.py
+"""
+
+import random
+import timeit
+
+from ezbotf.permissions import Permissions, PermissionIndex, RequiredPermissions
+from ezbotf.utils import have_permissions
+
+USERS   = 100_000
+CHECKS  = 100_000
+NUMBER  = 5
+
+
+def make_permissions() -> dict[str, list[str | int]]:
+    """Makes permissions of the users as they are loaded from the TOML file (string keys)"""
+
+    rnd          = random.Random(0)
+    permissions  = {}
+
+    for user_id in range(USERS):
+        user_permissions = [rnd.randint(Permissions.User, Permissions.Danger)]
+        user_permissions += [f'plugin{rnd.randint(0, 20)}.command{rnd.randint(0, 10)}' for _ in range(rnd.randint(0, 8))]
+
+        permissions[str(user_id)] = user_permissions
+
+    return permissions
+
+
+def main():
+    rnd          = random.Random(1)
+    permissions  = make_permissions()
+    index        = PermissionIndex(permissions)
+
+    commands_permissions = [[Permissions.User, 'plugin1.command1'],
+                            [Permissions.Admin, 'plugin2.command5'],
+                            ['plugin3.command3'],
+                            [Permissions.Danger]]
+    required = [RequiredPermissions(p) for p in commands_permissions]
+
+    # active users send the most part of the commands
+    checks = [(rnd.choice(range(1000)) if rnd.random() < 0.8 else rnd.randrange(USERS * 2), rnd.randrange(4))
+              for _ in range(CHECKS)]
+
+    def old():
+        for user_id, c in checks:
+            have_permissions(user_id, permissions, commands_permissions[c])
+
+    def new():
+        for user_id, c in checks:
+            index.check(user_id, required[c])
+
+    # results of both ways must be equal
+    assert all(have_permissions(u, permissions, commands_permissions[c]) == index.check(u, required[c])
+               for u, c in checks)
+
+    old_time = timeit.timeit(old, number=NUMBER) / NUMBER
+    new_time = timeit.timeit(new, number=NUMBER) / NUMBER
+
+    print(f'users: {USERS}, checks: {CHECKS}')
+    print(f'have_permissions: {old_time * 1000:.3f} ms ({old_time / CHECKS * 1e9:.0f} ns/check)')
+    print(f'PermissionIndex:  {new_time * 1000:.3f} ms ({new_time / CHECKS * 1e9:.0f} ns/check)')
+    print(f'speedup:          {old_time / new_time:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
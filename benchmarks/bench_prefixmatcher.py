@@ -0,0 +1,82 @@
+"""
+Microbenchmark of the command detection in the BotInstance.handle_message().
+Compares the old path (split of the whole text + prefix scan) with the PrefixMatcher
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/bench_prefixmatcher.py
+"""
+
+import random
+import timeit
+
+from ezbotf.prefixmatcher import PrefixMatcher
+
+PREFIXES = ['ez', 'easy', 'изи', 'ізі']
+NUMBER   = 20
+
+
+def make_messages(count: int = 10_000, commands_rate: float = 0.05) -> list[str]:
+    """Makes a realistic mix of the chat messages: short messages, long messages (up to 4 KB) and commands"""
+
+    rnd    = random.Random(0)
+    words  = ['hello', 'lol', 'what', 'ok', 'ezpz', 'easy', 'go', 'https://t.me/some_link', 'изи', 'привет']
+
+    messages = []
+
+    for _ in range(count):
+        if rnd.random() < commands_rate:
+            messages.append(f'{rnd.choice(PREFIXES)} cmd arg1 "arg 2" 3')
+            continue
+
+        length = rnd.choice([3, 8, 20, 700])  # 700 words is about 4 KB
+        messages.append(' '.join(rnd.choice(words) for _ in range(length)))
+
+    return messages
+
+
+def old_path(messages: list[str]) -> int:
+    found = 0
+
+    for text in messages:
+        if not (len(text) > 0):
+            continue
+
+        args = text.split(' ')
+
+        if not len(args) > 1:
+            continue
+
+        if not any([p in args[0] for p in PREFIXES]):
+            continue
+
+        found += 1
+
+    return found
+
+
+def new_path(messages: list[str], matcher: PrefixMatcher) -> int:
+    found = 0
+
+    for text in messages:
+        if matcher.match(text) is None:
+            continue
+
+        found += 1
+
+    return found
+
+
+def main():
+    messages  = make_messages()
+    matcher   = PrefixMatcher(PREFIXES)
+
+    old_time  = timeit.timeit(lambda: old_path(messages), number=NUMBER) / NUMBER
+    new_time  = timeit.timeit(lambda: new_path(messages, matcher), number=NUMBER) / NUMBER
+
+    print(f'messages: {len(messages)}')
+    print(f'old path: {old_time * 1000:.3f} ms ({old_time / len(messages) * 1e9:.0f} ns/message)')
+    print(f'new path: {new_time * 1000:.3f} ms ({new_time / len(messages) * 1e9:.0f} ns/message)')
+    print(f'speedup:  {old_time / new_time:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark of the "did you mean" suggestions with 5000 command names (aliases of many plugins and languages).
+Compares the linear Levenshtein scan over all names with the SuggestionIndex
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/bench_suggestions.py
+"""
+
+import random
+import string
+import timeit
+
+from ezbotf.suggestions import levenshtein, SuggestionIndex
+
+NAMES         = 5000
+LOOKUPS       = 200
+MAX_DISTANCE  = 2
+NUMBER        = 3
+
+
+def make_names(rnd: random.Random) -> list[str]:
+    """Makes command names, many of them share the prefix"""
+
+    prefixes  = ['get', 'set', 'list', 'del', 'add', 'show', 'user', 'chat']
+    names     = set()
+
+    while len(names) < NAMES:
+        names.add(rnd.choice(prefixes) + ''.join(rnd.choices(string.ascii_lowercase, k=rnd.randint(2, 8))))
+
+    return sorted(names)
+
+
+def typo(rnd: random.Random, name: str) -> str:
+    """Makes one or two typos in the name"""
+
+    for _ in range(rnd.randint(1, 2)):
+        i = rnd.randrange(len(name))
+
+        match rnd.randrange(3):
+            case 0:
+                name = name[:i] + rnd.choice(string.ascii_lowercase) + name[i + 1:]
+            case 1:
+                name = name[:i] + name[i + 1:]
+            case 2:
+                name = name[:i] + rnd.choice(string.ascii_lowercase) + name[i:]
+
+    return name
+
+
+def main():
+    rnd      = random.Random(0)
+    names    = make_names(rnd)
+    lookups  = [typo(rnd, rnd.choice(names)) for _ in range(LOOKUPS)]
+    index    = SuggestionIndex(names)
+
+    def linear(name: str) -> list[str]:
+        found = sorted((levenshtein(name, n), n) for n in names)
+        return [n for d, n in found if d <= MAX_DISTANCE]
+
+    # results of both ways must be equal
+    assert all(linear(n) == index.search(n, MAX_DISTANCE) for n in lookups)
+
+    old = min(timeit.repeat(lambda: [linear(n) for n in lookups], number=1, repeat=NUMBER)) / LOOKUPS
+    new = min(timeit.repeat(lambda: [index.search(n, MAX_DISTANCE) for n in lookups], number=1, repeat=NUMBER)) / LOOKUPS
+
+    print(f'{NAMES} names, {LOOKUPS} lookups with one or two typos, max distance {MAX_DISTANCE}')
+    print(f'linear scan:      {old * 1000:8.3f} ms per lookup')
+    print(f'SuggestionIndex:  {new * 1000:8.3f} ms per lookup')
+    print(f'speedup:          {old / new:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark of the arguments tokenizing of the large payloads (10 KB and 100 KB).
+Compares the old character-by-character tokenizer (legacy_tokenizer=True) with the tokenize() function
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/bench_tokenizer.py
+"""
+
+import random
+import string
+import timeit
+
+from ezbotf.argumentparser import ArgumentParser
+
+SIZES   = [10 * 1024, 100 * 1024]
+NUMBER  = 5
+
+
+def make_payload(rnd: random.Random, size: int, quoted: bool) -> str:
+    """Makes a payload of words (and quoted strings, if it is set) separated by spaces"""
+
+    parts   = []
+    length  = 0
+
+    while length < size:
+        word = ''.join(rnd.choices(string.ascii_letters + string.digits, k=rnd.randint(1, 12)))
+
+        if quoted and rnd.random() < 0.2:
+            word = f'"{word} {word}"'
+
+        parts.append(word)
+        length += len(word) + 1
+
+    return ' '.join(parts)
+
+
+def main():
+    rnd     = random.Random(0)
+    legacy  = ArgumentParser(None, [], allow_caching=False, legacy_tokenizer=True)
+    new     = ArgumentParser(None, [], allow_caching=False)
+
+    for size in SIZES:
+        for quoted in (False, True):
+            payload = make_payload(rnd, size, quoted)
+
+            # results of both ways must be equal (payload has only single spaces)
+            assert legacy.parse_string(payload + '\00') == new.parse_string(payload)
+
+            old_time = min(timeit.repeat(lambda: legacy.parse_string(payload + '\00'), number=1, repeat=NUMBER))
+            new_time = min(timeit.repeat(lambda: new.parse_string(payload), number=1, repeat=NUMBER))
+
+            print(f'{size // 1024:4d} KB {"quoted" if quoted else "plain ":6s}  '
+                  f'legacy: {old_time * 1000:8.3f} ms  new: {new_time * 1000:8.3f} ms  speedup: {old_time / new_time:6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
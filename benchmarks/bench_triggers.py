@@ -0,0 +1,97 @@
+"""
+Benchmark of the regular expression triggers with 200 plugins (one trigger each). Compares matching every trigger
+one by one with the TriggerEngine. Before the measuring, it checks that the engine fires the same triggers as the
+triggers matched one by one (including the triggers of the different plugins with the overlapping matches)
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/bench_triggers.py
+"""
+
+import random
+import string
+import timeit
+
+from ezbotf.triggers import Trigger, TriggerEngine
+
+PLUGINS  = 200
+TEXTS    = 500
+NUMBER   = 5
+
+# (triggers of the plugins, text, patterns of the fired triggers)
+CHECKED_CASES = [
+    ([[r'spam\w*'], ['am']], 'buy spammer stuff', {r'spam\w*', 'am'}),
+    ([[r'spam\w*'], ['am']], 'I am here', {'am'}),
+    ([[r'\d+'], [r'\d{2}'], [r'2']], 'call 123', {r'\d+', r'\d{2}', '2'}),
+    ([[r'https?://\S+'], [r'\S+\.com']], 'see https://example.com now', {r'https?://\S+', r'\S+\.com'}),
+    ([[r'(?P<a>x)y'], [r'(?P<a>y)z']], 'xyz', {r'(?P<a>x)y', r'(?P<a>y)z'}),
+    ([[r'^hello'], [r'world$']], 'say hello world', {r'world$'}),
+    ([[r'(a)\1'], [r'a']], 'baab', {r'(a)\1', 'a'}),
+    ([[r'foo'], [r'bar']], 'nothing here', set())
+]
+
+
+class FakePlugin:
+    """Plugin stub, triggers only keep it"""
+
+
+def make_engine(plugins: list[list[str]]) -> TriggerEngine:
+    engine = TriggerEngine()
+
+    for patterns in plugins:
+        plugin = FakePlugin()
+        engine.update_plugin(plugin, [Trigger(lambda e, m: None, p, True, False, plugin) for p in patterns])
+
+    return engine
+
+
+def check_engine() -> bool:
+    """Checks, that the engine fires every trigger, that is matched by itself"""
+
+    correct = True
+
+    for plugins, text, expected in CHECKED_CASES:
+        fired = {t.pattern for t, m in make_engine(plugins).match(text)}
+
+        if fired != expected:
+            correct = False
+            print(f'  wrong triggers for {text!r}: {sorted(fired)}, expected {sorted(expected)}')
+
+    print(f'trigger engine is {"correct" if correct else "incorrect"} on {len(CHECKED_CASES)} cases')
+
+    return correct
+
+
+def main():
+    if not check_engine():
+        raise SystemExit(1)
+
+    rnd    = random.Random(0)
+    words  = [''.join(rnd.choices(string.ascii_lowercase, k=rnd.randint(4, 9))) for _ in range(PLUGINS)]
+    texts  = [' '.join(''.join(rnd.choices(string.ascii_lowercase, k=6)) for _ in range(10)) for _ in range(TEXTS)]
+
+    # every 50th text is matched by one trigger
+    texts[::50] = [t + ' ' + rnd.choice(words) for t in texts[::50]]
+
+    for name, make_pattern in [(r'word\w*', lambda w: rf'{w}\w*'),
+                               (r'\bword\w*', lambda w: rf'\b{w}\w*'),
+                               (r'#word\d+', lambda w: rf'#{w}\d+'),
+                               ('mixed', lambda w: rnd.choice([rf'{w}\w*', rf'\b{w}\w*', rf'#{w}\d+']))]:
+        engine    = make_engine([[make_pattern(w)] for w in words])
+        triggers  = [t for triggers in engine.plugin_triggers.values() for t in triggers]
+
+        def one_by_one():
+            for text in texts:
+                [t for t in triggers if t.compiled.search(text)]
+
+        def combined():
+            for text in texts:
+                engine.match(text)
+
+        print(f'{PLUGINS} plugins with the {name} triggers, {TEXTS} texts:')
+
+        for func_name, func in [('one by one', one_by_one), ('engine', combined)]:
+            seconds = min(timeit.repeat(func, number=NUMBER, repeat=3)) / NUMBER / TEXTS
+            print(f'  {func_name:<12} {seconds * 1e6:8.2f} us per text')
+
+
+if __name__ == '__main__':
+    main()
@@ -9,4 +9,5 @@ from .instancecontext import *
 from .translator import *
 from .instance import *
 from .permissions import *
-from . import argumentparser, common, exceptions, ezlog, messages, types, utils, version
+from . import argumentparser, batcher, chatenablement, common, editcache, entitycache, exceptions, ezlog, messagecache, \
+    messages, prefixmatcher, ratelimit, scheduler, subscriptions, suggestions, triggers, types, utils, version
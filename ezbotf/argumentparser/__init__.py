@@ -2,4 +2,7 @@
 from . import _casts
 from .casts import *
 from .parser import *
+from .cache import *
+from .document import *
+from .lazy import *
 from .argumentparseerror import *
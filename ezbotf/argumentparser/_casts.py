@@ -2,9 +2,43 @@
 Defines base for type-casting. Use it module if you define custom argument type-caster
 """
 
+import io
+import re
+import array
+import warnings
+
 from typing import Any
 
-__all__ = ['ArgTypeCast', 'ListCast', 'DictCast', 'BoolCast']
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = ['INVALID', 'ArgTypeCast', 'IntCast', 'FloatCast', 'ListCast', 'ArrayCast', 'DictCast', 'BoolCast']
+
+
+class _Invalid:
+    """Type of the :data:`INVALID` sentinel"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'INVALID'
+
+
+# returned by the ArgTypeCast.try_cast(), when the string can't be type-casted
+INVALID = _Invalid()
+
+# strings, that are accepted by int() and float() (digits may be separated by "_", and surrounded by whitespaces)
+_DIGITS     = r'\d(?:_?\d)*'
+_INT_RE     = re.compile(rf'\s*[+-]?{_DIGITS}\s*')
+_FLOAT_RE   = re.compile(rf'\s*[+-]?(?:(?:{_DIGITS}(?:\.(?:{_DIGITS})?)?|\.{_DIGITS})(?:e[+-]?{_DIGITS})?'
+                         r'|inf|infinity|nan)\s*', re.IGNORECASE)
+
+# values of the ArrayCast (both parsing paths accept only them, so the result doesn't depend on NumPy).
+# Misplaced dots of the floats are rejected by the both parsers in the same way
+_ARRAY_INT    = r'[+-]?[0-9]+'
+_ARRAY_FLOAT  = r'[+-]?(?:[0-9.]+(?:[eE][+-]?[0-9]+)?|(?i:inf|infinity|nan))'
 
 
 class ArgTypeCast:
@@ -29,6 +63,69 @@ class ArgTypeCast:
 
         return self.type(string)
 
+    def try_cast(self, string: str) -> Any:
+        """Type-cast string to the given type without raising the exception. The built-in casts validate the
+        string before the casting, so incorrect strings are rejected without the exceptions. Custom casts
+        may override it, by default it catches the exception of the :func:`typecast()`
+
+        :param string: String to be type-casted
+
+        :return: Type-casted object or :data:`INVALID` if the string can't be type-casted
+        """
+
+        try:
+            return self.typecast(string)
+        except Exception:
+            return INVALID
+
+
+class IntCast(ArgTypeCast):
+    """Type-cast a string to the int. Strings of the digits only are checked by :meth:`str.isdecimal()`,
+    others are validated by the regular expression, so the incorrect strings (such as words and typos)
+    are rejected without the exception"""
+
+    def __init__(self):
+        super().__init__(int)
+
+    def try_cast(self, string: str) -> int | _Invalid:
+        """Type-cast string to the int without raising the exception
+
+        :param string: String to be type-casted
+
+        :return: Type-casted int object or :data:`INVALID` if the string can't be type-casted
+        """
+
+        if not string.isdecimal() and _INT_RE.fullmatch(string) is None:
+            return INVALID
+
+        try:
+            return int(string)
+        except ValueError:
+            # too many digits (see sys.set_int_max_str_digits())
+            return INVALID
+
+
+class FloatCast(ArgTypeCast):
+    """Type-cast a string to the float. Strings of the digits with the one dot at most are checked by
+    :meth:`str.isdecimal()`, others are validated by the regular expression, so the incorrect strings
+    (such as words and typos) are rejected without the exception"""
+
+    def __init__(self):
+        super().__init__(float)
+
+    def try_cast(self, string: str) -> float | _Invalid:
+        """Type-cast string to the float without raising the exception
+
+        :param string: String to be type-casted
+
+        :return: Type-casted float object or :data:`INVALID` if the string can't be type-casted
+        """
+
+        if not string.replace('.', '', 1).isdecimal() and _FLOAT_RE.fullmatch(string) is None:
+            return INVALID
+
+        return float(string)
+
 
 class ListCast(ArgTypeCast):
     """Type-cast a string to the list
@@ -57,6 +154,117 @@ class ListCast(ArgTypeCast):
 
         return [self.values_type.typecast(v) for v in string.split(self.splitter)]
 
+    def try_cast(self, string: str) -> list[Any] | _Invalid:
+        """Type-cast string to the list without raising the exception
+
+        :param string: String to be type-casted
+
+        :return: Type-casted list object or :data:`INVALID` if any value can't be type-casted
+        """
+
+        result = [self.values_type.try_cast(v) for v in string.split(self.splitter)]
+
+        return INVALID if any(v is INVALID for v in result) else result
+
+
+class ArrayCast(ArgTypeCast):
+    """Type-cast a string to the compact :class:`array.array` of numbers. Values are stored unboxed
+    (8 bytes per value for the ``'q'`` and ``'d'`` type codes), and are parsed in bulk: by NumPy,
+    if it is installed, otherwise by the built-in type over the split string.
+
+    String is validated by the regular expression before the parsing, so both paths accept the same strings:
+    values are ASCII decimal numbers (floats may have the exponent, ``inf`` and ``nan``) separated by
+    the splitter only, without the whitespaces and ``_`` separators
+
+    .. note:: The array takes about 4.5 times less memory than the list, so it is useful for the values, that are
+        kept by the command. Parsing is not faster than by the :class:`ListCast` (except the ints parsed by NumPy),
+        because the string is validated and, without NumPy, every value is still created as the Python number
+
+    :ivar typecode: Type code of the array (see :mod:`array`)
+    :ivar splitter: Splitter to use
+    :ivar use_numpy: Parse by NumPy, if it is installed
+    :ivar pattern: Compiled pattern of the correct strings
+    """
+
+    def __init__(self, typecode: str = 'q', splitter: str = ', ', use_numpy: bool = True):
+        """
+        :param typecode: Type code of the array (integer or float type code of :mod:`array`)
+        :param splitter: String splitter
+        :param use_numpy: Parse by NumPy, if it is installed
+
+        :raises ValueError: When the splitter is empty
+        """
+        super().__init__(float if typecode in 'fd' else int)
+
+        if not splitter:
+            raise ValueError('Splitter of the ArrayCast can\'t be empty')
+
+        value = _ARRAY_FLOAT if self.type is float else _ARRAY_INT
+
+        self.typecode = typecode
+        self.splitter = splitter
+        self.use_numpy = use_numpy and numpy is not None
+        self.pattern = re.compile(f'{value}(?:{re.escape(splitter)}{value})*')
+
+    def _parse(self, string: str) -> array.array:
+        """Parses the validated string to the array
+
+        :param string: Validated string
+
+        :return: Type-casted array object
+
+        :raises OverflowError: When any value is out of the type code range
+        """
+
+        if self.use_numpy:
+            # values never contain ",", so the splitter is replaced by the delimiter of the NumPy
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)
+                values = numpy.loadtxt(io.StringIO(string.replace(self.splitter, ',')),
+                                       dtype=self.typecode, delimiter=',', comments=None, ndmin=1)
+
+            result = array.array(self.typecode)
+            result.frombytes(values.tobytes())
+
+            return result
+
+        # values are boxed one by one (the standard library has no bulk parser), only the array keeps them unboxed.
+        # The array is filled from the list faster than from the iterator
+        return array.array(self.typecode, list(map(self.type, string.split(self.splitter))))
+
+    def typecast(self, string: str) -> array.array:
+        """Type-cast string to the array
+
+        :param string: String to be type-casted
+
+        :return: Type-casted array object
+
+        :raises ValueError: When any value can't be type-casted
+        """
+
+        result = self.try_cast(string)
+
+        if result is INVALID:
+            raise ValueError(f'Can\'t type cast the string "{string}" to array of {self.type.__name__}')
+
+        return result
+
+    def try_cast(self, string: str) -> array.array | _Invalid:
+        """Type-cast string to the array without raising the exception
+
+        :param string: String to be type-casted
+
+        :return: Type-casted array object or :data:`INVALID` if any value can't be type-casted
+        """
+
+        if self.pattern.fullmatch(string) is None:
+            return INVALID
+
+        try:
+            return self._parse(string)
+        except (OverflowError, ValueError):
+            return INVALID
+
 
 class DictCast(ArgTypeCast):
     """Type-cast a string to the dict
@@ -110,15 +318,15 @@ class DictCast(ArgTypeCast):
 
 
 # define for the BoolCast
-_true_list = ['yes', 'yea', '+', 'true']
-_false_list = ['no', 'nop', '-', 'false']
+_true_list = frozenset(['yes', 'yea', '+', 'true'])
+_false_list = frozenset(['no', 'nop', '-', 'false'])
 
 
 class BoolCast(ArgTypeCast):
     """Type-cast a string to the bool
 
-    :ivar true_list: List with the true string variants
-    :ivar false_list: List with the false string variants
+    :ivar true_list: Frozen set with the true string variants (lower-cased, if the case is not matched)
+    :ivar false_list: Frozen set with the false string variants (lower-cased, if the case is not matched)
     :ivar match_case: Match case of the string
     """
 
@@ -131,10 +339,13 @@ class BoolCast(ArgTypeCast):
         :param false_list: List with the false string variants
         :param match_case: Match case of the string
         """
-        super().__init__(dict)
+        super().__init__(bool)
+
+        true_list = true_list if true_list is not None else _true_list
+        false_list = false_list if false_list is not None else _false_list
 
-        self.true_list = true_list if true_list is not None else _true_list
-        self.false_list = false_list if false_list is not None else _false_list
+        self.true_list = frozenset(true_list if match_case else [s.lower() for s in true_list])
+        self.false_list = frozenset(false_list if match_case else [s.lower() for s in false_list])
         self.match_case = match_case
 
     def typecast(self, string: str) -> bool:
@@ -144,7 +355,22 @@ class BoolCast(ArgTypeCast):
 
         :returns: Type-casted bool object
 
-        :raises ArgumentTypeCastingError: When string isn't have in the true/false list
+        :raises ValueError: When string isn't have in the true/false list
+        """
+
+        result = self.try_cast(string)
+
+        if result is INVALID:
+            raise ValueError(f'Can\'t type cast the string "{string}" to bool')
+
+        return result
+
+    def try_cast(self, string: str) -> bool | _Invalid:
+        """Type-cast string to the bool without raising the exception
+
+        :param string: String to be type-casted
+
+        :return: Type-casted bool object or :data:`INVALID` if string isn't have in the true/false list
         """
 
         string_to_parse = string if self.match_case else string.lower()
@@ -153,5 +379,5 @@ class BoolCast(ArgTypeCast):
             return True
         elif string_to_parse in self.false_list:
             return False
-        else:
-            raise ArgumentTypeCastingError(f'Can\'t type cast the string "{string}" to bool')
+
+        return INVALID
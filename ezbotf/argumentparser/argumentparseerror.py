@@ -12,7 +12,10 @@ class ArgumentParseError(Enum):
     :ivar IncorrectType: Returned when argument cannot be type-casted
     :ivar IncorrectSubcommand: Returned when to argument parser with subcommands passed nonexistent subcommand
     :ivar ReplyToRequired: Returned when required to reply to any message to work with command
-    :ivar CantFindOriginalMessage: Returned when limit of messages distance is reached and message doesn't found
+    :ivar CantFindOriginalMessage: Returned when the replied message doesn't found (it may be deleted)
+    :ivar DocumentRequired: Returned when required to attach or reply to any document to work with command
+    :ivar DocumentTooLarge: Returned when the document is larger than the maximum size of the document argument
+    :ivar DocumentDownloadFailed: Returned when the document can't be downloaded
     :ivar PluginError: Returned when plugin raised an exception
     """
 
@@ -22,4 +25,7 @@ class ArgumentParseError(Enum):
     IncorrectSubcommand      = auto()
     ReplyToRequired          = auto()
     CantFindOriginalMessage  = auto()
+    DocumentRequired         = auto()
+    DocumentTooLarge         = auto()
+    DocumentDownloadFailed   = auto()
     PluginError              = auto()
@@ -0,0 +1,176 @@
+"""
+Defines :class:`ParseCache` that caches the parsed arguments strings of the :class:`ArgumentParser`
+"""
+
+import sys
+import weakref
+
+from collections import OrderedDict
+
+__all__ = ['CacheBudget', 'ParseCache', 'GLOBAL_CACHE_BUDGET']
+
+
+class CacheBudget:
+    """Memory budget shared by the :class:`ParseCache` objects. When the total size of all caches is above
+    the budget, entries are evicted from the largest cache
+
+    :ivar max_bytes: Maximum total size (in bytes) of all caches
+    :ivar used_bytes: Current total size (in bytes) of all caches
+    :ivar caches: Weak set with the caches, that use this budget
+    :ivar evictions: Number of the entries, evicted by the budget
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        """
+        :param max_bytes: Maximum total size (in bytes) of all caches
+        """
+
+        self.max_bytes   = max_bytes
+        self.used_bytes  = 0
+
+        self.caches: weakref.WeakSet[ParseCache] = weakref.WeakSet()
+
+        self.evictions: int = 0
+
+    def enforce(self):
+        """Evicts the oldest entries of the largest caches, while the total size is above the budget"""
+
+        while self.used_bytes > self.max_bytes:
+            largest = max(self.caches, key=lambda c: c.bytes, default=None)
+
+            if largest is None or not largest.entries:
+                break
+
+            largest._evict_oldest()
+            self.evictions += 1
+
+
+# budget of all ArgumentParser caches
+GLOBAL_CACHE_BUDGET = CacheBudget()
+
+
+class ParseCache:
+    """LRU cache of the parsed arguments strings. It is bounded by the number of the entries and their size,
+    and by the shared :class:`CacheBudget`. Entries are keyed by the string itself, so different strings never
+    share the result
+
+    :ivar max_entries: Maximum number of the entries
+    :ivar max_bytes: Maximum size (in bytes) of the entries
+    :ivar budget: Shared memory budget (may be None)
+    :ivar entries: Ordered dictionary with the entries (value is a tuple: parsed arguments, size in bytes)
+    :ivar bytes: Current size (in bytes) of the entries
+    :ivar hits: Number of the cache hits
+    :ivar misses: Number of the cache misses
+    :ivar evictions: Number of the evicted entries
+    """
+
+    def __init__(self,
+                 max_entries: int = 256,
+                 max_bytes: int = 1024 * 1024,
+                 budget: CacheBudget | None = GLOBAL_CACHE_BUDGET):
+        """
+        :param max_entries: Maximum number of the entries
+        :param max_bytes: Maximum size (in bytes) of the entries
+        :param budget: Shared memory budget (None to use only own limits)
+        """
+
+        self.max_entries  = max_entries
+        self.max_bytes    = max_bytes
+        self.budget       = budget
+
+        self.entries: OrderedDict[str, tuple[list[str], int]] = OrderedDict()
+
+        self.bytes: int      = 0
+        self.hits: int       = 0
+        self.misses: int     = 0
+        self.evictions: int  = 0
+
+        if self.budget is not None:
+            self.budget.caches.add(self)
+
+    def __del__(self):
+        if self.budget is not None:
+            self.budget.used_bytes -= self.bytes
+
+    def get(self, string: str) -> list[str] | None:
+        """Gets the parsed arguments of the string
+
+        :param string: Arguments string
+
+        :return: List with the parsed arguments or None if the string is not cached
+        """
+
+        entry = self.entries.get(string)
+
+        if entry is None:
+            self.misses += 1
+            return
+
+        self.entries.move_to_end(string)
+        self.hits += 1
+
+        return entry[0]
+
+    def put(self, string: str, args: list[str]):
+        """Puts the parsed arguments of the string to the cache.
+        Entries larger than ``max_bytes`` are not cached
+
+        :param string: Arguments string
+        :param args: List with the parsed arguments
+        """
+
+        size = sys.getsizeof(string) + sys.getsizeof(args) + sum(sys.getsizeof(a) for a in args)
+
+        if size > self.max_bytes or string in self.entries:
+            return
+
+        self.entries[string] = (args, size)
+        self._resize(size)
+
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._evict_oldest()
+
+        if self.budget is not None:
+            self.budget.enforce()
+
+    def clear(self):
+        """Removes all entries"""
+
+        self._resize(-self.bytes)
+        self.entries.clear()
+
+    def _resize(self, size: int):
+        """Changes the size of the cache and of the budget
+
+        :param size: Size difference (in bytes)
+        """
+
+        self.bytes += size
+
+        if self.budget is not None:
+            self.budget.used_bytes += size
+
+    def _evict_oldest(self):
+        """Evicts the least recently used entry"""
+
+        _, (_, size) = self.entries.popitem(last=False)
+
+        self._resize(-size)
+        self.evictions += 1
+
+    def stats(self) -> dict[str, int | float]:
+        """Gets the statistics of the cache
+
+        :return: Dictionary with the statistics (size, bytes, hits, misses, evictions and hit rate)
+        """
+
+        requests = self.hits + self.misses
+
+        return {
+            'size': len(self.entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / requests if requests else 0.0
+        }
@@ -4,21 +4,21 @@ Defines initialized type-casts objects. Use it in Argument type definition
 
 from . import _casts
 
-__all__ = ['Cast', 'ListCast', 'DictCast']
+__all__ = ['Cast', 'ListCast', 'ArrayCast', 'DictCast']
 
 
 class Cast:
     """Initialized ArgTypeCast casts
 
     :ivar StrCast: Cast to the ``str`` type
-    :ivar StrCast: Cast to the ``int`` type
-    :ivar StrCast: Cast to the ``float`` type
-    :ivar StrCast: Cast to the ``bool`` type (have type of :class:`_casts.BoolCast`)
+    :ivar IntCast: Cast to the ``int`` type (have type of :class:`_casts.IntCast`)
+    :ivar FloatCast: Cast to the ``float`` type (have type of :class:`_casts.FloatCast`)
+    :ivar BoolCast: Cast to the ``bool`` type (have type of :class:`_casts.BoolCast`)
     """
 
     StrCast = _casts.ArgTypeCast(str)
-    IntCast = _casts.ArgTypeCast(int)
-    FloatCast = _casts.ArgTypeCast(float)
+    IntCast = _casts.IntCast()
+    FloatCast = _casts.FloatCast()
     BoolCast = _casts.BoolCast()
 
     @staticmethod
@@ -48,6 +48,19 @@ class ListCast:
     ListBoolCast = _casts.ListCast(values_type=Cast.BoolCast)
 
 
+class ArrayCast:
+    """Initialized ArrayCast casts. Use them instead of the ListCast for the long lists of the numbers, that are
+    kept by the command (arrays take about 4.5 times less memory, but are not parsed faster).
+    Usage example: ez example 1, 2, 3, ...
+
+    :ivar ArrayIntCast: Cast to the ``array.array`` of the 64-bit ints (``'q'`` type code)
+    :ivar ArrayFloatCast: Cast to the ``array.array`` of the doubles (``'d'`` type code)
+    """
+
+    ArrayIntCast = _casts.ArrayCast('q')
+    ArrayFloatCast = _casts.ArrayCast('d')
+
+
 class DictCast:
     """Initialized DictCast casts.
     Usage example: ez example key1=value2, key2=value2, ...
@@ -0,0 +1,134 @@
+"""
+Defines :class:`DocumentHandle` that gives access to the downloaded document of the :class:`DocumentArgument`
+"""
+
+import mmap
+import asyncio
+import pathlib
+import tempfile
+
+from typing import Any, AsyncIterator, BinaryIO, Iterator
+
+__all__ = ['DocumentHandle', 'download_document']
+
+
+class DocumentHandle:
+    """Handle of the document, downloaded to the temp file. The document is never loaded fully into the memory:
+    it may be read by chunks (``async for chunk in handle``), by lines, as a file or mapped to the memory
+
+    :ivar path: Path to the temp file
+    :ivar name: Name of the document (may be None)
+    :ivar size: Size (in bytes) of the document
+    :ivar mime_type: MIME type of the document (may be None)
+    :ivar message: Message with the document
+    :ivar keep: Don't remove the temp file after the command (then the command must call :func:`remove()`)
+    """
+
+    def __init__(self,
+                 path: pathlib.Path,
+                 name: str | None,
+                 size: int,
+                 mime_type: str | None,
+                 message: Any,
+                 keep: bool = False):
+        """
+        :param path: Path to the temp file
+        :param name: Name of the document
+        :param size: Size (in bytes) of the document
+        :param mime_type: MIME type of the document
+        :param message: Message with the document
+        :param keep: Don't remove the temp file after the command
+        """
+
+        self.path       = path
+        self.name       = name
+        self.size       = size
+        self.mime_type  = mime_type
+        self.message    = message
+        self.keep       = keep
+
+    def __repr__(self):
+        return f'DocumentHandle(name={self.name!r} size={self.size} path={str(self.path)!r})'
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self.chunks()
+
+    def open(self) -> BinaryIO:
+        """Opens the document for the reading
+
+        :return: Binary file object
+        """
+
+        return open(self.path, 'rb')
+
+    def mmap(self) -> mmap.mmap:
+        """Maps the document to the memory (read-only). Pages are loaded by the OS only when they are accessed.
+        Document must not be empty
+
+        :return: Memory-mapped document (close it, when it is not needed)
+        """
+
+        with self.open() as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    async def chunks(self, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Reads the document by chunks. Control is passed to the event loop after every chunk
+
+        :param chunk_size: Size (in bytes) of the chunk
+
+        :return: Asynchronous iterator of the chunks
+        """
+
+        with self.open() as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+                await asyncio.sleep(0)
+
+    def lines(self, encoding: str = 'utf-8', errors: str = 'replace') -> Iterator[str]:
+        """Reads the document by lines
+
+        :param encoding: Encoding of the document
+        :param errors: Decoding errors handling (see :func:`open`)
+
+        :return: Iterator of the lines
+        """
+
+        with open(self.path, encoding=encoding, errors=errors) as f:
+            yield from f
+
+    def remove(self):
+        """Removes the temp file"""
+
+        self.path.unlink(missing_ok=True)
+
+
+async def download_document(client: Any,
+                            message: Any,
+                            directory: pathlib.Path,
+                            chunk_size: int = 512 * 1024,
+                            keep: bool = False) -> DocumentHandle:
+    """Downloads the document of the message to the temp file by chunks
+
+    :param client: :class:`TelegramClient` to download the document
+    :param message: Message with the document
+    :param directory: Directory for the temp file
+    :param chunk_size: Size (in bytes) of the downloaded chunk
+    :param keep: Don't remove the temp file after the command
+
+    :return: Handle of the downloaded document
+    """
+
+    directory.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.NamedTemporaryFile(dir=directory, prefix='document_', delete=False) as f:
+        path = pathlib.Path(f.name)
+
+        try:
+            async for chunk in client.iter_download(message.document, chunk_size=chunk_size):
+                f.write(chunk)
+        except BaseException:
+            f.close()
+            path.unlink(missing_ok=True)
+            raise
+
+    return DocumentHandle(path, message.file.name, message.file.size, message.file.mime_type, message, keep)
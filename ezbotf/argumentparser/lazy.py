@@ -0,0 +1,129 @@
+"""
+Defines the helpers of the lazy arguments, that are type-casted (or resolved) only on the first access
+"""
+
+from . import _casts
+
+from typing import Any, Awaitable, Callable, Generator
+
+__all__ = ['PendingToken', 'LazyArgument', 'LazyValue']
+
+
+class PendingToken(str):
+    """Raw string of the lazy argument, that is not type-casted yet. It is the subclass of the :class:`str`,
+    so it is created without the Python-level initialization
+    """
+
+    __slots__ = ()
+
+    @property
+    def token(self) -> str:
+        """Raw string of the argument"""
+
+        return str.__str__(self)
+
+    def __repr__(self):
+        return f'<lazy {self.token!r}>'
+
+
+class LazyArgument:
+    """Descriptor of the lazy argument in the :class:`ParsedArguments`. Raw string is type-casted on the first
+    access and the result replaces it, so the next accesses are the plain slot reads
+
+    :ivar name: Name of the argument
+    :ivar slot: Descriptor of the slot, that stores the raw string or the value
+    :ivar cast: Type-cast function (see :func:`_casts.ArgTypeCast.try_cast()`)
+    """
+
+    __slots__ = ('name', 'slot', 'cast')
+
+    def __init__(self, name: str, slot: Any, cast: Callable[[str], Any]):
+        """
+        :param name: Name of the argument
+        :param slot: Descriptor of the slot, that stores the raw string or the value
+        :param cast: Type-cast function (see :func:`_casts.ArgTypeCast.try_cast()`)
+        """
+
+        self.name  = name
+        self.slot  = slot
+        self.cast  = cast
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        """Gets the value of the argument, type-casts it on the first access
+
+        :raises ValueError: When the argument can't be type-casted
+        """
+
+        if instance is None:
+            return self
+
+        value = self.slot.__get__(instance, owner)
+
+        if type(value) is PendingToken:
+            value = self.cast(value.token)
+
+            if value is _casts.INVALID:
+                raise ValueError(f'Can\'t type cast the argument {self.name}')
+
+            self.slot.__set__(instance, value)
+
+        return value
+
+    def __set__(self, instance: Any, value: Any):
+        self.slot.__set__(instance, value)
+
+    def __delete__(self, instance: Any):
+        self.slot.__delete__(instance)
+
+
+class LazyValue:
+    """Awaitable value of the lazy argument, that is resolved asynchronously (such as the reply-to message).
+    It is resolved on the first ``await``, the next ``await`` returns the same value
+
+    :ivar resolver: Function, that resolves the value
+    """
+
+    __slots__ = ('resolver', '_value', '_resolved')
+
+    def __init__(self, resolver: Callable[[], Awaitable[Any]] | None):
+        """
+        :param resolver: Function, that resolves the value
+        """
+
+        self.resolver   = resolver
+        self._value     = None
+        self._resolved  = False
+
+    def __repr__(self):
+        return f'<lazy {self._value!r}>' if self._resolved else '<lazy unresolved>'
+
+    @classmethod
+    def resolved(cls, value: Any) -> 'LazyValue':
+        """Makes the already resolved value
+
+        :param value: Value to return on ``await``
+
+        :return: Resolved :class:`LazyValue`
+        """
+
+        lazy = cls(None)
+
+        lazy._value     = value
+        lazy._resolved  = True
+
+        return lazy
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        return self.get().__await__()
+
+    async def get(self) -> Any:
+        """Resolves the value on the first call
+
+        :return: Resolved value
+        """
+
+        if not self._resolved:
+            self._value     = await self.resolver()
+            self._resolved  = True
+
+        return self._value
@@ -1,7 +1,15 @@
+"""
+Defines :class:`ArgumentParser` that parses the arguments of the commands by the :class:`Argument` definitions
+"""
+
+import re
 
 from . import _casts
 from .casts import *
 from .argumentparseerror import *
+from .cache import ParseCache
+from .document import DocumentHandle, download_document
+from .lazy import PendingToken, LazyArgument, LazyValue
 
 from ..context import Context
 from .. import ezlog
@@ -12,7 +20,7 @@ from typing import Any, TYPE_CHECKING
 if TYPE_CHECKING:
     from ..plugin import Plugin
 
-__all__ = ['Argument', 'ReplyToArgument', 'ArgumentParser']
+__all__ = ['Argument', 'ReplyToArgument', 'DocumentArgument', 'ParsedArguments', 'ArgumentParser', 'tokenize']
 
 # symbols to escape
 escape_dict = {
@@ -20,8 +28,94 @@ escape_dict = {
     "'": "'"
 }
 
-# number of messages to iter when reply-to functional is used
-RT_ITER_NUM = 50
+# quoted strings (closing quote may be missed), the string is split by them to the quoted and unquoted chunks
+_QUOTED_SPLIT_RE = re.compile(r'("[^"]*"?|\'[^\']*\'?)')
+
+# whole arguments with the escaping by "\" character, and its quoted strings and escape sequences
+_ESCAPED_ARG_RE     = re.compile(r'(?:[^\s"\'\\]+|"(?:[^"\\]|\\.)*"?|\'(?:[^\'\\]|\\.)*\'?|\\.?)+', re.DOTALL)
+_ESCAPED_QUOTED_RE  = re.compile(r'"((?:[^"\\]|\\.)*)"?|\'((?:[^\'\\]|\\.)*)\'?|\\(.?)', re.DOTALL)
+
+# escape sequences inside the quoted strings
+_ESCAPE_RE = re.compile(r'\\([\\"\'\s])')
+
+# characters, that require the quotes or escapes processing
+_SPECIAL_RE = re.compile(r'["\'\\]')
+
+
+def _unescape(match: re.Match) -> str:
+    """Replaces the quoted string or escape sequence with its content
+
+    :param match: Match object of the quoted string or escape sequence
+
+    :return: Content of the quoted string or escaped character
+    """
+
+    quoted = match.group(1) if match.group(1) is not None else match.group(2)
+
+    if quoted is not None:
+        return _ESCAPE_RE.sub(r'\1', quoted)
+
+    char = match.group(3)
+
+    # escaped quotes, whitespaces and "\" are added as is, other escaped characters are added with "\"
+    return char if char in escape_dict or char == '\\' or char.isspace() else '\\' + char
+
+
+def tokenize(string: str, enable_escaping: bool = False) -> list[str]:
+    """Splits the string to the arguments by one pass. Arguments are separated by any whitespaces,
+    quoted strings (by ``'`` or ``"``) may contain whitespaces and other quote character.
+    Quoted strings and words without separator between them are joined to one argument (as example ``a"b c"`` is
+    ``ab c``)
+
+    :param string: String to split
+    :param enable_escaping: Enable the escaping by "\\" character. Escaped quotes, whitespaces and "\\" are
+                            added as is, other escaped characters are added with "\\"
+
+    :return: List with the arguments (raw, string type)
+    """
+
+    # most of the arguments hasn't quotes and escapes, so they are split without the regular expressions
+    if _SPECIAL_RE.search(string) is None:
+        return string.split()
+
+    if enable_escaping:
+        return [_ESCAPED_QUOTED_RE.sub(_unescape, arg) if _SPECIAL_RE.search(arg) else arg
+                for arg in _ESCAPED_ARG_RE.findall(string)]
+
+    args     = []
+    joined   = False  # next chunk continues the last argument (there is no whitespace between them)
+    chunks   = _QUOTED_SPLIT_RE.split(string)
+
+    # odd chunks are quoted strings, even chunks are unquoted text (it is split by the whitespaces)
+    for i, chunk in enumerate(chunks):
+        if i % 2:
+            # lone unclosed quote at the end is ignored
+            if len(chunk) == 1 and i == len(chunks) - 2:
+                continue
+
+            content = chunk[1:-1] if len(chunk) > 1 and chunk[-1] == chunk[0] else chunk[1:]
+
+            if joined:
+                args[-1] += content
+            else:
+                args.append(content)
+
+            joined = True
+            continue
+
+        if not chunk:
+            continue
+
+        words = chunk.split()
+
+        if words and joined and not chunk[0].isspace():
+            args[-1] += words[0]
+            words = words[1:]
+
+        args += words
+        joined = not chunk[-1].isspace()
+
+    return args
 
 
 class Argument:
@@ -31,19 +125,25 @@ class Argument:
                  arg_name: str,
                  arg_type: _casts.ArgTypeCast = Cast.StrCast,
                  default: Any | None = None,
-                 description: str = 'Sample argument'
+                 description: str = 'Sample argument',
+                 lazy: bool = False
                  ):
         """
         :param arg_name: Name of the argument
         :param arg_type: Type of the argument (NOTE: It must support type-casting with using str)
         :param default: Defines default value of the argument. If it None - argument is marked as required
         :param description: Description of the argument
+        :param lazy: Type-cast the argument on the first access instead of the parsing (then incorrect type raises
+                     ValueError in the command). Value of the lazy :class:`ReplyToArgument` must be awaited,
+                     and the replied message is fetched on the first ``await``. Arguments with the names,
+                     that are not identifiers, are type-casted eagerly
         """
 
         self.arg_name = arg_name
         self.arg_type = arg_type
         self.default = default
         self.description = description
+        self.lazy = lazy
 
         self.is_optional = self.default is not None
 
@@ -60,13 +160,113 @@ class Argument:
         except Exception as e:
             return True, e
 
+    def try_cast(self, input_arg: str) -> Any:
+        """Type-cast the string argument to the argument type without raising the exception
+        (see :func:`_casts.ArgTypeCast.try_cast()`)
+
+        :param input_arg: Input argument in the str type
+
+        :return: Type-casted object, default value (if the argument is empty string) or :data:`_casts.INVALID`
+        """
+
+        return self.arg_type.try_cast(input_arg) if input_arg != '' else self.default
+
 
 class ReplyToArgument(Argument):
     """Argument for the Reply-To functional. This is inherits :class:`Argument`"""
     pass
 
-# cache of the ArgumentParser
-_CACHED = {}
+
+class DocumentArgument(Argument):
+    """Argument with the document, attached to the command message or to the replied message.
+    It doesn't take the text argument. Document is downloaded by chunks to the temp file in the ``cache_dir``,
+    and the command gets the :class:`DocumentHandle`. Temp file is removed after the command.
+    Document is downloaded once, all document arguments of the parser get the same handle
+    (its file is kept, if any of them has ``keep_file``).
+    This is inherits :class:`Argument`
+
+    :ivar max_size: Maximum size (in bytes) of the document (None is unlimited)
+    :ivar chunk_size: Size (in bytes) of the downloaded chunk
+    :ivar keep_file: Don't remove the temp file after the command
+    """
+
+    def __init__(self,
+                 arg_name: str,
+                 default: Any | None = None,
+                 description: str = 'Sample argument',
+                 max_size: int | None = None,
+                 chunk_size: int = 512 * 1024,
+                 keep_file: bool = False
+                 ):
+        """
+        :param arg_name: Name of the argument
+        :param default: Defines default value of the argument. If it None - argument is marked as required
+        :param description: Description of the argument
+        :param max_size: Maximum size (in bytes) of the document (None is unlimited)
+        :param chunk_size: Size (in bytes) of the downloaded chunk
+        :param keep_file: Don't remove the temp file after the command
+        """
+        super().__init__(arg_name, Cast.StrCast, default, description)
+
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.keep_file = keep_file
+
+
+class ParsedArguments:
+    """Base class of the parsed arguments. Every :class:`ArgumentParser` generates own subclass with the
+    ``__slots__`` of its arguments (and ``PREFIX``, ``CMD``, ``REPLY_TO_MESSAGE``, ``STACK``), so the arguments
+    are stored without the attributes dictionary. Attributes of the unset optional values are missing,
+    as in :class:`Context`
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        return self.__repr__()
+
+    def __repr__(self):
+        attrs = [attr for attr in self.__slots__ if attr != '__dict__' and hasattr(self, attr)]
+        attrs += list(getattr(self, '__dict__', ()))
+
+        # lazy arguments are shown by the public names, and their slots are read directly, so the pending tokens
+        # are not type-casted
+        names   = {arg.slot.__name__: name for name, arg in vars(type(self)).items() if isinstance(arg, LazyArgument)}
+        values  = [f'{names.get(attr, attr)}={repr(getattr(self, attr))}' for attr in attrs]
+
+        return f'{type(self).__name__}({" ".join(values)})'
+
+    @classmethod
+    def make_class(cls, names: list[str], lazy: dict[str, Any] | None = None) -> type['ParsedArguments']:
+        """Generates the subclass with the slots
+
+        :param names: Names of the arguments
+        :param lazy: Dictionary with the type-cast functions of the lazy arguments by names (see :class:`LazyArgument`)
+
+        :return: Generated subclass
+
+        :raises ValueError: When the name of the lazy argument is not an identifier
+        """
+
+        lazy = lazy or {}
+
+        if not all(name.isidentifier() for name in lazy):
+            raise ValueError('Names of the lazy arguments must be identifiers')
+
+        slots = tuple(dict.fromkeys(['PREFIX', 'CMD', 'REPLY_TO_MESSAGE', 'STACK'] +
+                                    [f'_lazy_{name}' if name in lazy else name for name in names]))
+
+        # names, that can't be the slots, are stored in the attributes dictionary
+        if not all(name.isidentifier() for name in slots):
+            slots = tuple(name for name in slots if name.isidentifier()) + ('__dict__', )
+
+        result_class = type('ParsedArguments', (cls, ), {'__slots__': slots})
+
+        # lazy arguments are stored in the private slots and type-casted by the descriptors
+        for name, cast in lazy.items():
+            setattr(result_class, name, LazyArgument(name, result_class.__dict__[f'_lazy_{name}'], cast))
+
+        return result_class
 
 
 class ArgumentParser:
@@ -75,10 +275,13 @@ class ArgumentParser:
     :ivar parent_plugin: Parent plugin of this parser
     :ivar arguments: List with the arguments
     :ivar allow_caching: Use the caching when it parses the arguments
+    :ivar cache: :class:`ParseCache` of the parsed arguments strings (None if caching is not allowed)
     :ivar logger: Logger of the argument parser
     :ivar position_arguments: Number of the position arguments
     :ivar default_arguments: Number of the default arguments
     :ivar stack_arguments: Number of the stack arguments
+    :ivar result_class: Generated :class:`ParsedArguments` subclass of the parser
+    :ivar legacy_tokenizer: Use the old character-by-character tokenizer (see :func:`parse_string()`)
     """
 
     def __init__(self,
@@ -88,7 +291,10 @@ class ArgumentParser:
                  enable_escaping: bool = False,
                  subcommands: bool = False,
                  main_command_aliases: str | list[str] | None = None,
-                 stack_arguments: int = 0
+                 stack_arguments: int = 0,
+                 legacy_tokenizer: bool = False,
+                 cache_size: int = 256,
+                 cache_bytes: int = 1024 * 1024
                  ):
         """
         :param parent_plugin: Parent plugin of this parser
@@ -99,13 +305,21 @@ class ArgumentParser:
         :param subcommands: Enable the subcommands feature
         :param main_command_aliases: Name of the main commands (requires "subcommands")
         :param stack_arguments: Is number of "stack" arguments. This is a positional arguments, that doesn't have name
+        :param legacy_tokenizer: Use the old character-by-character tokenizer. It separates the arguments only by
+                                 the spaces (every space, so two spaces make an empty argument) and removes "\\"
+                                 characters, when escaping is disabled
+        :param cache_size: Maximum number of the cached arguments strings
+        :param cache_bytes: Maximum size (in bytes) of the cached arguments strings and their parsed arguments
         """
 
-        self.parent_plugin    = parent_plugin
-        self.arguments        = arguments
-        self.allow_caching    = allow_caching
-        self.enable_escaping  = enable_escaping
-        self.subcommands      = subcommands
+        self.parent_plugin     = parent_plugin
+        self.arguments         = arguments
+        self.allow_caching     = allow_caching
+        self.enable_escaping   = enable_escaping
+        self.subcommands       = subcommands
+        self.legacy_tokenizer  = legacy_tokenizer
+
+        self.cache: ParseCache | None = ParseCache(cache_size, cache_bytes) if allow_caching else None
 
         self.logger: ezlog.Logger = ezlog.Logger('ArgumentParser')
 
@@ -115,6 +329,10 @@ class ArgumentParser:
         self.stack_arguments: int     = stack_arguments
 
         for arg in self.arguments:
+            # documents are not taken from the text
+            if isinstance(arg, DocumentArgument):
+                continue
+
             if arg.default:
                 self.default_arguments += 1
                 continue
@@ -124,14 +342,173 @@ class ArgumentParser:
         self.subcommands_dict: dict[PluginCommand] = {}
 
         if self.subcommands:
-            # create empty command by the plugin decorator
-            self.parent_plugin.command(main_command_aliases, ap=self)(self.parent_plugin.async_empty)
+            # create empty command by the plugin decorator (every parser has its own function, because the plugin
+            # sets attributes of the command function)
+            async def main_command(event, args):
+                pass
+
+            self.parent_plugin.command(main_command_aliases, self)(main_command)
 
         # check for the reply-to argument
         if len(self.arguments) > 0 and isinstance(self.arguments[0], ReplyToArgument):
             if self.arguments[0].default is None:
                 self.position_arguments -= 1
 
+        self.compile()
+
+    def compile(self):
+        """Compiles the arguments to the execution plan, so the parsing is only a sequence of the type-casts.
+        It is called on initialization, call it again if the arguments are changed"""
+
+        has_reply_to    = len(self.arguments) > 0 and isinstance(self.arguments[0], ReplyToArgument)
+        self._reply_to  = self.arguments[0] if has_reply_to else None
+
+        self._documents  = tuple(arg for arg in self.arguments if isinstance(arg, DocumentArgument))
+        text_arguments   = [arg for arg in self.arguments if not isinstance(arg, DocumentArgument)]
+
+        # lazy reply-to argument is always awaitable, so its default value is awaitable too
+        lazy_reply_to  = self._reply_to is not None and self._reply_to.lazy
+        defaults       = {arg.arg_name: arg.default for arg in self.arguments}
+
+        if lazy_reply_to and self._reply_to.default is not None:
+            defaults[self._reply_to.arg_name] = LazyValue.resolved(self._reply_to.default)
+
+        # lazy arguments (except the reply-to) are stored in the slots, so the names must be identifiers,
+        # others are type-casted eagerly
+        lazy = {arg.arg_name: arg.arg_type.try_cast for arg in text_arguments
+                if arg.lazy and arg is not self._reply_to and arg.arg_name.isidentifier()}
+
+        def attr(arg: Argument) -> str:
+            # raw strings and defaults of the lazy arguments are set to their slots directly (without descriptors)
+            return f'_lazy_{arg.arg_name}' if arg.arg_name in lazy else arg.arg_name
+
+        def is_lazy(arg: Argument) -> bool:
+            return arg.arg_name in lazy or (arg.lazy and arg is self._reply_to)
+
+        # tuples: attribute name, type-cast function, default value (it is used for the empty string),
+        # wrapper of the raw string of the lazy argument (None if the argument is not lazy)
+        self._casts     = tuple((attr(arg), arg.arg_type.try_cast, defaults[arg.arg_name],
+                                 self._lazy_wrapper(arg) if is_lazy(arg) else None) for arg in text_arguments)
+        self._defaults  = tuple((attr(arg), defaults[arg.arg_name]) for arg in self.arguments if arg.default)
+
+        self._max_arguments  = self.position_arguments + self.default_arguments + self.stack_arguments
+        self._stack          = slice(len(text_arguments), len(text_arguments) + self.stack_arguments) \
+            if self.stack_arguments != 0 else None
+
+        self.result_class: type[ParsedArguments] = \
+            ParsedArguments.make_class([arg.arg_name for arg in self.arguments], lazy)
+
+    @staticmethod
+    def _lazy_wrapper(arg: Argument) -> Any:
+        """Makes the wrapper of the raw string of the lazy argument
+
+        :param arg: Lazy argument
+
+        :return: :class:`PendingToken` for the arguments, or the function that makes the :class:`LazyValue`
+                 for the :class:`ReplyToArgument`
+        """
+
+        if not isinstance(arg, ReplyToArgument):
+            return PendingToken
+
+        def wrapper(token: str) -> LazyValue:
+            async def resolver():
+                result = arg.try_cast(token)
+
+                if result is _casts.INVALID:
+                    raise ValueError(f'Can\'t type cast the argument {arg.arg_name}')
+
+                return result
+
+            return LazyValue(resolver)
+
+        return wrapper
+
+    def _lazy_reply_to(self, event, output_args: ParsedArguments) -> LazyValue:
+        """Makes the :class:`LazyValue` of the lazy :class:`ReplyToArgument`, that fetches the replied message
+        on the first ``await`` and sets the ``REPLY_TO_MESSAGE`` attribute
+
+        :param event: Telethon event
+        :param output_args: Parsed arguments
+
+        :return: Unresolved :class:`LazyValue`
+        """
+
+        arg = self._reply_to
+
+        async def resolver():
+            msg = await self.get_reply_message(event)
+
+            if msg is None:
+                raise LookupError('Can\'t find the replied message')
+
+            result = arg.try_cast(msg.message)
+
+            if result is _casts.INVALID:
+                raise ValueError(f'Can\'t type cast the argument {arg.arg_name}')
+
+            output_args.REPLY_TO_MESSAGE = msg
+
+            return result
+
+        return LazyValue(resolver)
+
+    async def get_reply_message(self, event) -> Any | None:
+        """Gets the replied message from the recent messages of the instance, or fetches it by ID
+
+        :param event: Telethon event
+
+        :return: Replied message or None if it is not found
+        """
+
+        instance = self.parent_plugin.context.instance
+
+        if instance.message_cache is not None:
+            return await instance.message_cache.fetch(event.chat_id, event.reply_to.reply_to_msg_id)
+
+        return await instance.client.get_messages(event.chat_id, ids=event.reply_to.reply_to_msg_id)
+
+    async def download_documents(self, event, output_args: ParsedArguments) -> ArgumentParseError | None:
+        """Downloads the document of the command message (or of the replied message) for the document arguments
+
+        :param event: Telethon event
+        :param output_args: Parsed arguments to set the :class:`DocumentHandle` objects
+
+        :return: None if the documents are downloaded (or have the default values), otherwise
+                 :class:`ArgumentParseError`
+        """
+
+        message = event.message if event.document else None
+
+        if message is None and event.reply_to:
+            message = getattr(output_args, 'REPLY_TO_MESSAGE', None) or await self.get_reply_message(event)
+
+        if message is None or not message.document:
+            if any(arg.default is None for arg in self._documents):
+                return ArgumentParseError.DocumentRequired
+
+            return
+
+        # size is checked before the downloading, so nothing is downloaded for the rejected document
+        if any(arg.max_size is not None and message.file.size > arg.max_size for arg in self._documents):
+            return ArgumentParseError.DocumentTooLarge
+
+        # document is downloaded once for all document arguments (temp file is removed on the failed download)
+        try:
+            handle = await download_document(self.parent_plugin.context.instance.client,
+                                             message,
+                                             self.parent_plugin.context.dirs.cache_dir,
+                                             min(arg.chunk_size for arg in self._documents),
+                                             any(arg.keep_file for arg in self._documents))
+        except Exception as e:
+            self.logger.error('Can\'t download the document')
+            self.logger.exception('Exception:', exception=e)
+
+            return ArgumentParseError.DocumentDownloadFailed
+
+        for arg in self._documents:
+            setattr(output_args, arg.arg_name, handle)
+
     def _cached_check(self, string: str) -> list[str]:
         """Checker for the cached parsed value
 
@@ -140,27 +517,41 @@ class ArgumentParser:
         :return: Executed + new cached result or already cached result of the :func:`parse_string()` method
         """
 
-        if not self.allow_caching:
+        if self.cache is None:
             return self.parse_string(string)
 
-        # get hash of the string
-        str_hash = hash(string)
+        args = self.cache.get(string)
 
-        if str_hash not in _CACHED:
-            _CACHED[str_hash] = self.parse_string(string)
+        if args is None:
+            args = self.parse_string(string)
+            self.cache.put(string, args)
 
-        return _CACHED[str_hash]
+        return args
 
     ####
 
     def parse_string(self, string: str) -> list[str]:
-        """Parses the string to the list with the arguments
+        """Parses the string to the list with the arguments by the :func:`tokenize` function.
+        If ``legacy_tokenizer`` is enabled, the old tokenizer is used (string must end with the "\\00" character)
 
         :param string: String to parse
 
         :return: List with the parsed arguments (raw, string type)
         """
 
+        if self.legacy_tokenizer:
+            return self._parse_string_legacy(string)
+
+        return tokenize(string, self.enable_escaping)
+
+    def _parse_string_legacy(self, string: str) -> list[str]:
+        """Parses the string to the list with the arguments character by character (old tokenizer)
+
+        :param string: String to parse (must end with the "\\00" character)
+
+        :return: List with the parsed arguments (raw, string type)
+        """
+
         # initialize the variables to first parse stage
         str_open       = False
         str_open_char  = None
@@ -222,26 +613,32 @@ class ArgumentParser:
 
         return temp_args
 
-    async def parse(self, text: str, event, command_func: PluginCommand) -> (bool, Context | ArgumentParseError):
+    async def parse(self, text: str, event, command_func: PluginCommand) -> ArgumentParseError | None:
         """Parses text (with command) into the arguments
 
         :param text: Message text with command
         :param event: Telethon event
         :param command_func: Command function to execute
 
-        :return: Tuple with elements: first is bool (True if success, False if result is error), second is :class:`Context` with parsed arguments or :class:`ArgumentParseError` (if first is False)
+        :return: None if the command is executed, otherwise :class:`ArgumentParseError`. The command gets the
+                 :class:`ParsedArguments` with the parsed arguments
         """
 
         self.logger.debug('ArgumentParser called with text: {}', text)
 
-        args = text.split(' ')
+        # the old tokenizer separates the arguments only by the spaces, the new one splits off the prefix,
+        # the command and the subcommand (if it is used)
+        if self.legacy_tokenizer:
+            args = text.split(' ')
+        else:
+            args = text.split(maxsplit=3 if self.subcommands else 2)
 
         # check for the subcommands
         if self.subcommands:
             self.logger.debug('Command with subcommands has called')
 
             # check for the arguments length
-            if len(args) < 2:
+            if len(args) < 3:
                 self.logger.debug('Too little arguments')
                 return ArgumentParseError.TooLittleArguments
 
@@ -252,8 +649,9 @@ class ArgumentParser:
                 func = self.subcommands_dict[args[2]]  # get function
 
                 # check for the ArgumentParser is using in command
-                if func.ap is not None:
-                    return await func.ap.parse([args[0]] + args[2:], event, func)
+                if func.parser is not None:
+                    # subcommand is parsed as the command with the same prefix
+                    return await func.parser.parse(' '.join([args[0]] + args[2:]), event, func)
 
                 self.logger.info('Function {} (command: {}) doesn\'t have ArgumentParser!', func.__name__, args[2])
 
@@ -262,44 +660,48 @@ class ArgumentParser:
                 return ArgumentParseError.IncorrectSubcommand
 
         # initialize the variables
-        output_args = Context()
+        output_args = self.result_class()
         output_args.PREFIX = args[0]
         output_args.CMD = args[1]
         temp_args = []
 
         if len(args) > 2:
-            input_str = ' '.join(args[2:]) + '\00'
+            # the old tokenizer requires the end character
+            input_str = ' '.join(args[2:]) + '\00' if self.legacy_tokenizer else args[2]
 
             # parse the stringuity
             temp_args = self._cached_check(input_str)
 
+        # initialize the default arguments (before the reply-to, so it doesn't overwrite the replied message)
+        for name, default in self._defaults:
+            setattr(output_args, name, default)
+
         # check for the reply-to argument
-        if len(self.arguments) > 0 and isinstance(self.arguments[0], ReplyToArgument):
-            arg = self.arguments[0]
+        if self._reply_to is not None:
+            arg = self._reply_to
 
             # check if message has reply-to
-            if event.reply_to:
-                # find reply-to message
-                msg = [msg async for msg in
-                       self.parent_plugin.context.instance.client.iter_messages(event.chat_id, RT_ITER_NUM)
-                       if msg.id == event.reply_to.reply_to_msg_id]
-                if len(msg) == 0:
+            if event.reply_to and arg.lazy:
+                setattr(output_args, arg.arg_name, self._lazy_reply_to(event, output_args))
+
+            elif event.reply_to:
+                # find reply-to message in the recent messages, or fetch it by ID
+                msg = await self.get_reply_message(event)
+
+                if msg is None:
                     return ArgumentParseError.CantFindOriginalMessage
-                msg = msg[0]
 
                 # type-cast the argument
-                error, result = arg.typecast(msg.message)
+                result = arg.try_cast(msg.message)
 
                 # check for the error
-                if error:
-                    self.logger.debug('Can\'t cast the argument')
-                    log_exception(self.logger, result)
-
+                if result is _casts.INVALID:
+                    self.logger.debug('Can\'t cast the argument {}', arg.arg_name)
                     return ArgumentParseError.IncorrectType
 
                 # set up the type-casted reply-to message
                 setattr(output_args, arg.arg_name, result)
-                setattr(output_args, 'REPLY_TO_MESSAGE', msg)
+                output_args.REPLY_TO_MESSAGE = msg
             else:
                 if arg.default is None:
                     return ArgumentParseError.ReplyToRequired
@@ -310,40 +712,33 @@ class ArgumentParser:
             return ArgumentParseError.TooLittleArguments
 
         # compare the arguments sum length
-        if len(temp_args) > self.position_arguments + self.default_arguments + self.stack_arguments:
+        if len(temp_args) > self._max_arguments:
             self.logger.debug('Too much arguments')
             return ArgumentParseError.TooManyArguments
 
-        # initialize the default arguments
-        for arg in self.arguments:
-            if arg.default:
-                setattr(output_args, arg.arg_name, arg.default)
-
         # type-cast & define the arguments
-        for arg, targ in zip(self.arguments, temp_args):
-            # type-cast the argument
-            error, result = arg.typecast(targ)
+        for (name, cast, default, lazy), targ in zip(self._casts, temp_args):
+            if lazy is not None:
+                setattr(output_args, name, lazy(targ) if targ != '' else default)
+                continue
 
-            # check for the error
-            if error:
-                self.logger.debug('Can\'t cast the argument')
-                log_exception(self.logger, result)
+            result = cast(targ) if targ != '' else default
 
+            if result is _casts.INVALID:
+                self.logger.debug('Can\'t cast the argument {}', name)
                 return ArgumentParseError.IncorrectType
 
-            # define variable
-            setattr(output_args, arg.arg_name, result)
+            setattr(output_args, name, result)
 
-        if self.stack_arguments != 0:
-            output_args.STACK = []
+        if self._stack is not None:
+            output_args.STACK = temp_args[self._stack]
 
-            for arg, targ in zip([None]*len(self.arguments) + [0]*self.stack_arguments, temp_args):
-            
-                # skip argument if it is positional\default
-                if arg is None:
-                    continue
+        # download the documents, when the text arguments are correct
+        if self._documents:
+            error = await self.download_documents(event, output_args)
 
-                output_args.STACK.append(targ)
+            if error is not None:
+                return error
 
         # call the command
         try:
@@ -355,6 +750,13 @@ class ArgumentParser:
 
             return ArgumentParseError.PluginError
 
+        finally:
+            for arg in self._documents:
+                handle = getattr(output_args, arg.arg_name, None)
+
+                if isinstance(handle, DocumentHandle) and not handle.keep:
+                    handle.remove()
+
         return None
 
     ####
@@ -373,9 +775,12 @@ class ArgumentParser:
             nonlocal aliases
 
             # register command by the plugins decorator
-            func = self.parent_plugin.command(aliases, ap, static_pname)(func)
+            func = self.parent_plugin.command(aliases, ap)(func)
 
             # register aliases in the argument parser subcommands dict
+            if aliases is None:
+                aliases = [func.__name__]
+
             aliases = aliases if isinstance(aliases, list) else [aliases, ]
             for a in aliases:
                 self.subcommands_dict[a] = func
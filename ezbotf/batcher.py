@@ -0,0 +1,157 @@
+"""
+Defines :class:`UpdateBatcher` that collects bursts of the updates to handle them together
+"""
+
+import time
+import asyncio
+
+from collections import deque
+
+from telethon.events.raw import EventBuilder
+
+from . import ezlog
+
+from typing import Any, Awaitable, Callable
+
+__all__ = ['BatchHandler', 'UpdateBatcher']
+
+BatchHandler = Callable[[list[EventBuilder]], Awaitable[Any]]
+BatchHandler.__doc__ = 'A type-hint for the functions, that handles the batch of the updates'
+
+
+class UpdateBatcher:
+    """Collects the updates for the short window and passes them to the handler as one batch.
+    The window is started by the first update of the batch, so any update is delayed not more than ``window``
+    seconds. Batch is passed earlier, when it reaches ``max_batch`` updates. Batches are handled one by one
+    in the order they are collected, so the next batch is not passed until the handler of the previous one returns
+
+    :ivar handler: Function that handles the batch
+    :ivar window: Maximum time (in seconds) of the updates collecting
+    :ivar max_batch: Maximum number of the updates in the batch
+    :ivar logger: Logger of the batcher
+    :ivar pending: List with the collected updates
+    :ivar queue: Queue with the batches, that wait for the handler
+    :ivar batches: Number of the passed batches
+    :ivar updates: Number of the passed updates
+    :ivar max_batch_size: Maximum size of the passed batch
+    :ivar total_delay: Total time (in seconds) the first updates of the batches were delayed
+    :ivar max_delay: Maximum time (in seconds) the first update of the batch was delayed
+    """
+
+    def __init__(self,
+                 handler: BatchHandler,
+                 window: float = 0.005,
+                 max_batch: int = 64,
+                 logger: ezlog.Logger | None = None):
+        """
+        :param handler: Function that handles the batch
+        :param window: Maximum time (in seconds) of the updates collecting
+        :param max_batch: Maximum number of the updates in the batch
+        :param logger: Logger of the batcher
+        """
+
+        self.handler    = handler
+        self.window     = window
+        self.max_batch  = max_batch
+        self.logger     = logger if logger is not None else ezlog.Logger('UpdateBatcher')
+
+        self.pending: list[EventBuilder]       = []
+        self.queue: deque[list[EventBuilder]]  = deque()
+
+        self._started_at: float                         = 0.0
+        self._flush_handle: asyncio.TimerHandle | None  = None
+        self._worker: asyncio.Task | None               = None
+
+        self.batches: int         = 0
+        self.updates: int         = 0
+        self.max_batch_size: int  = 0
+
+        self.total_delay: float  = 0.0
+        self.max_delay: float    = 0.0
+
+    async def __call__(self, event: EventBuilder):
+        """Adds an update to the batch. It may be used as the handler of the :class:`TelegramClient`
+
+        :param event: Event from Telethon
+        """
+
+        self.add(event)
+
+    def add(self, event: EventBuilder):
+        """Adds an update to the batch. Must be called inside the running event loop
+
+        :param event: Event from Telethon
+        """
+
+        self.pending.append(event)
+
+        if len(self.pending) == 1:
+            self._started_at    = time.monotonic()
+            self._flush_handle  = asyncio.get_running_loop().call_later(self.window, self.flush)
+
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+
+    def flush(self):
+        """Passes the collected updates to the handler"""
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if not self.pending:
+            return
+
+        batch         = self.pending
+        self.pending  = []
+
+        delay             = time.monotonic() - self._started_at
+        self.total_delay  += delay
+        self.max_delay    = max(self.max_delay, delay)
+
+        self.batches         += 1
+        self.updates         += len(batch)
+        self.max_batch_size  = max(self.max_batch_size, len(batch))
+
+        self.queue.append(batch)
+
+        # handler of the batch may wait (for example, for the network requests), so the later batch must not
+        # overtake it: the only worker handles the queued batches in order
+        if self._worker is None:
+            self._worker = asyncio.get_running_loop().create_task(self._handle_queue())
+
+    async def _handle_queue(self):
+        """Handles the queued batches one by one"""
+
+        try:
+            while self.queue:
+                await self._handle(self.queue.popleft())
+        finally:
+            self._worker = None
+
+    async def _handle(self, batch: list[EventBuilder]):
+        """Calls the handler with the batch
+
+        :param batch: List with the updates
+        """
+
+        try:
+            await self.handler(batch)
+        except Exception as e:
+            self.logger.error('Exception has been occurred while handling the batch of {} updates', len(batch))
+            self.logger.exception('Exception:', exception=e)
+
+    def stats(self) -> dict[str, int | float]:
+        """Gets the statistics of the batcher
+
+        :returns: Dictionary with the statistics (batches, updates, batch sizes and delays)
+        """
+
+        return {
+            'batches': self.batches,
+            'updates': self.updates,
+            'avg_batch_size': self.updates / self.batches if self.batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'avg_delay': self.total_delay / self.batches if self.batches else 0.0,
+            'max_delay': self.max_delay
+        }
@@ -0,0 +1,229 @@
+"""
+Defines :class:`ChatEnablement` that stores plugins and commands, disabled in the separate chats
+"""
+
+import pathlib
+
+__all__ = ['ChatEnablement']
+
+
+class ChatEnablement:
+    """Per-chat enablement of the plugins and commands. Every plugin and command (unit) has the ordinal,
+    and every chat has a bitset (int) of the disabled units. Check is one dictionary lookup and one bitwise AND,
+    chats without disabled units are not stored at all.
+
+    Changes are appended to the file as the records, so the file is never rewritten on change.
+    It is compacted on load, when it has too many outdated records, and on the next save, when it has
+    malformed records (such as the record truncated by a crash)
+
+    :ivar path: Path to the file (None if the enablement is not persisted)
+    :ivar ordinals: Dictionary with the ordinals of the units (key is a unit name: plugin name or "plugin:command")
+    :ivar names: List with the names of the units by ordinals
+    :ivar disabled: Dictionary with the bitsets of the disabled units by chat ID
+    :ivar records: Number of the records in the file
+    :ivar writes: Number of the appended records
+    :ivar malformed: Number of the malformed records, skipped on load
+    """
+
+    # file is compacted on load, when the outdated records are more than this number
+    COMPACT_THRESHOLD = 1024
+
+    def __init__(self, path: pathlib.Path | None = None):
+        """
+        :param path: Path to the file
+        """
+
+        self.path = path
+
+        self.ordinals: dict[str, int]  = {}
+        self.names: list[str]          = []
+        self.disabled: dict[int, int]  = {}
+
+        self.records: int    = 0
+        self.writes: int     = 0
+        self.malformed: int  = 0
+
+        self._compact_pending = False
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> 'ChatEnablement':
+        """Loads the enablement from the file. If the file is not exists, it will be created
+
+        :param path: Path to the file
+
+        :returns: Initialized :class:`ChatEnablement`
+        """
+
+        enablement = cls(path)
+
+        if not path.exists():
+            path.touch()
+
+        text = path.read_text()
+
+        for line in text.splitlines():
+            if not line:
+                continue
+
+            try:
+                match line.split(' ', 2):
+                    case ['o', ordinal, name] if name and int(ordinal) >= 0:
+                        enablement._add_ordinal(name, int(ordinal))
+                    case ['d', chat_id, ordinal] if int(ordinal) >= 0:
+                        enablement._set(int(chat_id), int(ordinal), False)
+                    case ['e', chat_id, ordinal] if int(ordinal) >= 0:
+                        enablement._set(int(chat_id), int(ordinal), True)
+                    case _:
+                        raise ValueError(line)
+            except ValueError:
+                enablement.malformed += 1
+                continue
+
+            enablement.records += 1
+
+        # record, appended after the truncated line, would be malformed too
+        enablement._compact_pending = bool(enablement.malformed) or bool(text) and not text.endswith('\n')
+
+        live_records = len(enablement.names) + sum(bits.bit_count() for bits in enablement.disabled.values())
+
+        if enablement.records - live_records > cls.COMPACT_THRESHOLD:
+            enablement.compact()
+
+        return enablement
+
+    ####
+
+    def _add_ordinal(self, name: str, ordinal: int):
+        """Adds the ordinal of the unit without saving
+
+        :param name: Name of the unit
+        :param ordinal: Ordinal of the unit
+        """
+
+        self.ordinals[name] = ordinal
+
+        while len(self.names) <= ordinal:
+            self.names.append('')
+
+        self.names[ordinal] = name
+
+    def _set(self, chat_id: int, ordinal: int, enabled: bool):
+        """Sets the bit of the unit in the chat without saving
+
+        :param chat_id: ID of the chat
+        :param ordinal: Ordinal of the unit
+        :param enabled: Unit is enabled in the chat
+        """
+
+        bits = self.disabled.get(chat_id, 0)
+        bits = bits & ~(1 << ordinal) if enabled else bits | (1 << ordinal)
+
+        if bits:
+            self.disabled[chat_id] = bits
+        else:
+            self.disabled.pop(chat_id, None)
+
+    def _append(self, record: str):
+        """Appends the record to the file
+
+        :param record: Record to append
+        """
+
+        if self.path is None:
+            return
+
+        # state is already changed, so the compacted file has the record
+        if self._compact_pending:
+            self.compact()
+            return
+
+        with open(self.path, 'a') as f:
+            f.write(record + '\n')
+
+        self.records  += 1
+        self.writes   += 1
+
+    ####
+
+    def ordinal(self, name: str) -> int:
+        """Gets the ordinal of the unit. If the unit hasn't an ordinal, it will be assigned
+
+        :param name: Name of the unit (plugin name or "plugin:command")
+
+        :returns: Ordinal of the unit
+        """
+
+        ordinal = self.ordinals.get(name)
+
+        if ordinal is None:
+            ordinal = len(self.names)
+
+            self._add_ordinal(name, ordinal)
+            self._append(f'o {ordinal} {name}')
+
+        return ordinal
+
+    def mask(self, name: str) -> int:
+        """Gets the bitmask of the unit
+
+        :param name: Name of the unit (plugin name or "plugin:command")
+
+        :returns: Bitmask with the one bit of the unit
+        """
+
+        return 1 << self.ordinal(name)
+
+    def is_enabled(self, chat_id: int, mask: int) -> bool:
+        """Checks if all units of the mask are enabled in the chat
+
+        :param chat_id: ID of the chat
+        :param mask: Bitmask of the units (may be combined by OR)
+
+        :returns: True if all units are enabled, otherwise False
+        """
+
+        return not self.disabled.get(chat_id, 0) & mask
+
+    def set(self, chat_id: int, name: str, enabled: bool):
+        """Enables or disables the unit in the chat and appends the change to the file
+
+        :param chat_id: ID of the chat
+        :param name: Name of the unit (plugin name or "plugin:command")
+        :param enabled: Enable the unit in the chat
+        """
+
+        ordinal = self.ordinal(name)
+
+        if self.is_enabled(chat_id, 1 << ordinal) == enabled:
+            return
+
+        self._set(chat_id, ordinal, enabled)
+        self._append(f'{"e" if enabled else "d"} {chat_id} {ordinal}')
+
+    def disabled_names(self, chat_id: int) -> list[str]:
+        """Gets the names of the units disabled in the chat
+
+        :param chat_id: ID of the chat
+
+        :returns: List with the names of the disabled units
+        """
+
+        bits = self.disabled.get(chat_id, 0)
+
+        return [name for ordinal, name in enumerate(self.names) if bits >> ordinal & 1]
+
+    def compact(self):
+        """Rewrites the file with the actual records only"""
+
+        if self.path is None:
+            return
+
+        lines = [f'o {ordinal} {name}' for ordinal, name in enumerate(self.names) if name]
+
+        for chat_id, bits in self.disabled.items():
+            lines += [f'd {chat_id} {ordinal}' for ordinal in range(bits.bit_length()) if bits >> ordinal & 1]
+
+        self.path.write_text(''.join(line + '\n' for line in lines))
+
+        self.records           = len(lines)
+        self._compact_pending  = False
@@ -0,0 +1,172 @@
+"""
+Defines :class:`EditCache` that helps to skip the message edits that doesn't change the command,
+and to update the previous response in place, when the command is changed
+"""
+
+from collections import OrderedDict
+
+from telethon import events
+from telethon.errors import MessageNotModifiedError
+from telethon.events.raw import EventBuilder
+
+from typing import Any
+
+__all__ = ['EditEntry', 'EditCache']
+
+# parameters of the "respond" and "reply" methods, that supported by the TelegramClient.edit_message()
+EDIT_KWARGS = frozenset(['parse_mode', 'attributes', 'formatting_entities', 'link_preview', 'file', 'thumb',
+                         'force_document', 'buttons', 'supports_streaming', 'schedule'])
+
+
+class EditEntry:
+    """Entry of the :class:`EditCache`
+
+    :ivar text_hash: Hash of the command text
+    :ivar response_id: ID of the first response message to the command (None if there is no response)
+    :ivar previous_response_id: ID of the response message from the previous execution, that must be updated
+    """
+
+    __slots__ = ('text_hash', 'response_id', 'previous_response_id')
+
+    def __init__(self, text_hash: int):
+        """
+        :param text_hash: Hash of the command text
+        """
+
+        self.text_hash             = text_hash
+        self.response_id           = None
+        self.previous_response_id  = None
+
+
+class EditCache:
+    """Bounded cache of the handled commands messages (by chat ID and message ID)
+
+    :ivar max_size: Maximum number of the cached messages
+    :ivar entries: Ordered dictionary with the entries
+    :ivar dropped: Number of the dropped edits (command is not changed)
+    :ivar reexecuted: Number of the edits, that changed the command
+    :ivar updated_responses: Number of the responses updated in place
+    """
+
+    def __init__(self, max_size: int = 4096):
+        """
+        :param max_size: Maximum number of the cached messages
+        """
+
+        self.max_size = max_size
+
+        self.entries: OrderedDict[tuple[int, int], EditEntry] = OrderedDict()
+
+        self.dropped: int            = 0
+        self.reexecuted: int         = 0
+        self.updated_responses: int  = 0
+
+    def track(self, event: EventBuilder, text: str) -> EditEntry | None:
+        """Tracks the command message
+
+        :param event: Event of the message from Telethon
+        :param text: Text of the command
+
+        :returns: Entry of the message or None if it is an edit, that doesn't change the command (must be dropped)
+        """
+
+        key        = (event.chat_id, event.id)
+        text_hash  = hash(text)
+        entry      = self.entries.get(key)
+
+        if entry is not None and isinstance(event, events.MessageEdited.Event):
+            if entry.text_hash == text_hash:
+                self.dropped += 1
+                return
+
+            self.entries.move_to_end(key)
+            self.reexecuted += 1
+
+            entry.text_hash             = text_hash
+            entry.previous_response_id  = entry.response_id
+            entry.response_id           = None
+
+            return entry
+
+        entry = EditEntry(text_hash)
+
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+        return entry
+
+    def bind(self, event: EventBuilder, entry: EditEntry):
+        """Replaces the ``respond`` and ``reply`` methods of the event, so the first response of the re-executed
+        command updates the previous response message, and the response ID is remembered
+
+        :param event: Event of the message from Telethon
+        :param entry: Entry of the message
+        """
+
+        def wrap(send):
+            async def f(*args, **kwargs) -> Any:
+                return await self._send(event, entry, send, args, kwargs)
+
+            return f
+
+        # event doesn't allow to set new attributes after initialization, so its __dict__ is used directly
+        event.__dict__['respond']  = wrap(event.respond)
+        event.__dict__['reply']    = wrap(event.reply)
+
+    async def _send(self, event: EventBuilder, entry: EditEntry, send, args: tuple, kwargs: dict) -> Any:
+        """Sends the response or updates the previous response
+
+        :param event: Event of the message from Telethon
+        :param entry: Entry of the message
+        :param send: Original method to send the response
+        :param args: Positional arguments of the method
+        :param kwargs: Keyword arguments of the method
+
+        :returns: Message from Telethon
+        """
+
+        if entry.previous_response_id is not None:
+            response_id = entry.previous_response_id
+            entry.previous_response_id = None
+
+            try:
+                message = await event.client.edit_message(event.chat_id, response_id, *args,
+                                                          **{k: v for k, v in kwargs.items() if k in EDIT_KWARGS})
+            except MessageNotModifiedError:
+                # response is not changed, but the caller expects the message (e.g. to edit it later)
+                message = await event.client.get_messages(event.chat_id, ids=response_id)
+
+                if message is None:
+                    response_id = None
+            except Exception:
+                # previous response may be deleted, so the new one is sent
+                response_id = None
+
+            if response_id is not None:
+                self.updated_responses  += 1
+                entry.response_id       = response_id
+
+                return message
+
+        message = await send(*args, **kwargs)
+
+        if entry.response_id is None and message is not None:
+            entry.response_id = message.id
+
+        return message
+
+    def stats(self) -> dict[str, int]:
+        """Gets the statistics of the cache
+
+        :returns: Dictionary with the statistics (size, dropped, reexecuted edits and updated responses)
+        """
+
+        return {
+            'size': len(self.entries),
+            'dropped': self.dropped,
+            'reexecuted': self.reexecuted,
+            'updated_responses': self.updated_responses
+        }
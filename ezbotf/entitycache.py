@@ -0,0 +1,176 @@
+"""
+Defines :class:`EntityCache` that helps to share the resolved Telegram entities (users, chats) between
+the framework elements and plugins
+"""
+
+import time
+
+from collections import OrderedDict
+
+from telethon import TelegramClient
+from telethon.events.raw import EventBuilder
+
+from typing import Any, Iterable
+
+__all__ = ['EntityCache']
+
+
+class EntityCache:
+    """LRU cache of the Telegram entities with the time-to-live. Entities are resolved lazily, only when they
+    are requested and missing in the cache
+
+    :ivar client: :class:`TelegramClient` to resolve the entities
+    :ivar max_size: Maximum number of the cached entities
+    :ivar ttl: Time-to-live (in seconds) of the cached entity
+    :ivar entities: Ordered dictionary with the cached entities. Value is a tuple: entity, expire time
+    :ivar hits: Number of the cache hits
+    :ivar misses: Number of the cache misses
+    :ivar evictions: Number of the evicted (by size or expired) entities
+    """
+
+    def __init__(self, client: TelegramClient, max_size: int = 10000, ttl: float = 600.0):
+        """
+        :param client: :class:`TelegramClient` to resolve the entities
+        :param max_size: Maximum number of the cached entities
+        :param ttl: Time-to-live (in seconds) of the cached entity
+        """
+
+        self.client    = client
+        self.max_size  = max_size
+        self.ttl       = ttl
+
+        self.entities: OrderedDict[int, tuple[Any, float]] = OrderedDict()
+
+        self.hits: int       = 0
+        self.misses: int     = 0
+        self.evictions: int  = 0
+
+    def get(self, entity_id: int) -> Any | None:
+        """Gets an entity from the cache (without network requests)
+
+        :param entity_id: ID of the entity
+
+        :returns: Cached entity or None if it is not cached or expired
+        """
+
+        cached = self.entities.get(entity_id)
+
+        if cached is None:
+            self.misses += 1
+            return
+
+        if cached[1] < time.monotonic():
+            del self.entities[entity_id]
+
+            self.evictions  += 1
+            self.misses     += 1
+            return
+
+        self.entities.move_to_end(entity_id)
+        self.hits += 1
+
+        return cached[0]
+
+    def put(self, entity: Any):
+        """Puts an entity to the cache
+
+        :param entity: Entity from Telethon (must have ``id`` attribute)
+        """
+
+        self.entities[entity.id] = (entity, time.monotonic() + self.ttl)
+        self.entities.move_to_end(entity.id)
+
+        while len(self.entities) > self.max_size:
+            self.entities.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, entity_id: int):
+        """Removes an entity from the cache
+
+        :param entity_id: ID of the entity
+        """
+
+        self.entities.pop(entity_id, None)
+
+    async def resolve(self, entity_id: int) -> Any:
+        """Gets an entity from the cache or resolves it by the client
+
+        :param entity_id: ID of the entity
+
+        :returns: Entity from Telethon
+        """
+
+        entity = self.get(entity_id)
+
+        if entity is None:
+            entity = await self.client.get_entity(entity_id)
+            self.put(entity)
+
+        return entity
+
+    async def resolve_many(self, entity_ids: Iterable[int]) -> list[Any]:
+        """Gets entities from the cache and resolves the missing entities by one request of the client
+
+        :param entity_ids: IDs of the entities
+
+        :returns: List with the entities from Telethon (entities, that can't be resolved, are skipped)
+        """
+
+        entities  = []
+        missing   = []
+
+        for entity_id in entity_ids:
+            entity = self.get(entity_id)
+
+            if entity is None:
+                missing.append(entity_id)
+            else:
+                entities.append(entity)
+
+        if missing:
+            try:
+                resolved = await self.client.get_entity(missing)
+            except (ValueError, TypeError):
+                # one of the entities can't be resolved, they will be resolved separately on request
+                return entities
+
+            for entity in resolved:
+                self.put(entity)
+
+            entities += resolved
+
+        return entities
+
+    async def resolve_sender(self, event: EventBuilder) -> Any:
+        """Gets a sender of the event from the cache or resolves it by the event
+
+        :param event: Event of the message from Telethon
+
+        :returns: Sender entity from Telethon or None, if the event has no sender
+        """
+
+        entity = self.get(event.sender_id)
+
+        if entity is None:
+            entity = await event.get_sender()
+
+            if entity is not None:
+                self.put(entity)
+
+        return entity
+
+    def stats(self) -> dict[str, int | float]:
+        """Gets the statistics of the cache
+
+        :returns: Dictionary with the statistics (size, hits, misses, evictions and hit rate)
+        """
+
+        requests = self.hits + self.misses
+
+        return {
+            'size': len(self.entities),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / requests if requests else 0.0
+        }
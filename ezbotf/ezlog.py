@@ -12,7 +12,12 @@ Specially written for the EzBot Framework project
 """
 
 import sys
+import time
+import queue
+import atexit
+import string
 import typing
+import threading
 
 import colorama
 import traceback
@@ -83,6 +88,10 @@ LOGGER_GROUPS = {}
 # colors reset
 reset = colorama.Style.RESET_ALL
 
+# generation of the handlers and their levels. It is changed on any change of them, so the loggers
+# and groups recalculate their cached effective levels
+_levels_generation = 0
+
 
 # utilities
 
@@ -130,6 +139,14 @@ def type_to_color(type_: type | str, color_set: dict) -> str:
     return color_set['types']['all']
 
 
+def invalidate_levels():
+    """Invalidates the cached effective levels of all loggers and groups.
+    It is called automatically, when the handlers or their levels are changed"""
+
+    global _levels_generation
+    _levels_generation += 1
+
+
 def register_log_level(level: int, level_name: str):
     """Registers new log level
 
@@ -150,6 +167,14 @@ def make_logger_binding(level: int) -> ...:
     """
 
     def f(self, message: str, *args, exception: Exception | None = None):
+        # return immediately, if no handler receives the level
+        if self._levels_generation != _levels_generation or \
+                (self._handlers_snapshot is not None and self._handlers_snapshot != self._handlers):
+            self.update_levels()
+
+        if level < self.min_level:
+            return
+
         if level == LogLevel.CRITICAL:
             message = f'{colorama.Back.LIGHTRED_EX}{message}{colorama.Style.RESET_ALL}'
 
@@ -175,8 +200,125 @@ def register_bindings(cls):
         setattr(cls, name.lower(), make_logger_binding(level))
 
 
+class CompiledFormatter:
+    """Formatter string, that is parsed once. Fields are split to the static (they are rendered once by
+    :func:`bind()`) and the dynamic (they are passed on every call of the bound formatter)
+
+    :ivar formatter: Formatter string
+    :ivar dynamic: Names of the dynamic fields
+    :ivar items: Parsed formatter (tuples: literal text, field name, format spec, conversion)
+    """
+
+    _string_formatter = string.Formatter()
+
+    def __init__(self: Self, formatter: str, dynamic: tuple[str, ...]):
+        """
+        :param formatter: Formatter string
+        :param dynamic: Names of the dynamic fields
+        """
+
+        self.formatter  = formatter
+        self.dynamic    = dynamic
+        self.items      = list(self._string_formatter.parse(formatter))
+
+    def bind(self: Self, **static: Any) -> 'BoundFormatter':
+        """Renders the static fields
+
+        :param static: Values of the static fields
+
+        :returns: Formatter of the dynamic fields
+        """
+
+        fmt    = self._string_formatter
+        parts  = ['']
+        slots  = []
+
+        for literal, field_name, spec, conversion in self.items:
+            parts[-1] += literal
+
+            if field_name is None:
+                continue
+
+            # format spec may contain the nested static fields
+            if '{' in spec:
+                spec = fmt.vformat(spec, (), static)
+
+            if field_name in self.dynamic:
+                slots.append((len(parts), self.dynamic.index(field_name), spec, conversion))
+                parts.append('')
+                parts.append('')
+                continue
+
+            value = fmt.convert_field(fmt.get_field(field_name, (), static)[0], conversion)
+            parts[-1] += format(value, spec)
+
+        return BoundFormatter(parts, slots)
+
+
+class BoundFormatter:
+    """Formatter with the rendered static fields, that is returned by the :func:`CompiledFormatter.bind()`.
+    Call it with the values of the dynamic fields (in the order of the ``dynamic`` names)
+
+    :ivar parts: Rendered parts of the string (places of the dynamic fields are empty)
+    :ivar slots: Places of the dynamic fields (tuples: index of the part, index of the value, spec, conversion)
+    """
+
+    __slots__ = ('parts', 'slots', '_simple')
+
+    def __init__(self: Self, parts: list[str], slots: list[tuple[int, int, str, str | None]]):
+        """
+        :param parts: Rendered parts of the string
+        :param slots: Places of the dynamic fields
+        """
+
+        self.parts  = parts
+        self.slots  = slots
+
+        # dynamic fields without spec and conversion are inserted as is
+        self._simple = all(not spec and conversion is None for _, _, spec, conversion in slots)
+
+    def __call__(self: Self, *values: Any) -> str:
+        parts = self.parts.copy()
+
+        if self._simple:
+            for part, value, _, _ in self.slots:
+                parts[part] = values[value]
+        else:
+            fmt = CompiledFormatter._string_formatter
+
+            for part, value, spec, conversion in self.slots:
+                parts[part] = format(fmt.convert_field(values[value], conversion), spec)
+
+        return ''.join(parts)
+
+
+# compiled formatters by the formatter strings
+_compiled_formatters: dict[tuple[str, tuple[str, ...]], CompiledFormatter] = {}
+
+
+def compile_formatter(formatter: str, dynamic: tuple[str, ...]) -> CompiledFormatter:
+    """Compiles the formatter string (compiled formatters are cached)
+
+    :param formatter: Formatter string
+    :param dynamic: Names of the dynamic fields
+
+    :returns: Compiled formatter
+    """
+
+    compiled = _compiled_formatters.get((formatter, dynamic))
+
+    if compiled is None:
+        compiled = _compiled_formatters[formatter, dynamic] = CompiledFormatter(formatter, dynamic)
+
+    return compiled
+
+
 class LoggerHandler:
-    """Handler for any IO"""
+    """Handler for any IO
+
+    :ivar log_level: Minimum level of the written records (change of it invalidates the cached levels)
+    :ivar colors: Write the colored records (change of it invalidates the cached levels)
+    """
 
     def __init__(self: Self,
                  io: TextIO | None = None,
@@ -190,10 +332,28 @@ class LoggerHandler:
         """
 
         self.io          = io
-        self.log_level   = log_level
-        self.colors      = colors
+        self._log_level  = log_level
+        self._colors     = colors
         self.exceptions  = exceptions
 
+    @property
+    def log_level(self: Self) -> int:
+        return self._log_level
+
+    @log_level.setter
+    def log_level(self: Self, log_level: int):
+        self._log_level = log_level
+        invalidate_levels()
+
+    @property
+    def colors(self: Self) -> bool:
+        return self._colors
+
+    @colors.setter
+    def colors(self: Self, colors: bool):
+        self._colors = colors
+        invalidate_levels()
+
     def write(self: Self, text: str):
         """Writes given text to the IO if it doesn't equals to None
 
@@ -206,7 +366,286 @@ class LoggerHandler:
         self.io.flush()
 
 
-class LoggerGroup:
+class QueuePolicy:
+    """Stores policies of the :class:`QueueLoggerHandler` when its queue is full
+
+    :ivar Drop: New record is dropped (number of the dropped records is written to the IO)
+    :ivar Block: Writer of the record waits for the free place in the queue
+    """
+
+    Drop   = 'drop'
+    Block  = 'block'
+
+
+# marker of the writer thread stop
+_STOP_WRITER = object()
+
+
+class QueueLoggerHandler(LoggerHandler):
+    """Handler, that hands the records to the writer thread. Writer thread coalesces the queued records into
+    the one buffered write, so the logging thread is not blocked by the slow IO (such as the disk).
+    Buffer is written on the interval, when its size is above the limit and at the shutdown
+
+    :ivar queue: Queue with the records to write
+    :ivar overload_policy: Policy when the queue is full (see :class:`QueuePolicy`)
+    :ivar flush_interval: Maximum time (in seconds) while the record is buffered
+    :ivar flush_size: Size (in characters) of the buffer, when it is written immediately
+    :ivar dropped: Number of the dropped records (queue is full)
+    :ivar written: Number of the written records
+    :ivar writes: Number of the writes to the IO
+    :ivar errors: Number of the failed writes to the IO
+    """
+
+    def __init__(self: Self,
+                 io: TextIO | None = None,
+                 log_level: int = LogLevel.NOTSET,
+                 colors: bool = True,
+                 exceptions: bool = True,
+                 max_queue: int = 10000,
+                 overload_policy: str = QueuePolicy.Drop,
+                 flush_interval: float = 0.5,
+                 flush_size: int = 64 * 1024):
+        """
+        :param io: TextIO to handle
+        :param log_level: Level of logs (by default is LogLevel.NOTSET)
+        :param colors: Enable colors for the logger
+        :param max_queue: Maximum number of the queued records (0 is unlimited)
+        :param overload_policy: Policy when the queue is full (see :class:`QueuePolicy`)
+        :param flush_interval: Maximum time (in seconds) while the record is buffered
+        :param flush_size: Size (in characters) of the buffer, when it is written immediately
+        """
+
+        super().__init__(io, log_level, colors, exceptions)
+
+        self.queue            = queue.Queue(max_queue)
+        self.overload_policy  = overload_policy
+        self.flush_interval   = flush_interval
+        self.flush_size       = flush_size
+
+        self.dropped: int   = 0
+        self.written: int   = 0
+        self.writes: int    = 0
+        self.errors: int    = 0
+
+        self._reported_dropped  = 0
+        self._closed            = False
+        self._thread            = threading.Thread(target=self._run, name='ezlog-writer', daemon=True)
+
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self: Self, text: str):
+        """Queues given text to write it into IO, if it doesn't equals to None
+
+        :param text: Text to write into IO
+        """
+        if self.io is None or self._closed:
+            return
+
+        if self.overload_policy == QueuePolicy.Block:
+            self.queue.put(text)
+            return
+
+        try:
+            self.queue.put_nowait(text)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self: Self):
+        """Writes the queued records and stops the writer thread. Next records are ignored"""
+
+        if self._closed:
+            return
+
+        self._closed = True
+        self.queue.put(_STOP_WRITER)
+        self._thread.join()
+
+        atexit.unregister(self.close)
+
+    ####
+
+    def _run(self: Self):
+        """Loop of the writer thread"""
+
+        buffer    = []
+        size      = 0
+        deadline  = None
+
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+
+            try:
+                text = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                text = None
+
+            # get all queued records without waiting, while the buffer is not full
+            while text is not None and text is not _STOP_WRITER:
+                buffer.append(text)
+                size += len(text)
+
+                if size >= self.flush_size:
+                    break
+
+                try:
+                    text = self.queue.get_nowait()
+                except queue.Empty:
+                    text = None
+
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+
+            if text is _STOP_WRITER or size >= self.flush_size or time.monotonic() >= deadline:
+                self._flush(buffer)
+
+                buffer    = []
+                size      = 0
+                deadline  = None
+
+            if text is _STOP_WRITER:
+                return
+
+    def _flush(self: Self, buffer: list[str]):
+        """Writes the buffer into IO with the number of the records, dropped since the last write
+
+        :param buffer: List with the texts to write
+        """
+
+        dropped = self.dropped - self._reported_dropped
+
+        if dropped:
+            buffer.append(f'ezlog: {dropped} records are dropped (queue of the handler is full)\n')
+            self._reported_dropped += dropped
+
+        if not buffer:
+            return
+
+        try:
+            self.io.write(''.join(buffer))
+            self.io.flush()
+        except Exception:
+            self.errors += 1
+            return
+
+        self.written  += len(buffer) - (1 if dropped else 0)
+        self.writes   += 1
+
+    def stats(self: Self) -> dict[str, int]:
+        """Gets the statistics of the handler
+
+        :returns: Dictionary with the statistics (queued, dropped, written, writes and errors)
+        """
+
+        return {
+            'queued': self.queue.qsize(),
+            'dropped': self.dropped,
+            'written': self.written,
+            'writes': self.writes,
+            'errors': self.errors
+        }
+
+
+class HandlerList(list):
+    """List of the handlers, that invalidates the cached levels on any change"""
+
+    def append(self, handler: LoggerHandler):
+        super().append(handler)
+        invalidate_levels()
+
+    def extend(self, handlers: typing.Iterable[LoggerHandler]):
+        super().extend(handlers)
+        invalidate_levels()
+
+    def insert(self, index: int, handler: LoggerHandler):
+        super().insert(index, handler)
+        invalidate_levels()
+
+    def remove(self, handler: LoggerHandler):
+        super().remove(handler)
+        invalidate_levels()
+
+    def pop(self, index: int = -1) -> LoggerHandler:
+        handler = super().pop(index)
+        invalidate_levels()
+
+        return handler
+
+    def clear(self):
+        super().clear()
+        invalidate_levels()
+
+    def __setitem__(self, index, handler):
+        super().__setitem__(index, handler)
+        invalidate_levels()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        invalidate_levels()
+
+    def __iadd__(self, handlers: typing.Iterable[LoggerHandler]) -> Self:
+        result = super().__iadd__(handlers)
+        invalidate_levels()
+
+        return result
+
+
+class HandlersOwner:
+    """Base of the :class:`Logger` and :class:`LoggerGroup`. Stores the handlers and caches the effective levels
+    of them, so the records of the disabled levels are dropped by one comparison
+
+    :ivar min_level: Minimum level of the handlers (records below it are not written)
+    :ivar min_plain_level: Minimum level of the handlers without colors
+    :ivar min_colored_level: Minimum level of the handlers with colors
+    """
+
+    _handlers: list[LoggerHandler] | None          = None
+    _handlers_snapshot: list[LoggerHandler] | None  = None
+    _levels_generation: int                         = -1
+
+    min_level: int          = sys.maxsize
+    min_plain_level: int    = sys.maxsize
+    min_colored_level: int  = sys.maxsize
+
+    @property
+    def handlers(self: Self) -> list[LoggerHandler]:
+        """List with the handlers. The assigned list is kept as is (it is not copied), so its later changes
+        are seen by the owner. Changes of the :class:`HandlerList` invalidate the cached levels immediately,
+        the plain list is compared with its snapshot on every record"""
+
+        return self._handlers
+
+    @handlers.setter
+    def handlers(self: Self, handlers: list[LoggerHandler]):
+        self._handlers = handlers
+        invalidate_levels()
+
+    def update_levels(self: Self):
+        """Recalculates the cached effective levels of the handlers"""
+
+        self.min_plain_level    = min((h.log_level for h in self._handlers if not h.colors), default=sys.maxsize)
+        self.min_colored_level  = min((h.log_level for h in self._handlers if h.colors), default=sys.maxsize)
+        self.min_level          = min(self.min_plain_level, self.min_colored_level)
+
+        self._levels_generation  = _levels_generation
+        self._handlers_snapshot  = None if isinstance(self._handlers, HandlerList) else list(self._handlers)
+
+    def is_enabled_for(self: Self, level: int) -> bool:
+        """Checks if any handler receives the records of the level
+
+        :param level: Level to check
+
+        :returns: True if the records of the level are written, otherwise False
+        """
+
+        if self._levels_generation != _levels_generation or \
+                (self._handlers_snapshot is not None and self._handlers_snapshot != self._handlers):
+            self.update_levels()
+
+        return level >= self.min_level
+
+
+class LoggerGroup(HandlersOwner):
     """Group of loggers has shared parameters.
        Is highly recommended to create root logger and after pin all others logger to it
     """
@@ -236,7 +675,7 @@ class LoggerGroup:
             self.formatter       = formatter if formatter is not None else DEFAULT_FORMATTER
             self.time_formatter  = time_formatter if time_formatter is not None else DEFAULT_TIME_FORMATTER
             self.color_set       = color_set if color_set is not None else DEFAULT_COLOR_SET
-            self.handlers        = handlers if handlers is not None else []
+            self.handlers        = handlers if handlers is not None else HandlerList()
 
         else:
 
@@ -259,9 +698,14 @@ class LoggerGroup:
         LOGGER_GROUPS[name] = self
 
 
-class Logger:
+class Logger(HandlersOwner):
     """Class of the Logger"""
 
+    # caches of the compiled formatters (see format_time(), format_now() and format_message())
+    _time_cache: tuple | None     = None
+    _now_cache: tuple | None      = None
+    _message_cache: tuple | None  = None
+
     def __init__(self: Self,
                  name: str,
                  formatter: str | None = None,
@@ -297,7 +741,7 @@ class Logger:
             self.formatter       = formatter if formatter is not None else DEFAULT_FORMATTER
             self.time_formatter  = time_formatter if time_formatter is not None else DEFAULT_TIME_FORMATTER
             self.color_set       = color_set if color_set is not None else DEFAULT_COLOR_SET
-            self.handlers        = handlers if handlers is not None else []
+            self.handlers        = handlers if handlers is not None else HandlerList()
 
             self.group           = None
 
@@ -309,6 +753,27 @@ class Logger:
         self.color_set       = self.group.color_set
         self.handlers        = self.group.handlers
 
+    def _bound_time_formatter(self: Self, time_: datetime) -> BoundFormatter:
+        """Gets the time formatter with the rendered date and time (without the microseconds).
+        It is cached for the one second
+
+        :param time_: Time to render (microseconds are ignored)
+
+        :returns: Formatter of the microseconds
+        """
+
+        key    = (self.time_formatter, time_.year, time_.month, time_.day, time_.hour, time_.minute, time_.second)
+        cache  = self._time_cache
+
+        if cache is None or cache[0] != key:
+            compiled  = compile_formatter(self.time_formatter, ('microsecond', ))
+            bound     = compiled.bind(year=time_.year, month=time_.month, day=time_.day,
+                                      hour=time_.hour, minute=time_.minute, second=time_.second)
+
+            cache = self._time_cache = (key, bound)
+
+        return cache[1]
+
     def format_time(self: Self, time: datetime) -> str:
         """Formats a time with time_formatter attribute
 
@@ -317,16 +782,29 @@ class Logger:
         :returns: Formatted time
         """
 
-        return self.time_formatter.format(year=time.year,
-                                          month=time.month,
-                                          day=time.day,
-                                          hour=time.hour,
-                                          minute=time.minute,
-                                          second=time.second,
-                                          microsecond=str(time.microsecond)[:4])
+        return self._bound_time_formatter(time)(str(time.microsecond)[:4])
+
+    def format_now(self: Self) -> str:
+        """Formats the current time with time_formatter attribute. Date and time are rendered once per second,
+        only the microseconds are formatted on every call
+
+        :returns: Formatted time
+        """
+
+        now     = time.time()
+        second  = int(now)
+        cache   = self._now_cache
+
+        if cache is None or cache[0] != second or cache[1] is not self.time_formatter:
+            cache = self._now_cache = (second,
+                                       self.time_formatter,
+                                       self._bound_time_formatter(datetime.fromtimestamp(second)))
+
+        return cache[2](str(int((now - second) * 1_000_000))[:4])
 
     def format_message(self: Self, message: str, args_str: list[str], level_str: str, time_str: str) -> str:
-        """Formats given message with formatter attribute
+        """Formats given message with formatter attribute. Name, group name and level fields are rendered
+        once per level (see :class:`CompiledFormatter`)
 
         :param message: Message to format
         :param args_str: Arguments to format the message
@@ -334,14 +812,24 @@ class Logger:
         :param time_str: Time parameter
         """
 
-        return self.formatter.format(message=message.format(*args_str),
-                                     time=time_str,
-                                     name=self.name,
-                                     group_name=self.group.name if self.group is not None else 'NoGroup',
-                                     level=level_str,
-                                     color=colorama.Fore,
-                                     reset=reset
-                                     )
+        group_name  = self.group.name if self.group is not None else 'NoGroup'
+        cache       = self._message_cache
+
+        if cache is None or cache[0] is not self.formatter or cache[1] != group_name:
+            cache = self._message_cache = (self.formatter, group_name, {})
+
+        bound = cache[2].get(level_str)
+
+        if bound is None:
+            bound = cache[2][level_str] = compile_formatter(self.formatter, ('time', 'message')).bind(
+                name=self.name,
+                group_name=group_name,
+                level=level_str,
+                color=colorama.Fore,
+                reset=reset
+            )
+
+        return bound(time_str, message.format(*args_str))
 
     def record(self: Self, message: str, *args: Any, level: int = LogLevel.NOTSET, exception: Exception | None = None):
         """Records a log to the handlers with using formatters
@@ -352,30 +840,43 @@ class Logger:
         :param exception: Exception (if haven) to log
         """
 
+        # drop the record, if no handler receives it
+        if self._levels_generation != _levels_generation or \
+                (self._handlers_snapshot is not None and self._handlers_snapshot != self._handlers):
+            self.update_levels()
+
+        if level < self.min_level:
+            return
+
         # get formatted time
-        time_str = self.format_time(datetime.now())
+        time_str   = self.format_now()
+        level_str  = level_to_name(level)
 
-        # get colored args\text
-        args_str     = [str(o) for o in args]
-        args_colored = [type_to_color(type(o), self.color_set) + str(o) + reset for o in args]
+        f_message          = None
+        f_message_colored  = None
 
-        level_str      = level_to_name(level)
-        level_colored  = level_to_color(level, self.color_set) + level_str + reset
+        # get formatted message (colored only if any colored handler receives it)
+        if level >= self.min_plain_level:
+            f_message = self.format_message(message, [str(o) for o in args], level_str, time_str)
 
-        # get formatted message
-        f_message            = self.format_message(message, args_str, level_str, time_str)
-        f_message_colored    = self.format_message(message, args_colored, level_colored, time_str)
+        if level >= self.min_colored_level:
+            args_colored   = [type_to_color(type(o), self.color_set) + str(o) + reset for o in args]
+            level_colored  = level_to_color(level, self.color_set) + level_str + reset
 
-        # write record to the handlers
+            f_message_colored = self.format_message(message, args_colored, level_colored, time_str)
+
+        # format the exception once for all handlers
+        if exception:
+            exception_str      = ''.join(traceback.format_exception(exception)).removeprefix('\n')
+            exception_colored  = type_to_color('exception', self.color_set) + exception_str + reset
+
+            f_message          = f_message and f_message + '\n' + exception_str
+            f_message_colored  = f_message_colored and f_message_colored + '\n' + exception_colored
+
+        # write record to the handlers (one write per handler)
         for h in self.handlers:
             if h.log_level <= level:
                 h.write((f_message_colored if h.colors else f_message) + '\n')
 
-                if exception:
-                    # get color for the exception (if handler is supports colors)
-                    exception_color = type_to_color('exception', self.color_set)
-
-                    h.write(exception_color + ''.join(traceback.format_exception(exception)).removeprefix('\n') + reset + '\n')
-
 # register bindings
 register_bindings(Logger)
@@ -5,6 +5,7 @@ To get help about it, you must type in your terminal:
 # ezbotf -h
 """
 
+import re
 import pathlib
 import tomlkit
 import sys
@@ -23,10 +24,18 @@ from .pluginloader import PluginLoader
 from .instancecontext import InstanceContext, DirsContext
 from .exceptions import IncorrectInstanceConfigError
 from .translator import Translator
-from .permissions import Permissions
+from .permissions import Permissions, PermissionIndex
+from .prefixmatcher import PrefixMatcher, CommandFilter
+from .scheduler import CommandScheduler
+from .ratelimit import RateLimiter
+from .entitycache import EntityCache
+from .editcache import EditCache, EditEntry
+from .messagecache import MessageCache
+from .chatenablement import ChatEnablement
+from .batcher import UpdateBatcher
 from .messages import prefixes_dict
 
-from .types import TOMLDict, PermissionsDict
+from .types import TOMLDict, PluginCommand
 from typing import Any
 
 nest_asyncio.apply()
@@ -47,6 +56,52 @@ REQUIRED_CONFIG = {
     'warnings': REQUIRED_WARNINGS
 }
 
+# default values of the optional config fields
+DEFAULT_CONFIG = {
+    'logging': {
+        'background_writer': True,
+        'max_queue': 10000,
+        'overload_policy': 'drop',
+        'flush_interval': 0.5
+    },
+    'events': {
+        'filter_commands': True,
+        'chats': [],
+        'blacklist_chats': False,
+        'direction': 'all'
+    },
+    'scheduler': {
+        'max_concurrency': 16,
+        'max_queue': 1024,
+        'overload_policy': 'reject',
+        'priority_concurrency': 4
+    },
+    'entity_cache': {
+        'max_size': 10000,
+        'ttl': 600.0
+    },
+    'edit_cache': {
+        'max_size': 4096
+    },
+    'message_cache': {
+        'enabled': False,
+        'per_chat': 200,
+        'max_chats': 256,
+        'max_bytes': 8388608
+    },
+    'chat_enablement': {
+        'command': 'chat'
+    },
+    'batching': {
+        'enabled': False,
+        'window': 0.005,
+        'max_batch': 64
+    }
+}
+
+# allowed values of the "events.direction" config field
+EVENTS_DIRECTIONS = ['all', 'incoming', 'outgoing']
+
 
 class BotInstance:
     """Instance of the bot
@@ -69,7 +124,15 @@ class BotInstance:
         self.context: InstanceContext | None       = None
         self.client: TelegramClient | None         = None
         self.translator: Translator | None         = None
-        self.permissions: PermissionsDict | None   = None
+        self.permissions: PermissionIndex | None   = None
+        self.prefix_matcher: PrefixMatcher | None  = None
+        self.command_filter: CommandFilter | None  = None
+        self.scheduler: CommandScheduler | None    = None
+        self.rate_limiter: RateLimiter | None      = None
+        self.entity_cache: EntityCache | None      = None
+        self.edit_cache: EditCache | None          = None
+        self.message_cache: MessageCache | None    = None
+        self.batcher: UpdateBatcher | None         = None
 
     def import_config(self, path: pathlib.Path):
         """Imports a TOML config from path to instance
@@ -109,6 +172,9 @@ class BotInstance:
         :param parent_logger_group: Parent logger of this instance
         """
 
+        # fill optional config values
+        utils.set_config_defaults(self.config, DEFAULT_CONFIG)
+
         # setup context
         self.context = InstanceContext()
         self.setup_context()
@@ -120,33 +186,80 @@ class BotInstance:
                          .format_time(datetime.now()) + '.log'
 
             stdout_handler  = ezlog.LoggerHandler(sys.stdout, log_level=self.config['logging']['console_log_level'])
-            file_handler    = ezlog.LoggerHandler(
-                open(self.context.dirs.logs_dir / log_fn, 'w'),
-                log_level=self.config['logging']['file_log_level'],
-                colors=False)
+            log_file        = open(self.context.dirs.logs_dir / log_fn, 'w')
+
+            # write the log file by the background thread, so the slow disk doesn't block the event loop
+            if self.config['logging']['background_writer']:
+                file_handler = ezlog.QueueLoggerHandler(
+                    log_file,
+                    log_level=self.config['logging']['file_log_level'],
+                    colors=False,
+                    max_queue=self.config['logging']['max_queue'],
+                    overload_policy=self.config['logging']['overload_policy'],
+                    flush_interval=self.config['logging']['flush_interval'])
+            else:
+                file_handler = ezlog.LoggerHandler(
+                    log_file,
+                    log_level=self.config['logging']['file_log_level'],
+                    colors=False)
 
             # create own logger group
             parent_logger_group = ezlog.LoggerGroup(self.config['name'], handlers=[stdout_handler, file_handler])
 
         # initialize all
-        self.main_group    = parent_logger_group
-        self.logger        = ezlog.Logger('BotInstance', group=self.main_group)
-        self.pluginloader  = PluginLoader(self.context.dirs.plugins_dir, self.config['language'])
-        self.client        = TelegramClient(self.config['name'], self.config['api_id'], self.config['api_hash'])
-        self.translator    = Translator(self.context.dirs.lang_dir, self.main_group)
-        self.permissions   = {}
+        self.main_group      = parent_logger_group
+        self.logger          = ezlog.Logger('BotInstance', group=self.main_group)
+        self.pluginloader    = PluginLoader(self.context.dirs.plugins_dir, self.config['language'])
+        self.client          = TelegramClient(self.config['name'], self.config['api_id'], self.config['api_hash'])
+        self.translator      = Translator(self.context.dirs.lang_dir, self.main_group)
+        self.prefix_matcher  = PrefixMatcher(self.config['prefixes'])
+        self.command_filter  = CommandFilter(self.prefix_matcher)
+        self.scheduler       = CommandScheduler(self.config['scheduler']['max_concurrency'],
+                                                self.config['scheduler']['max_queue'],
+                                                self.config['scheduler']['overload_policy'],
+                                                ezlog.Logger('CommandScheduler', group=self.main_group),
+                                                self.config['scheduler']['priority_concurrency'])
+        self.rate_limiter    = RateLimiter()
+        self.entity_cache    = EntityCache(self.client,
+                                           self.config['entity_cache']['max_size'],
+                                           self.config['entity_cache']['ttl'])
+
+        self.edit_cache      = EditCache(self.config['edit_cache']['max_size'])
+
+        if self.config['message_cache']['enabled']:
+            self.message_cache = MessageCache(self.client,
+                                              self.config['message_cache']['per_chat'],
+                                              self.config['message_cache']['max_chats'],
+                                              self.config['message_cache']['max_bytes'])
+
+        if self.config['batching']['enabled']:
+            self.batcher = UpdateBatcher(self.handle_batch,
+                                         self.config['batching']['window'],
+                                         self.config['batching']['max_batch'],
+                                         ezlog.Logger('UpdateBatcher', group=self.main_group))
+
+        self.context.entities = self.entity_cache
 
         # load permissions
-        self.permissions = utils.load_permissions(self.context.dirs.permissions_dir,
-                                                  self.config['name'])
+        self.permissions = PermissionIndex.load(self.context.dirs.permissions_dir / f'{self.config["name"]}.toml')
+
+        # load plugins and commands disabled in the separate chats
+        self.pluginloader.chat_enablement = ChatEnablement.load(self.context.dirs.permissions_dir /
+                                                                f'{self.config["name"]}.chats')
+
+        if self.pluginloader.chat_enablement.malformed:
+            self.logger.warning('{} malformed records of the chats enablement are skipped',
+                                self.pluginloader.chat_enablement.malformed)
+
+        # handlers of the updates are registered, when the plugins subscribe to them
+        self.pluginloader.subscriptions.on_new_type = self.register_update_type
 
         # initialize the PluginLoader and initialize plugins
         self.pluginloader.initialize(self.main_group, self.context)
         self.pluginloader.initialize_plugins()
 
         # register events
-        self.client.add_event_handler(self.handle_message, events.NewMessage)
-        self.client.add_event_handler(self.handle_message, events.MessageEdited)
+        self.register_events()
 
         self.logger.info('Instance initialized')
         self.logger.info('Running on version {}', version.ezbotf_version_string_full)
@@ -162,6 +275,58 @@ class BotInstance:
             self.context.notifies.append(f'{prefixes_dict["warning"]} Version **{version.ezbotf_version_string_full}** of'
                                          ' `EzBot Framework` is unstable. This may cause problems!')
 
+    def register_events(self):
+        """Registers the message handlers in the :class:`TelegramClient`.
+        Filters of the event builders are defined by the ``[events]`` config header"""
+
+        events_config  = self.config['events']
+        direction      = events_config['direction']
+
+        if direction not in EVENTS_DIRECTIONS:
+            self.logger.error('Incorrect events direction {}, must be one of: {}', direction, EVENTS_DIRECTIONS)
+            direction = 'all'
+
+        builder_kwargs = {
+            'chats': list(events_config['chats']) or None,
+            'blacklist_chats': events_config['blacklist_chats'],
+            'incoming': True if direction == 'incoming' else None,
+            'outgoing': True if direction == 'outgoing' else None,
+            'func': self.command_filter if events_config['filter_commands'] else None
+        }
+
+        # messages are collected to the batches, if the batching is enabled
+        handler = self.batcher if self.batcher is not None else self.handle_message
+
+        self.client.add_event_handler(handler, events.NewMessage(**builder_kwargs))
+        self.client.add_event_handler(handler, events.MessageEdited(**builder_kwargs))
+
+        # triggers are matched with all messages, but only if any plugin has triggers
+        builder_kwargs['func'] = lambda _: bool(self.pluginloader.triggers)
+
+        self.client.add_event_handler(self.handle_triggers, events.NewMessage(**builder_kwargs))
+
+        # all messages of the chats are cached, so the replied messages are found without requests (every update
+        # passes the Python handlers then, so the cache is disabled by default)
+        if self.message_cache is not None:
+            cache_kwargs = {'chats': builder_kwargs['chats'], 'blacklist_chats': builder_kwargs['blacklist_chats']}
+
+            self.client.add_event_handler(self.message_cache, events.NewMessage(**cache_kwargs))
+            self.client.add_event_handler(self.message_cache, events.MessageEdited(**cache_kwargs))
+            self.client.add_event_handler(self.handle_deleted, events.MessageDeleted(**cache_kwargs))
+
+    def register_update_type(self, event_type: type[EventBuilder]):
+        """Registers the handler of the updates of the type in the :class:`TelegramClient`.
+        It is called by the :class:`SubscriptionIndex`, when any plugin subscribes to the type first time
+
+        :param event_type: Type of the event builder from Telethon
+        """
+
+        async def handler(event: EventBuilder):
+            await self.handle_update(event_type, event)
+
+        self.logger.debug('Registering handler of the {} updates', event_type.__name__)
+        self.client.add_event_handler(handler, event_type())
+
     ####
 
     def load(self):
@@ -176,7 +341,9 @@ class BotInstance:
 
         # get id of instance owner
         self.context.owner                       = utils.run_coroutine_without_await(self.client.get_me())
-        self.permissions[self.context.owner.id]  = [Permissions.Owner]
+        self.permissions.set(self.context.owner.id, [Permissions.Owner], save=False)
+
+        self.entity_cache.put(self.context.owner)
 
     def run(self):
         """Runs an instance"""
@@ -190,6 +357,9 @@ class BotInstance:
                          utils.mask_phone_number(self.context.owner.phone))
         self.client.run_until_disconnected()
 
+        # save pending permissions changes
+        self.permissions.flush()
+
     ####
 
     def quick_run(self):
@@ -208,18 +378,88 @@ class BotInstance:
         :param event: Event of the message from Telethon
         """
 
-        # check if message is have text
-        if not (len(event.text) > 0):
+        # check for the prefix and command name (only start of the text is checked)
+        match = self.prefix_matcher.match(event.text)
+
+        if match is None:
             return
 
-        # split message
-        args = event.text.split(' ')
+        await self.dispatch_message(event, match)
 
-        if not len(args) > 1:
-            return
+    async def handle_batch(self, batch: list[EventBuilder]):
+        """Handles a batch of the messages from the :class:`UpdateBatcher`. Album messages (with the same
+        ``grouped_id``) are handled as one message: only the first command of the album is dispatched, and all
+        messages of the album are available as ``album`` attribute of its event. Command and permission decision
+        of every message are resolved once, and senders of the disallowed commands are resolved for the whole
+        batch by one request
+
+        :param batch: List with the events of the messages from Telethon
+        """
+
+        albums: dict[tuple[int, int], list[EventBuilder]] = {}
+
+        for event in batch:
+            grouped_id = event.message.grouped_id
+
+            if grouped_id is not None:
+                albums.setdefault((event.chat_id, grouped_id), []).append(event)
+
+        dispatched_albums  = set()
+        matched            = []
+
+        # check for the prefix and command name once per message
+        for event in batch:
+            match = self.prefix_matcher.match(event.text)
+
+            if match is None:
+                continue
+
+            grouped_id = event.message.grouped_id
+
+            if grouped_id is not None:
+                album_key = (event.chat_id, grouped_id)
+
+                if album_key in dispatched_albums:
+                    continue
+
+                dispatched_albums.add(album_key)
+
+                # new attributes of the initialized event are set to its message, so __dict__ is used directly
+                event.__dict__['album'] = albums[album_key]
+
+            # resolve command and permission decision once (outgoing messages are sent by the owner)
+            command  = self.pluginloader.get_command(match['name'], event.chat_id)
+            allowed  = event.out or (command is not None and
+                                     self.permissions.check(event.sender_id, command.required_permissions))
+
+            matched.append((event, match, (command, allowed)))
+
+        # resolve all senders, that will be warned about the disallowed access, by one request
+        disallowed_senders = {event.sender_id for event, _, (command, allowed) in matched
+                              if command is not None and not allowed}
+
+        if disallowed_senders:
+            await self.entity_cache.resolve_many(disallowed_senders)
+
+        for event, match, resolved in matched:
+            await self.dispatch_message(event, match, resolved)
+
+    async def dispatch_message(self,
+                               event: EventBuilder,
+                               match: re.Match,
+                               resolved: tuple[PluginCommand | None, bool] | None = None):
+        """Checks the command of the message and schedules its execution
+
+        :param event: Event of the message from Telethon
+        :param match: Match object of the prefix and command name from :class:`PrefixMatcher`
+        :param resolved: Tuple with the command and permission decision (True if sender is allowed to run it),
+                         already resolved by the caller. If it is None, they are resolved here
+        """
+
+        # check if it is an edit, that doesn't change the command
+        edit_entry = self.edit_cache.track(event, event.text)
 
-        # check for the prefixes
-        if not any([p in args[0] for p in self.config['prefixes']]):
+        if edit_entry is None:
             return
 
         # check for the notifies
@@ -227,27 +467,172 @@ class BotInstance:
             await messages.notify(event, self.context.notifies)
             self.context.notifies.clear()
 
-        # get command
-        command = self.pluginloader.get_command(args[1])
+        # built-in owner command to enable or disable plugins and commands in the chat
+        if event.out and match['name'].lower() == self.config['chat_enablement']['command']:
+            self.scheduler.submit(event.chat_id,
+                                  lambda: self.execute_chat_command(event, event.text[match.end():].split()),
+                                  priority=True)
+            return
+
+        # get command (it must be enabled in the chat)
+        if resolved is None:
+            command  = self.pluginloader.get_command(match['name'], event.chat_id)
+            allowed  = None
+        else:
+            command, allowed = resolved
+
+        # outgoing messages are sent by the owner, so there is no need to check rate limits and permissions
+        if event.out and command is not None:
+            self.scheduler.submit(event.chat_id,
+                                  lambda: self.execute_command(event, command, edit_entry),
+                                  priority=True)
+            return
 
         if command is None:
             # if command is not found
-            self.logger.debug('No command with name {}', args[1])
+            self.logger.debug('No command with name {}', match['name'])
 
             if not self.config['warnings']['ignore_nonexistent_command']:
-                await event.reply(self.translator.translations['instance']['nonexistent_command'])
+                suggestions = self.pluginloader.suggest_commands(match['name'], event.chat_id)
+
+                if suggestions:
+                    await event.reply(self.translator.translations['instance']['nonexistent_command'] + ' ' +
+                                      self.translator.translations['instance']['did_you_mean']
+                                      .format(', '.join(suggestions)))
+                else:
+                    await event.reply(self.translator.translations['instance']['nonexistent_command'])
 
             return
 
-        # check permissions
-        if not utils.have_permissions((sender := await event.get_sender()).id, self.permissions, command.permissions):
-            self.logger.warning('Attempted to run command: {} by @{} (access disallowed)', event.text, sender.username)
+        # check rate limits of the command (before any sender resolving and arguments parsing). Limit object is
+        # kept in the key, so the bucket of the removed command is never reused by the new one. Messages without
+        # the sender (channel posts, anonymous admins) are limited by the chat
+        rate_key = event.sender_id if event.sender_id is not None else event.chat_id
+
+        for limit in command.rate_limits:
+            if not self.rate_limiter.allow((rate_key, limit), limit):
+                self.logger.debug('Command {} by {} is throttled', match['name'], rate_key)
+                return
+
+        # check permissions (sender is resolved only for the warning)
+        if allowed is None:
+            allowed = self.permissions.check(event.sender_id, command.required_permissions)
+
+        if not allowed:
+            sender = await self.entity_cache.resolve_sender(event)
+            self.logger.warning('Attempted to run command: {} by @{} (access disallowed)', event.text,
+                                getattr(sender, 'username', None))
 
             if not self.config['warnings']['ignore_disallow_access']:
                 await event.reply(self.translator.translations['instance']['disallow_access'])
 
             return
 
+        # schedule the command execution (commands of the one chat are executed in order)
+        self.scheduler.submit(event.chat_id, lambda: self.execute_command(event, command, edit_entry))
+
+    async def handle_triggers(self, event: EventBuilder):
+        """Matches a message with the triggers of all plugins by the one pass and schedules the matched triggers
+
+        :param event: Event of the message from Telethon
+        """
+
+        text = event.raw_text
+
+        if not text:
+            return
+
+        chat_enablement = self.pluginloader.chat_enablement
+
+        for trigger, match in self.pluginloader.triggers.match(text):
+            if not chat_enablement.is_enabled(event.chat_id, trigger.plugin.chat_mask):
+                continue
+
+            self.scheduler.submit(event.chat_id, lambda t=trigger, m=match: t.function(event, m))
+
+    async def handle_deleted(self, event: EventBuilder):
+        """Removes the deleted messages from the :class:`MessageCache`
+
+        :param event: Event of the deleted messages from Telethon
+        """
+
+        self.message_cache.remove(event.chat_id, event.deleted_ids)
+
+    async def handle_update(self, event_type: type[EventBuilder], event: EventBuilder):
+        """Delivers an update to the plugins subscribed to its type and chat
+
+        :param event_type: Type of the event builder
+        :param event: Event from Telethon
+        """
+
+        chat_id          = getattr(event, 'chat_id', None)
+        chat_enablement  = self.pluginloader.chat_enablement
+
+        for subscription in self.pluginloader.subscriptions.get(event_type, chat_id):
+            if chat_id is not None and not chat_enablement.is_enabled(chat_id, subscription.plugin.chat_mask):
+                continue
+
+            if subscription.filter is not None:
+                try:
+                    if not subscription.filter(event):
+                        subscription.filtered += 1
+                        continue
+                except Exception as e:
+                    self.logger.error('Exception has been occurred in filter of {} subscription',
+                                      subscription.plugin.config['name'])
+                    self.logger.exception('Exception:', exception=e)
+                    continue
+
+            subscription.dispatched += 1
+            self.scheduler.submit(chat_id, lambda s=subscription: s.function(event))
+
+    async def execute_chat_command(self, event: EventBuilder, args: list[str]):
+        """Executes the built-in owner command, that enables or disables plugins and commands in the chat.
+        Usage: ``<prefix> chat`` (list disabled), ``<prefix> chat on <name>``, ``<prefix> chat off <name>``
+
+        :param event: Event of the message from Telethon
+        :param args: Arguments of the command
+        """
+
+        chat_enablement  = self.pluginloader.chat_enablement
+        translations     = self.translator.translations['instance']
+
+        match args:
+            case []:
+                disabled = chat_enablement.disabled_names(event.chat_id)
+
+                if disabled:
+                    await messages.info(event, translations['chat_disabled_list'].format(', '.join(disabled)))
+                else:
+                    await messages.info(event, translations['chat_nothing_disabled'])
+
+            case ['on' | 'off' as action, name]:
+                unit = self.pluginloader.resolve_chat_unit(name)
+
+                if unit is None:
+                    await messages.unsuccess(event, translations['chat_unknown_unit'].format(name))
+                    return
+
+                chat_enablement.set(event.chat_id, unit, action == 'on')
+
+                await messages.success(event, translations['chat_enabled' if action == 'on' else 'chat_disabled']
+                                       .format(unit))
+
+            case _:
+                await messages.unsuccess(event, translations['chat_usage']
+                                         .format(self.config['chat_enablement']['command']))
+
+    async def execute_command(self, event: EventBuilder, command: PluginCommand, edit_entry: EditEntry | None = None):
+        """Parses arguments and executes the command. Replies to the user, if there is an argument parse error
+
+        :param event: Event of the message from Telethon
+        :param command: Command to execute
+        :param edit_entry: Entry of the :class:`EditCache`. If it is set, responses of the command are tracked
+        """
+
+        if edit_entry is not None:
+            self.edit_cache.bind(event, edit_entry)
+
         # try to parse arguments and execute the command
         error = await command.parser.parse(event.text, event, command)
 
@@ -271,5 +656,14 @@ class BotInstance:
                 case ArgumentParseError.CantFindOriginalMessage:
                     await event.respond(self.translator.translations['argumentparser']['cant_find_original_message'])
 
+                case ArgumentParseError.DocumentRequired:
+                    await event.respond(self.translator.translations['argumentparser']['document_required'])
+
+                case ArgumentParseError.DocumentTooLarge:
+                    await event.respond(self.translator.translations['argumentparser']['document_too_large'])
+
+                case ArgumentParseError.DocumentDownloadFailed:
+                    await event.respond(self.translator.translations['argumentparser']['document_download_failed'])
+
                 case ArgumentParseError.PluginError:
                     await event.respond(self.translator.translations['argumentparser']['plugin_error'])
@@ -11,6 +11,7 @@ from telethon.types import User
 
 if typing.TYPE_CHECKING:
     from .instance import BotInstance
+    from .entitycache import EntityCache
 
 __all__ = ['DirsContext', 'InstanceContext']
 
@@ -39,9 +40,11 @@ class InstanceContext(Context):
     :ivar notifies: List with the notifies (`str`). It will send on any command from user and removed from list
     :ivar owner: User object (from the telethon, :class:`telethon.types.User`) of instance owner
     :ivar dirs: Context with all directories (:class:`DirsContext`)
+    :ivar entities: Shared cache of the Telegram entities (:class:`ezbotf.entitycache.EntityCache`)
     """
 
     instance: typing.Union['BotInstance', None]  = None
     notifies: list[str] | None                   = None
     owner: User | None                           = None
     dirs: DirsContext | None                     = None
+    entities: typing.Union['EntityCache', None]  = None
@@ -0,0 +1,199 @@
+"""
+Defines :class:`MessageCache` that keeps the recent messages of the chats to find them without network requests
+"""
+
+import sys
+
+from collections import OrderedDict
+
+from telethon import TelegramClient
+from telethon.events.raw import EventBuilder
+
+from typing import Any, Iterable
+
+__all__ = ['MessageCache']
+
+
+class MessageCache:
+    """Cache of the recent messages by chats. Every chat has a bounded buffer of the last messages
+    (the oldest message is overwritten by the new one), and chats are evicted by LRU, when the number of
+    the chats or the total size of the messages is above the limits.
+
+    Messages are put by the handlers of the :class:`BotInstance` (new and edited messages), so messages of the
+    active chats are found without network requests. Missing messages are fetched by ID
+
+    :ivar client: :class:`TelegramClient` to fetch the missing messages
+    :ivar per_chat: Maximum number of the cached messages of the one chat
+    :ivar max_chats: Maximum number of the chats
+    :ivar max_bytes: Maximum total size (in bytes) of the cached messages (estimated)
+    :ivar chats: Ordered dictionary with the chats. Value is an ordered dictionary with the messages by ID
+                 (value is a tuple: message, size in bytes)
+    :ivar bytes: Current total size (in bytes) of the cached messages (estimated)
+    :ivar hits: Number of the cache hits
+    :ivar misses: Number of the cache misses
+    :ivar evictions: Number of the evicted messages
+    """
+
+    # estimated size (in bytes) of the message object without its text
+    MESSAGE_OVERHEAD = 1024
+
+    def __init__(self,
+                 client: TelegramClient,
+                 per_chat: int = 200,
+                 max_chats: int = 256,
+                 max_bytes: int = 8 * 1024 * 1024):
+        """
+        :param client: :class:`TelegramClient` to fetch the missing messages
+        :param per_chat: Maximum number of the cached messages of the one chat
+        :param max_chats: Maximum number of the chats
+        :param max_bytes: Maximum total size (in bytes) of the cached messages (estimated)
+        """
+
+        self.client     = client
+        self.per_chat   = per_chat
+        self.max_chats  = max_chats
+        self.max_bytes  = max_bytes
+
+        self.chats: OrderedDict[int, OrderedDict[int, tuple[Any, int]]] = OrderedDict()
+
+        self.bytes: int      = 0
+        self.hits: int       = 0
+        self.misses: int     = 0
+        self.evictions: int  = 0
+
+    async def __call__(self, event: EventBuilder):
+        """Puts the message of the event. It may be used as the handler of the :class:`TelegramClient`
+
+        :param event: Event of the new or edited message from Telethon
+        """
+
+        self.put(event.message)
+
+    ####
+
+    def _drop_chat(self, chat_id: int):
+        """Removes all messages of the chat
+
+        :param chat_id: ID of the chat
+        """
+
+        messages = self.chats.pop(chat_id)
+
+        self.bytes      -= sum(size for _, size in messages.values())
+        self.evictions  += len(messages)
+
+    ####
+
+    def get(self, chat_id: int, message_id: int) -> Any | None:
+        """Gets a message from the cache (without network requests)
+
+        :param chat_id: ID of the chat
+        :param message_id: ID of the message
+
+        :returns: Cached message or None if it is not cached
+        """
+
+        messages = self.chats.get(chat_id)
+        cached   = messages.get(message_id) if messages is not None else None
+
+        if cached is None:
+            self.misses += 1
+            return
+
+        self.chats.move_to_end(chat_id)
+        self.hits += 1
+
+        return cached[0]
+
+    def put(self, message: Any):
+        """Puts a message to the cache. Edited message replaces the cached one
+
+        :param message: Message from Telethon (must have ``chat_id``, ``id`` and ``message`` attributes)
+        """
+
+        size      = self.MESSAGE_OVERHEAD + sys.getsizeof(message.message or '')
+        messages  = self.chats.get(message.chat_id)
+
+        if messages is None:
+            messages = self.chats[message.chat_id] = OrderedDict()
+        else:
+            self.chats.move_to_end(message.chat_id)
+
+        old = messages.get(message.id)
+
+        if old is not None:
+            self.bytes -= old[1]
+
+        messages[message.id]  = (message, size)
+        self.bytes           += size
+
+        # overwrite the oldest message of the chat
+        if len(messages) > self.per_chat:
+            _, (_, old_size) = messages.popitem(last=False)
+
+            self.bytes      -= old_size
+            self.evictions  += 1
+
+        while len(self.chats) > self.max_chats or (self.bytes > self.max_bytes and len(self.chats) > 1):
+            self._drop_chat(next(iter(self.chats)))
+
+    def remove(self, chat_id: int | None, message_ids: Iterable[int]):
+        """Removes the messages from the cache
+
+        :param chat_id: ID of the chat (None if it is unknown, then the messages are removed from all chats)
+        :param message_ids: IDs of the messages
+        """
+
+        chats = [chat_id] if chat_id is not None else list(self.chats)
+
+        for chat in chats:
+            messages = self.chats.get(chat)
+
+            if messages is None:
+                continue
+
+            for message_id in message_ids:
+                cached = messages.pop(message_id, None)
+
+                if cached is not None:
+                    self.bytes -= cached[1]
+
+            if not messages:
+                del self.chats[chat]
+
+    async def fetch(self, chat_id: int, message_id: int) -> Any | None:
+        """Gets a message from the cache or fetches it by the client
+
+        :param chat_id: ID of the chat
+        :param message_id: ID of the message
+
+        :returns: Message from Telethon or None if it is not found
+        """
+
+        message = self.get(chat_id, message_id)
+
+        if message is None:
+            message = await self.client.get_messages(chat_id, ids=message_id)
+
+            if message is not None:
+                self.put(message)
+
+        return message
+
+    def stats(self) -> dict[str, int | float]:
+        """Gets the statistics of the cache
+
+        :returns: Dictionary with the statistics (chats, size, bytes, hits, misses, evictions and hit rate)
+        """
+
+        requests = self.hits + self.misses
+
+        return {
+            'chats': len(self.chats),
+            'size': sum(len(messages) for messages in self.chats.values()),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / requests if requests else 0.0
+        }
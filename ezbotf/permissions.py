@@ -1,3 +1,14 @@
+"""
+Defines :class:`Permissions` levels and :class:`PermissionIndex` that helps to check permissions of the users
+"""
+
+import asyncio
+import pathlib
+import tomlkit
+
+from typing import Any
+
+__all__ = ['Permissions', 'RequiredPermissions', 'PermissionIndex']
 
 
 class Permissions:
@@ -19,3 +30,275 @@ class Permissions:
     Admin        = 3
     Danger       = 4
     Owner        = 5
+
+
+class RequiredPermissions:
+    """Compiled permissions of the command
+
+    :ivar permissions: Tuple with the source permissions
+    :ivar min_level: Minimal numeric level that allows the command (None if there is no one numeric level)
+    :ivar names: Frozenset with the named permissions that allows the command
+    :ivar any: Command is allowed to any user
+    """
+
+    __slots__ = ('permissions', 'min_level', 'names', 'any')
+
+    def __init__(self, permissions: list[str | int]):
+        """
+        :param permissions: List with the permissions of the command
+        """
+
+        self.permissions  = tuple(permissions)
+
+        levels            = [p for p in permissions if isinstance(p, int)]
+        self.min_level    = min(levels) if levels else None
+        self.names        = frozenset(p for p in permissions if isinstance(p, str))
+        self.any          = Permissions.Any in levels
+
+
+class PermissionIndex:
+    """Index of the users permissions. Every user is compiled to the maximal numeric level and frozenset
+    of the named permissions, so the check doesn't depend on the permissions number.
+    Changes are applied to the index immediately, and saved to the file with the debounce
+
+    :ivar path: Path to the permissions file (None if the index is not persisted)
+    :ivar save_delay: Delay (in seconds) of saving after the change
+    :ivar max_cache: Maximum number of the cached check results
+    :ivar users: Dictionary with the compiled users permissions (tuple: maximal level or None, named permissions)
+    :ivar raw: Dictionary with the source users permissions
+    :ivar cache: Dictionary with the cached check results by user ID and :class:`RequiredPermissions` object.
+                 It is cleared on any change of the permissions or of the commands routes
+    :ivar saves: Number of the file writes
+    """
+
+    def __init__(self,
+                 permissions: dict[Any, list[str | int]] | None = None,
+                 path: pathlib.Path | None = None,
+                 save_delay: float = 5.0,
+                 max_cache: int = 65536):
+        """
+        :param permissions: Dictionary with the permissions of the users (keys may be strings, as in TOML file)
+        :param path: Path to the permissions file
+        :param save_delay: Delay (in seconds) of saving after the change
+        :param max_cache: Maximum number of the cached check results
+        """
+
+        self.path        = path
+        self.save_delay  = save_delay
+        self.max_cache   = max_cache
+
+        self.users: dict[int, tuple[int | None, frozenset[str]]]  = {}
+        self.raw: dict[int, list[str | int]]                      = {}
+        self.cache: dict[tuple[int, RequiredPermissions], bool]   = {}
+
+        self.saves: int = 0
+
+        self._save_handle: asyncio.TimerHandle | None  = None
+        self._unsaved: set[int]                        = set()
+
+        # normalize the TOML items (string keys, tomlkit values) to the plain types
+        for user_id, user_permissions in (permissions or {}).items():
+            self._set(int(user_id), [int(p) if isinstance(p, int) else str(p) for p in user_permissions])
+
+    @classmethod
+    def load(cls, path: pathlib.Path, save_delay: float = 5.0) -> 'PermissionIndex':
+        """Loads the index from the permissions TOML file. If the file is not exists, it will be created
+
+        :param path: Path to the permissions file
+        :param save_delay: Delay (in seconds) of saving after the change
+
+        :returns: Initialized :class:`PermissionIndex`
+        """
+
+        if not path.exists():
+            path.touch()
+
+        return cls(dict(tomlkit.loads(path.read_text())), path, save_delay)
+
+    ####
+
+    def _set(self, user_id: int, user_permissions: list[str | int]):
+        """Compiles and sets permissions of the user without saving
+
+        :param user_id: ID of the user
+        :param user_permissions: List with the permissions of the user
+        """
+
+        levels = [p for p in user_permissions if isinstance(p, int)]
+
+        self.raw[user_id]    = user_permissions
+        self.users[user_id]  = (max(levels) if levels else None,
+                                frozenset(p for p in user_permissions if isinstance(p, str)))
+
+        self.cache.clear()
+
+    def check(self, user_id: int, required: RequiredPermissions) -> bool:
+        """Checks if the user have required permissions (or above)
+
+        :param user_id: ID of the user
+        :param required: Compiled permissions of the command
+
+        :returns: True if user have required permissions, otherwise False
+        """
+
+        # key holds the object itself, so its ID can't be reused by another command while it is cached
+        key = (user_id, required)
+
+        result = self.cache.get(key)
+
+        if result is not None:
+            return result
+
+        user = self.users.get(user_id)
+
+        if required.any:
+            result = True
+        elif user is None:
+            result = False
+        else:
+            level, names = user
+
+            result = (level is not None and (level >= Permissions.Owner or
+                                             (required.min_level is not None and level >= required.min_level))) \
+                or not names.isdisjoint(required.names)
+
+        if len(self.cache) >= self.max_cache:
+            self.cache.clear()
+
+        self.cache[key] = result
+
+        return result
+
+    def clear_cache(self):
+        """Clears the cached check results. It must be called, when the commands are registered or rerouted"""
+
+        self.cache.clear()
+
+    def get(self, user_id: int) -> list[str | int]:
+        """Gets the permissions of the user
+
+        :param user_id: ID of the user
+
+        :returns: List with the permissions of the user (empty list if user doesn't have permissions)
+        """
+
+        return list(self.raw.get(user_id, []))
+
+    ####
+
+    def set(self, user_id: int, user_permissions: list[str | int], save: bool = True):
+        """Sets the permissions of the user
+
+        :param user_id: ID of the user
+        :param user_permissions: List with the permissions of the user
+        :param save: Save the change to the file
+        """
+
+        self._set(user_id, list(user_permissions))
+
+        if save:
+            self._schedule_save(user_id)
+
+    def grant(self, user_id: int, permission: str | int, save: bool = True):
+        """Adds a permission to the user
+
+        :param user_id: ID of the user
+        :param permission: Permission to add
+        :param save: Save the change to the file
+        """
+
+        user_permissions = self.get(user_id)
+
+        if permission in user_permissions:
+            return
+
+        self.set(user_id, user_permissions + [permission], save)
+
+    def revoke(self, user_id: int, permission: str | int, save: bool = True):
+        """Removes a permission from the user
+
+        :param user_id: ID of the user
+        :param permission: Permission to remove
+        :param save: Save the change to the file
+        """
+
+        user_permissions = self.get(user_id)
+
+        if permission not in user_permissions:
+            return
+
+        user_permissions.remove(permission)
+
+        self.set(user_id, user_permissions, save)
+
+    def remove(self, user_id: int, save: bool = True):
+        """Removes all permissions of the user
+
+        :param user_id: ID of the user
+        :param save: Save the change to the file
+        """
+
+        if user_id not in self.raw:
+            return
+
+        del self.raw[user_id]
+        del self.users[user_id]
+
+        self.cache.clear()
+
+        if save:
+            self._schedule_save(user_id)
+
+    ####
+
+    def _schedule_save(self, user_id: int):
+        """Schedules saving of the changed user. If there is no running event loop, saves immediately
+
+        :param user_id: ID of the changed user
+        """
+
+        if self.path is None:
+            return
+
+        self._unsaved.add(user_id)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(self.save_delay, self.flush)
+
+    def flush(self):
+        """Saves the changed users to the permissions file (if there are changes)"""
+
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+
+        if self.path is None or not self._unsaved:
+            return
+
+        # update only the changed users, other content of the file (comments, formatting) is kept
+        document = tomlkit.loads(self.path.read_text()) if self.path.exists() else tomlkit.document()
+
+        for user_id in self._unsaved:
+            if user_id in self.raw:
+                document[str(user_id)] = self.raw[user_id]
+            else:
+                document.pop(str(user_id), None)
+
+        self.path.write_text(tomlkit.dumps(document))
+
+        self._unsaved.clear()
+        self.saves += 1
+
+    def to_dict(self) -> dict[int, list[str | int]]:
+        """Converts the index to the permissions dictionary
+
+        :returns: Dictionary with the permissions of the users
+        """
+
+        return {user_id: list(p) for user_id, p in self.raw.items()}
@@ -8,10 +8,16 @@ from . import ezlog
 from .context import Context
 from .translator import Translator
 from .argumentparser import ArgumentParser, Argument
-from .permissions import Permissions
+from .permissions import Permissions, RequiredPermissions
+from .ratelimit import RateLimit
 from .instancecontext import InstanceContext
 
-from .types import TOMLDict, PluginEventFunction, PluginCommand
+from .triggers import Trigger
+from .subscriptions import Subscription, UpdateFilter
+
+from telethon.events.raw import EventBuilder
+
+from .types import TOMLDict, PluginEventFunction, PluginCommand, PluginTrigger, PluginUpdateHandler
 from enum import Enum, auto
 from typing import Self, Any, Coroutine, Callable
 
@@ -46,6 +52,9 @@ class Plugin:
     :ivar enabled: Plugin is enabled? When plugin is disabled, all commands and other will not work
     :ivar failed: Plugin is failed? When plugin is failed, it works as disabled. Failing is going on exceptions
     :ivar commands: Dictionary with the commands of the plugin
+    :ivar triggers: List with the triggers of the plugin
+    :ivar subscriptions: List with the subscriptions of the plugin to the updates
+    :ivar chat_mask: Bitmask of the plugin in the :class:`ChatEnablement` (set by the :class:`PluginLoader`)
     :ivar mod: Module of this plugin
     :ivar on_install_funcs: List with the binders to on_install event
     :ivar on_setup_funcs: List with the binders to on_setup event
@@ -74,6 +83,10 @@ class Plugin:
         self.failed: bool   = False
 
         self.commands: dict[str, PluginCommand]  = {}
+        self.triggers: list[Trigger]             = []
+        self.subscriptions: list[Subscription]   = []
+
+        self.chat_mask: int = 0
 
         self.mod = None
 
@@ -89,6 +102,16 @@ class Plugin:
         self.logger.error('{}', 'Plugin failed')
         self.failed = True
 
+        self._update_routes()
+
+    def _update_routes(self):
+        """Updates routes of the plugin in the :class:`PluginLoader` (if it is initialized)"""
+
+        if self.context is None or self.context.instance is None or self.context.instance.pluginloader is None:
+            return
+
+        self.context.instance.pluginloader.update_routes(self)
+
     def is_installed(self) -> bool:
         """Checks for the .installed file in the plugin directory.
 
@@ -250,13 +273,19 @@ class Plugin:
                          function: PluginCommand,
                          names: list[str] | str | None = None,
                          arguments: list[Argument] | ArgumentParser | None = None,
-                         permissions: list[str | Permissions] | None = None) -> PluginCommand:
+                         permissions: list[str | Permissions] | None = None,
+                         cooldown: float | None = None,
+                         rate: tuple[int, float] | None = None) -> PluginCommand:
         """Registers a command. You may use :func:`command` decorator to more comfortable
 
         :param function: Function to register
         :param names: Names of the command
         :param arguments: Arguments of the command
         :param permissions: Permissions for the command
+        :param cooldown: Minimal time (in seconds) between the command calls by one user
+        :param rate: Tuple with the maximum number of the command calls by one user and period (in seconds)
+
+        :raises ValueError: When the cooldown or rate isn't positive
         """
 
         # initialize names
@@ -276,14 +305,34 @@ class Plugin:
         if permissions is None:
             permissions = [Permissions.User, f'{self.config["name"]}.{function.__name__}']
 
-        function.permissions  = permissions
-        function.parser       = arguments
-        function.plugin       = self
+        # initialize rate limits
+        rate_limits = []
+
+        if cooldown is not None:
+            rate_limits.append(RateLimit.from_cooldown(cooldown))
+
+        if rate is not None:
+            rate_limits.append(RateLimit.from_rate(rate))
+
+        function.permissions           = permissions
+        function.required_permissions  = RequiredPermissions(permissions)
+        function.parser                = arguments
+        function.plugin                = self
+        function.rate_limits           = rate_limits
 
         # register command with it names
         for n in names:
             self.commands[n.lower()] = function
 
+        # cached permission checks of the replaced command must not be reused
+        if self.context is not None and self.context.instance is not None \
+                and self.context.instance.pluginloader is not None:
+            self.context.instance.pluginloader.clear_permissions_cache()
+
+        # commands, registered after the plugin load, must be routed too
+        if self.loaded:
+            self._update_routes()
+
         return function
 
     def remove_command(self, command_names_or_function: str | list[str | PluginCommand] | PluginCommand) -> bool:
@@ -295,11 +344,12 @@ class Plugin:
         """
 
         if isinstance(command_names_or_function, str):
-            if command_names_or_function in self.commands and \
-                    command_names_or_function in self.context.instance.pluginloader.commands:
-                # remove name from the dicts
-                self.commands.pop(command_names_or_function)
-                self.context.instance.pluginloader.commands.pop(command_names_or_function)
+            name = command_names_or_function.lower()
+
+            if name in self.commands:
+                # remove name from the dict and update the routing table
+                self.commands.pop(name)
+                self._update_routes()
 
                 return True
 
@@ -311,17 +361,16 @@ class Plugin:
 
             return all(results)
 
-        elif isinstance(command_names_or_function, Coroutine):
-
-            # iterate lists and delete values by key
+        elif callable(command_names_or_function):
+            names = [k for k, v in self.commands.items() if v is command_names_or_function]
 
-            for k, v in self.commands.items():
-                if v is command_names_or_function:
-                    self.commands.pop(k)
+            # delete values by key
+            for k in names:
+                self.commands.pop(k)
 
-            for k, v in self.context.instance.pluginloader.commands:
-                if v is command_names_or_function:
-                    self.context.instance.pluginloader.commands.pop(k)
+            if names:
+                self._update_routes()
+                return True
 
         self.logger.debug('Cannot to remove command "{}"', command_names_or_function)
 
@@ -332,15 +381,134 @@ class Plugin:
     def command(self,
                 names: list[str] | str | None = None,
                 arguments: list[Argument] | ArgumentParser | None = None,
-                permissions: list[str | Permissions] | None = None):
+                permissions: list[str | Permissions] | None = None,
+                cooldown: float | None = None,
+                rate: tuple[int, float] | None = None):
         """Registers a command
 
         :param names: Names of the command
         :param arguments: Arguments of the command
         :param permissions: Permissions for the command
+        :param cooldown: Minimal time (in seconds) between the command calls by one user
+        :param rate: Tuple with the maximum number of the command calls by one user and period (in seconds)
         """
 
         def deco(func: PluginCommand) -> PluginCommand:
-            return self.register_command(func, names, arguments, permissions)
+            return self.register_command(func, names, arguments, permissions, cooldown, rate)
+
+        return deco
+
+    ####
+
+    def register_trigger(self,
+                         function: PluginTrigger,
+                         pattern: str,
+                         regex: bool = False,
+                         ignore_case: bool = True) -> PluginTrigger:
+        """Registers a trigger. Trigger function is called on every new message, that contains the keyword or
+        matches the regular expression. You may use :func:`trigger` decorator to more comfortable
+
+        :param function: Function to register. It takes the event and matched keyword (str) or match object
+        :param pattern: Keyword or regular expression
+        :param regex: Pattern is a regular expression
+        :param ignore_case: Ignore case of the text
+        """
+
+        self.triggers.append(Trigger(function, pattern, regex, ignore_case, self))
+
+        # triggers, registered after the plugin load, must be routed too
+        if self.loaded:
+            self._update_routes()
+
+        return function
+
+    def remove_trigger(self, function: PluginTrigger) -> bool:
+        """Removes all triggers of the function
+
+        :param function: Function of the trigger
+
+        :returns: True if any trigger is removed, otherwise False
+        """
+
+        triggers = [t for t in self.triggers if t.function is not function]
+
+        if len(triggers) == len(self.triggers):
+            self.logger.debug('Cannot to remove trigger "{}"', function)
+            return False
+
+        self.triggers = triggers
+        self._update_routes()
+
+        return True
+
+    def trigger(self, pattern: str, regex: bool = False, ignore_case: bool = True):
+        """Registers a trigger
+
+        :param pattern: Keyword or regular expression
+        :param regex: Pattern is a regular expression
+        :param ignore_case: Ignore case of the text
+        """
+
+        def deco(func: PluginTrigger) -> PluginTrigger:
+            return self.register_trigger(func, pattern, regex, ignore_case)
+
+        return deco
+
+    ####
+
+    def register_update_handler(self,
+                                function: PluginUpdateHandler,
+                                event_type: type[EventBuilder],
+                                chats: int | list[int] | None = None,
+                                filter: UpdateFilter | None = None) -> PluginUpdateHandler:
+        """Subscribes a function to the updates. Function is called only with the updates of the given type
+        from the given chats. You may use :func:`on_event` decorator to more comfortable
+
+        :param function: Function to register. It takes the event
+        :param event_type: Type of the event builder from Telethon (such as ``events.ChatAction``)
+        :param chats: ID or list with the IDs of the chats (None for all chats)
+        :param filter: Function that takes the event and returns True if it must be delivered
+        """
+
+        self.subscriptions.append(Subscription(function, event_type, chats, filter, self))
+
+        # subscriptions, registered after the plugin load, must be routed too
+        if self.loaded:
+            self._update_routes()
+
+        return function
+
+    def remove_update_handler(self, function: PluginUpdateHandler) -> bool:
+        """Removes all subscriptions of the function
+
+        :param function: Function of the subscription
+
+        :returns: True if any subscription is removed, otherwise False
+        """
+
+        subscriptions = [s for s in self.subscriptions if s.function is not function]
+
+        if len(subscriptions) == len(self.subscriptions):
+            self.logger.debug('Cannot to remove update handler "{}"', function)
+            return False
+
+        self.subscriptions = subscriptions
+        self._update_routes()
+
+        return True
+
+    def on_event(self,
+                 event_type: type[EventBuilder],
+                 chats: int | list[int] | None = None,
+                 filter: UpdateFilter | None = None):
+        """Subscribes a function to the updates
+
+        :param event_type: Type of the event builder from Telethon (such as ``events.ChatAction``)
+        :param chats: ID or list with the IDs of the chats (None for all chats)
+        :param filter: Function that takes the event and returns True if it must be delivered
+        """
+
+        def deco(func: PluginUpdateHandler) -> PluginUpdateHandler:
+            return self.register_update_handler(func, event_type, chats, filter)
 
         return deco
@@ -7,14 +7,20 @@ import tomlkit
 import importlib
 import importlib.util
 
+from types import MappingProxyType
+
 from . import ezlog
 from .context import Context
 from .plugin import PluginType, Plugin
+from .triggers import TriggerEngine
+from .subscriptions import SubscriptionIndex
+from .chatenablement import ChatEnablement
+from .suggestions import SuggestionIndex
 from .utils import check_config, load_runtime_config, get_translator_for_plugin, sort_by_priority
 
 from .types import PluginCommand
 
-from typing import Callable
+from typing import Callable, Mapping
 
 __all__ = ['PluginLoader', 'PluginManageFunction']
 
@@ -50,7 +56,16 @@ class PluginLoader:
     :ivar logger: Logger of the PluginLoader
     :ivar plugins_group: Group of logger for the plugins
     :ivar context: Working context
-    :ivar commands: Dict with the commands
+    :ivar commands: Routing table (read-only mapping) with the commands of the loaded, enabled and not failed plugins.
+                    It is never changed in place, new table is swapped in on every change
+    :ivar plugin_routes: Dictionary with the normalized routes of every routed plugin
+    :ivar collisions: List with the detected collisions of the commands names (tuple: name, routed plugin, plugin)
+    :ivar swaps: Number of the routing table swaps
+    :ivar triggers: :class:`TriggerEngine` with the triggers of the loaded, enabled and not failed plugins
+    :ivar subscriptions: :class:`SubscriptionIndex` with the subscriptions of the loaded, enabled and not failed plugins
+    :ivar chat_enablement: :class:`ChatEnablement` with the plugins and commands disabled in the separate chats
+    :ivar suggestions: :class:`SuggestionIndex` with the names of the routed commands. It is built on the first miss
+                       after the routing table swap (None if it is not built yet)
     """
 
     def __init__(self, plugins_dir: pathlib.Path, translator_lang: str):
@@ -68,7 +83,14 @@ class PluginLoader:
         self.plugins_group: ezlog.LoggerGroup | None  = None
         self.context: Context | None                  = None
 
-        self.commands: dict[str, PluginCommand] = {}
+        self.commands: Mapping[str, PluginCommand]                = MappingProxyType({})
+        self.plugin_routes: dict[Plugin, dict[str, PluginCommand]]  = {}
+        self.collisions: list[tuple[str, Plugin, Plugin]]           = []
+        self.swaps: int                                             = 0
+        self.triggers: TriggerEngine                                = TriggerEngine()
+        self.subscriptions: SubscriptionIndex                       = SubscriptionIndex()
+        self.chat_enablement: ChatEnablement                        = ChatEnablement()
+        self.suggestions: SuggestionIndex | None                    = None
 
     ####
 
@@ -184,7 +206,7 @@ class PluginLoader:
     def load_plugin(self, plugin: Plugin):
         """Loads a :class:`Plugin`, if it is not failed.
         Loads the runtime config and translator, after calls method :func:`Plugin._load()`
-        Also, adds all plugin commands to PluginLoader `commands` dictionary
+        Also, adds all plugin commands to PluginLoader `commands` routing table
 
 
         :param plugin: :class:`Plugin` to load
@@ -206,12 +228,12 @@ class PluginLoader:
             self.logger.exception('Exception while call "{}" method', 'load()', exception=e)
 
         # register all plugin commands
-        self.commands.update(plugin.commands)
+        self.update_routes(plugin)
 
     def unload_plugin(self, plugin: Plugin):
         """Unloads a :class:`Plugin`, if it is not failed.
         Unloads the runtime config and sets translator to None, after calls method :func:`Plugin._unload()`
-        Also, deletes all plugin commands from PluginLoader `commands` dictionary
+        Also, deletes all plugin commands from PluginLoader `commands` routing table
 
         :param plugin: :class:`Plugin` to unload
         """
@@ -232,8 +254,7 @@ class PluginLoader:
             self.logger.exception('Exception while call "{}" method', 'unload()', exception=e)
 
         # remove all commands of the plugin
-        for key in plugin.commands:
-            self.commands.pop(key)
+        self.update_routes(plugin)
 
     def start_plugin(self, plugin: Plugin):
         """Starts a :class:`Plugin`, if it is not failed
@@ -335,23 +356,192 @@ class PluginLoader:
 
         self.apply_on_plugins('Starting {} plugins', self.start_plugin)
 
+    def enable_plugin(self, plugin: Plugin, persist: bool = True):
+        """Enables a :class:`Plugin` and adds its commands to the routing table
+
+        :param plugin: :class:`Plugin` to enable
+        :param persist: Remove the ".disabled" file of the plugin
+        """
+
+        plugin.enabled = True
+
+        if persist:
+            (plugin.dir / '.disabled').unlink(missing_ok=True)
+
+        self.update_routes(plugin)
+
+    def disable_plugin(self, plugin: Plugin, persist: bool = True):
+        """Disables a :class:`Plugin` and removes its commands from the routing table
+
+        :param plugin: :class:`Plugin` to disable
+        :param persist: Create the ".disabled" file of the plugin
+        """
+
+        plugin.enabled = False
+
+        if persist:
+            (plugin.dir / '.disabled').touch()
+
+        self.update_routes(plugin)
+
     ####
 
-    def get_command(self, command: str) -> PluginCommand | None:
-        """Tries to get a command from `commands` dictionary
+    def clear_permissions_cache(self):
+        """Clears the cached permission checks of the instance (if it is initialized)"""
 
-        :param command: Command name
+        instance = self.context.instance if self.context is not None else None
 
-        :returns: PluginCommand function, if command is exists and parent plugin of command is enabled and not failed.
-                  Otherwise, returns None"""
-        # check if command is exists
-        if command not in self.commands:
-            return
+        if instance is not None and instance.permissions is not None:
+            instance.permissions.clear_cache()
 
-        command = self.commands[command]
+    def update_routes(self, plugin: Plugin):
+        """Rebuilds routes (commands, triggers and subscriptions) of the plugin and swaps in the new routing table.
+        Routes of other plugins are not rebuilt. Plugin is routed only if it is loaded, enabled and not failed
+
+        :param plugin: :class:`Plugin` to rebuild routes
+        """
 
-        # check if plugin of command is enabled and not failed
-        if not command.plugin.enabled or command.plugin.failed:
+        routed = plugin.loaded and plugin.enabled and not plugin.failed
+
+        # cached permission checks may belong to the replaced commands
+        self.clear_permissions_cache()
+
+        # set the per-chat enablement masks, so the dispatching doesn't search the names
+        if routed:
+            self.update_chat_masks(plugin)
+
+        # update triggers of the plugin
+        if plugin in self.triggers.plugin_triggers or (routed and plugin.triggers):
+            try:
+                self.triggers.update_plugin(plugin, plugin.triggers if routed else [])
+            except Exception as e:
+                # triggers of other plugins must be kept
+                self.logger.error('Triggers of the plugin {} can\'t be routed, they are skipped', plugin.config['name'])
+                self.logger.exception('Exception:', exception=e)
+
+                self.triggers.update_plugin(plugin, [])
+
+        # update subscriptions of the plugin
+        if plugin in self.subscriptions.plugin_subscriptions or (routed and plugin.subscriptions):
+            self.subscriptions.update_plugin(plugin, plugin.subscriptions if routed else [])
+
+        routes = {}
+
+        if routed:
+            routes = {name.lower(): command for name, command in plugin.commands.items()}
+
+        old_routes = self.plugin_routes.pop(plugin, {})
+
+        if not old_routes and not routes:
             return
 
-        return command
+        table = dict(self.commands)
+
+        # remove old routes of the plugin, names shadowed by them are given to other plugins
+        for name, command in old_routes.items():
+            if table.get(name) is not command:
+                continue
+
+            del table[name]
+
+            for other_routes in self.plugin_routes.values():
+                if name in other_routes:
+                    table[name] = other_routes[name]
+                    break
+
+        # add new routes of the plugin
+        for name, command in routes.items():
+            routed_command = table.get(name)
+
+            if routed_command is not None and routed_command.plugin is not plugin:
+                self.collisions.append((name, routed_command.plugin, plugin))
+                self.logger.warning('Command {} of plugin {} collides with command of plugin {}, it is skipped',
+                                    name, plugin.config['name'], routed_command.plugin.config['name'])
+                continue
+
+            table[name] = command
+
+        if routes:
+            self.plugin_routes[plugin] = routes
+
+        # swap the routing table, so the dispatching never sees a half-updated table
+        self.commands     = MappingProxyType(table)
+        self.suggestions  = None
+        self.swaps        += 1
+
+    def update_chat_masks(self, plugin: Plugin):
+        """Sets the bitmasks of the plugin and its commands in the :class:`ChatEnablement`.
+        Mask of the command includes the mask of the plugin, so one check is enough
+
+        :param plugin: :class:`Plugin` to update
+        """
+
+        plugin_name       = plugin.config['name']
+        plugin.chat_mask  = self.chat_enablement.mask(plugin_name)
+
+        # the first name of the command is used as the unit name
+        first_names = {}
+
+        for name, command in plugin.commands.items():
+            first_names.setdefault(command, name)
+
+        for command, name in first_names.items():
+            command.chat_unit  = f'{plugin_name}:{name}'
+            command.chat_mask  = plugin.chat_mask | self.chat_enablement.mask(command.chat_unit)
+
+    def resolve_chat_unit(self, name: str) -> str | None:
+        """Resolves a name of the plugin or command to the unit name of the :class:`ChatEnablement`
+
+        :param name: Name of the plugin or command (case-insensitive)
+
+        :returns: Unit name (plugin name or "plugin:command"), or None if there is no plugin or command with the name
+        """
+
+        for plugin in self.plugins:
+            if plugin.config['name'].lower() == name.lower():
+                return plugin.config['name']
+
+        command = self.commands.get(name.lower())
+
+        return command.chat_unit if command is not None else None
+
+    def get_command(self, command: str, chat_id: int | None = None) -> PluginCommand | None:
+        """Tries to get a command from `commands` routing table
+
+        :param command: Command name (case-insensitive)
+        :param chat_id: ID of the chat. If it is set, command must be enabled in the chat
+
+        :returns: PluginCommand function, if command is exists and parent plugin of command is loaded, enabled and
+                  not failed. Otherwise, returns None"""
+
+        routed_command = self.commands.get(command.lower())
+
+        if routed_command is None or chat_id is None:
+            return routed_command
+
+        return routed_command if self.chat_enablement.is_enabled(chat_id, routed_command.chat_mask) else None
+
+    def suggest_commands(self,
+                         command: str,
+                         chat_id: int | None = None,
+                         max_distance: int = 2,
+                         limit: int = 3) -> list[str]:
+        """Finds names of the commands close to the given name ("did you mean")
+
+        :param command: Command name (case-insensitive)
+        :param chat_id: ID of the chat. If it is set, only commands enabled in the chat are suggested
+        :param max_distance: Maximal Levenshtein distance of the suggested names
+        :param limit: Maximum number of the suggested names
+
+        :returns: List with the suggested names, sorted by the distance
+        """
+
+        if self.suggestions is None:
+            self.suggestions = SuggestionIndex(self.commands)
+
+        names = self.suggestions.search(command.lower(), max_distance)
+
+        if chat_id is not None:
+            names = [n for n in names if self.get_command(n, chat_id) is not None]
+
+        return names[:limit]
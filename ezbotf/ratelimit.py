@@ -0,0 +1,170 @@
+"""
+Defines :class:`RateLimit` and :class:`RateLimiter` classes that helps to limit the commands usage by the users
+"""
+
+import time
+
+from typing import Hashable, Self
+
+__all__ = ['RateLimit', 'RateLimiter']
+
+
+class RateLimit:
+    """Limit of the token bucket
+
+    :ivar capacity: Maximum number of the tokens in the bucket (burst)
+    :ivar refill_rate: Number of the tokens added to the bucket per second
+    :ivar throttled: Number of the requests throttled by this limit
+    """
+
+    __slots__ = ('capacity', 'refill_rate', 'throttled')
+
+    def __init__(self, capacity: float, refill_rate: float):
+        """
+        :param capacity: Maximum number of the tokens in the bucket (burst)
+        :param refill_rate: Number of the tokens added to the bucket per second
+        """
+
+        self.capacity     = capacity
+        self.refill_rate  = refill_rate
+        self.throttled    = 0
+
+    @classmethod
+    def from_cooldown(cls, cooldown: float) -> Self:
+        """Makes a limit that allows one request per ``cooldown`` seconds
+
+        :param cooldown: Cooldown in seconds
+
+        :returns: Initialized :class:`RateLimit`
+
+        :raises ValueError: When the cooldown isn't positive
+        """
+
+        if cooldown <= 0:
+            raise ValueError(f'Cooldown must be positive, got {cooldown}')
+
+        return cls(1, 1 / cooldown)
+
+    @classmethod
+    def from_rate(cls, rate: tuple[int, float]) -> Self:
+        """Makes a limit that allows ``rate[0]`` requests per ``rate[1]`` seconds
+
+        :param rate: Tuple with the number of requests and period in seconds
+
+        :returns: Initialized :class:`RateLimit`
+
+        :raises ValueError: When the number of requests or period isn't positive
+        """
+
+        if rate[0] <= 0 or rate[1] <= 0:
+            raise ValueError(f'Number of requests and period of the rate must be positive, got {rate}')
+
+        return cls(rate[0], rate[0] / rate[1])
+
+    @property
+    def refill_time(self) -> float:
+        """Time (in seconds) to refill an empty bucket"""
+
+        return self.capacity / self.refill_rate
+
+
+class RateLimiter:
+    """Token bucket limiter. Full buckets are equal to nonexistent, so they are expired by the timing wheel
+    and memory usage depends only on the recently active keys
+
+    :ivar tick: Duration (in seconds) of the one wheel slot
+    :ivar buckets: Dictionary with the buckets. Bucket is a tuple: tokens, update time, expire tick
+    :ivar wheel: List with the slots (sets of the keys) of the timing wheel
+    :ivar current_tick: Last processed tick of the wheel
+    :ivar allowed: Number of the allowed requests
+    :ivar throttled: Number of the throttled requests
+    """
+
+    def __init__(self, wheel_size: int = 256, tick: float = 1.0):
+        """
+        :param wheel_size: Number of the slots in the timing wheel
+        :param tick: Duration (in seconds) of the one wheel slot
+        """
+
+        self.tick = tick
+
+        self.buckets: dict[Hashable, tuple[float, float, int]]  = {}
+        self.wheel: list[set[Hashable]]                         = [set() for _ in range(wheel_size)]
+        self.current_tick: int                                  = int(time.monotonic() / tick)
+
+        self.allowed: int    = 0
+        self.throttled: int  = 0
+
+    def _advance(self, tick: int):
+        """Expires buckets of all slots passed since the last processed tick
+
+        :param tick: Current tick
+        """
+
+        wheel_size  = len(self.wheel)
+        steps       = min(tick - self.current_tick, wheel_size)
+
+        for t in range(tick - steps + 1, tick + 1):
+            index = t % wheel_size
+            slot  = self.wheel[index]
+
+            if not slot:
+                continue
+
+            self.wheel[index] = set()
+
+            for key in slot:
+                bucket = self.buckets.get(key)
+
+                if bucket is None:
+                    continue
+
+                if bucket[2] <= tick:
+                    del self.buckets[key]
+                else:
+                    # bucket was updated or expires after the full turn of the wheel
+                    self.wheel[bucket[2] % wheel_size].add(key)
+
+        self.current_tick = tick
+
+    def allow(self, key: Hashable, limit: RateLimit, now: float | None = None) -> bool:
+        """Takes a token from the bucket of the key
+
+        :param key: Key of the bucket (for example, tuple with the sender ID and limit object)
+        :param limit: Limit of the bucket
+        :param now: Current monotonic time (by default is :func:`time.monotonic()`)
+
+        :returns: True if request is allowed, otherwise False (request is throttled)
+        """
+
+        if now is None:
+            now = time.monotonic()
+
+        tick = int(now / self.tick)
+
+        if tick > self.current_tick:
+            self._advance(tick)
+
+        bucket = self.buckets.get(key)
+
+        if bucket is None:
+            tokens = limit.capacity
+        else:
+            tokens = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.refill_rate)
+
+        if tokens < 1:
+            self.throttled   += 1
+            limit.throttled  += 1
+            return False
+
+        tokens -= 1
+
+        # tick, when the bucket will be full again
+        expire_tick = int((now + (limit.capacity - tokens) / limit.refill_rate) / self.tick) + 1
+
+        self.buckets[key] = (tokens, now, expire_tick)
+        self.wheel[expire_tick % len(self.wheel)].add(key)
+
+        self.allowed += 1
+
+        return True
@@ -0,0 +1,242 @@
+"""
+Defines :class:`CommandScheduler` that executes the commands concurrently with the per-chat ordering
+"""
+
+import time
+import asyncio
+
+from collections import deque
+
+from . import ezlog
+
+from typing import Any, Awaitable, Callable, Hashable
+
+__all__ = ['JobFactory', 'OverloadPolicy', 'CommandScheduler']
+
+JobFactory = Callable[[], Awaitable[Any]]
+JobFactory.__doc__ = 'A type-hint for the functions, that creates awaitable of the scheduled job'
+
+
+class OverloadPolicy:
+    """Stores policies of the :class:`CommandScheduler` when its queue is full
+
+    :ivar Reject: New job is rejected
+    :ivar DropOldest: Oldest queued job is dropped (shed) and new job is queued
+    """
+
+    Reject      = 'reject'
+    DropOldest  = 'drop_oldest'
+
+
+class CommandScheduler:
+    """Schedules the commands execution. Jobs of the one chat are executed strictly in FIFO order,
+    jobs of the different chats are executed in parallel, but not more than ``max_concurrency`` jobs at once.
+
+    Priority jobs (such as commands of the instance owner) are executed in the dedicated lane. This lane has
+    own queues and concurrency limit, and it is not bounded by the queue size, so the backlog of the regular
+    jobs never delays it
+
+    :ivar max_concurrency: Maximum number of the jobs executed at once
+    :ivar priority_concurrency: Maximum number of the priority jobs executed at once
+    :ivar max_queue: Maximum number of the queued (not started yet) jobs
+    :ivar overload_policy: Policy when the queue is full (see :class:`OverloadPolicy`)
+    :ivar logger: Logger of the scheduler
+    :ivar queues: Dictionary with the queues of the chats (key is a tuple: priority, chat ID)
+    :ivar queue_depth: Current number of the queued jobs
+    :ivar max_queue_depth: Maximum number of the queued jobs reached
+    :ivar running: Current number of the running jobs
+    :ivar submitted: Number of the submitted jobs
+    :ivar priority_submitted: Number of the submitted priority jobs
+    :ivar completed: Number of the completed jobs
+    :ivar failed: Number of the jobs that raised an exception
+    :ivar rejected: Number of the rejected jobs (queue is full)
+    :ivar shed: Number of the dropped queued jobs (queue is full)
+    :ivar total_wait_time: Total time (in seconds) spent by the jobs in the queue
+    :ivar max_wait_time: Maximum time (in seconds) spent by a job in the queue
+    :ivar total_run_time: Total time (in seconds) spent by the jobs execution
+    :ivar max_run_time: Maximum time (in seconds) spent by a job execution
+    """
+
+    def __init__(self,
+                 max_concurrency: int = 16,
+                 max_queue: int = 1024,
+                 overload_policy: str = OverloadPolicy.Reject,
+                 logger: ezlog.Logger | None = None,
+                 priority_concurrency: int = 4):
+        """
+        :param max_concurrency: Maximum number of the jobs executed at once
+        :param max_queue: Maximum number of the queued (not started yet) jobs
+        :param overload_policy: Policy when the queue is full (see :class:`OverloadPolicy`)
+        :param logger: Logger of the scheduler
+        :param priority_concurrency: Maximum number of the priority jobs executed at once
+        """
+
+        self.max_concurrency       = max_concurrency
+        self.priority_concurrency  = priority_concurrency
+        self.max_queue             = max_queue
+        self.overload_policy       = overload_policy
+        self.logger                = logger if logger is not None else ezlog.Logger('CommandScheduler')
+
+        self.queues: dict[tuple[bool, Hashable], deque[tuple[JobFactory, float]]] = {}
+
+        self._semaphore: asyncio.Semaphore | None           = None
+        self._priority_semaphore: asyncio.Semaphore | None  = None
+        self._runners: set[asyncio.Task]                    = set()
+
+        self.queue_depth: int      = 0
+        self.max_queue_depth: int  = 0
+        self.running: int          = 0
+
+        self.submitted: int           = 0
+        self.priority_submitted: int  = 0
+        self.completed: int           = 0
+        self.failed: int              = 0
+        self.rejected: int            = 0
+        self.shed: int                = 0
+
+        self.total_wait_time: float  = 0.0
+        self.max_wait_time: float    = 0.0
+        self.total_run_time: float   = 0.0
+        self.max_run_time: float     = 0.0
+
+    def submit(self, chat_id: Hashable, job: JobFactory, priority: bool = False) -> bool:
+        """Queues a job to execute in the chat. Must be called inside the running event loop
+
+        :param chat_id: ID of the chat (jobs of the one chat are executed in FIFO order)
+        :param job: Function that creates awaitable of the job. It is called only when the job is started
+        :param priority: Execute the job in the priority lane
+
+        :returns: True if the job is queued, otherwise False (job is rejected)
+        """
+
+        if self._semaphore is None:
+            self._semaphore           = asyncio.Semaphore(self.max_concurrency)
+            self._priority_semaphore  = asyncio.Semaphore(self.priority_concurrency)
+
+        if priority:
+            self.priority_submitted += 1
+        else:
+            if self.queue_depth >= self.max_queue:
+                if self.overload_policy != OverloadPolicy.DropOldest or not self._shed_oldest():
+                    self.rejected += 1
+                    self.logger.warning('Scheduler queue is full ({} jobs), job is rejected', self.queue_depth)
+                    return False
+
+            self.submitted += 1
+
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+        key    = (priority, chat_id)
+        queue  = self.queues.get(key)
+
+        if queue is not None:
+            # runner of the chat is already working, it will take the job
+            queue.append((job, time.monotonic()))
+            return True
+
+        self.queues[key] = deque([(job, time.monotonic())])
+
+        runner = asyncio.get_running_loop().create_task(self._run_chat(key))
+        self._runners.add(runner)
+        runner.add_done_callback(self._runners.discard)
+
+        return True
+
+    def _shed_oldest(self) -> bool:
+        """Drops the oldest queued job
+
+        :returns: True if the job is dropped, otherwise False
+        """
+
+        oldest_queue  = None
+        oldest_time   = None
+
+        for (priority, _), queue in self.queues.items():
+            if priority:
+                continue
+
+            if queue and (oldest_time is None or queue[0][1] < oldest_time):
+                oldest_queue  = queue
+                oldest_time   = queue[0][1]
+
+        if oldest_queue is None:
+            return False
+
+        oldest_queue.popleft()
+
+        self.queue_depth  -= 1
+        self.shed         += 1
+        self.logger.warning('Scheduler queue is full, the oldest job is dropped')
+
+        return True
+
+    async def _run_chat(self, key: tuple[bool, Hashable]):
+        """Executes the jobs of the chat one by one, while chat queue is not empty
+
+        :param key: Key of the chat queue (tuple: priority, chat ID)
+        """
+
+        priority   = key[0]
+        queue      = self.queues[key]
+        semaphore  = self._priority_semaphore if priority else self._semaphore
+
+        try:
+            while queue:
+                async with semaphore:
+                    # job may be dropped while the runner was waiting
+                    if not queue:
+                        break
+
+                    job, queued_at = queue.popleft()
+                    started_at = time.monotonic()
+
+                    if not priority:
+                        self.queue_depth -= 1
+
+                    self.running += 1
+
+                    wait_time             = started_at - queued_at
+                    self.total_wait_time  += wait_time
+                    self.max_wait_time    = max(self.max_wait_time, wait_time)
+
+                    try:
+                        await job()
+                        self.completed += 1
+                    except Exception as e:
+                        self.failed += 1
+                        self.logger.error('Exception has been occurred while executing the scheduled job')
+                        self.logger.exception('Exception:', exception=e)
+                    finally:
+                        self.running -= 1
+
+                        run_time             = time.monotonic() - started_at
+                        self.total_run_time  += run_time
+                        self.max_run_time    = max(self.max_run_time, run_time)
+        finally:
+            self.queues.pop(key, None)
+
+    def stats(self) -> dict[str, int | float]:
+        """Gets the statistics of the scheduler
+
+        :returns: Dictionary with the statistics (queue depth, counters, wait and run times)
+        """
+
+        started = self.completed + self.failed + self.running
+
+        return {
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'running': self.running,
+            'submitted': self.submitted,
+            'priority_submitted': self.priority_submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'shed': self.shed,
+            'avg_wait_time': self.total_wait_time / started if started else 0.0,
+            'max_wait_time': self.max_wait_time,
+            'avg_run_time': self.total_run_time / (self.completed + self.failed)
+                            if self.completed + self.failed else 0.0,
+            'max_run_time': self.max_run_time
+        }
@@ -0,0 +1,154 @@
+"""
+Defines :class:`SubscriptionIndex` that delivers the Telegram updates only to the plugins, subscribed to
+the type of the update and its chat
+"""
+
+from telethon.events.raw import EventBuilder
+
+from .types import PluginUpdateHandler
+
+from typing import Any, Callable, Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .plugin import Plugin
+
+__all__ = ['UpdateFilter', 'Subscription', 'SubscriptionIndex']
+
+UpdateFilter = Callable[[EventBuilder], bool]
+UpdateFilter.__doc__ = 'A type-hint for the filters of the subscriptions'
+
+
+class Subscription:
+    """Subscription of the plugin to the updates
+
+    :ivar function: Function to call with the event
+    :ivar event_type: Type of the event builder from Telethon (such as ``events.ChatAction``)
+    :ivar chats: Frozenset with the IDs of the chats (None if subscription is for all chats)
+    :ivar filter: Function that takes the event and returns True if it must be delivered (may be None)
+    :ivar plugin: Parent plugin of the subscription
+    :ivar dispatched: Number of the delivered events
+    :ivar filtered: Number of the events rejected by the filter
+    """
+
+    __slots__ = ('function', 'event_type', 'chats', 'filter', 'plugin', 'dispatched', 'filtered')
+
+    def __init__(self,
+                 function: PluginUpdateHandler,
+                 event_type: type[EventBuilder],
+                 chats: int | Iterable[int] | None,
+                 filter_: UpdateFilter | None,
+                 plugin: 'Plugin'):
+        """
+        :param function: Function to call with the event
+        :param event_type: Type of the event builder from Telethon
+        :param chats: ID or IDs of the chats (None for all chats)
+        :param filter_: Function that takes the event and returns True if it must be delivered
+        :param plugin: Parent plugin of the subscription
+        """
+
+        self.function    = function
+        self.event_type  = event_type
+        self.chats       = frozenset([chats] if isinstance(chats, int) else chats) if chats is not None else None
+        self.filter      = filter_
+        self.plugin      = plugin
+
+        self.dispatched: int  = 0
+        self.filtered: int    = 0
+
+
+class SubscriptionIndex:
+    """Index of the plugins subscriptions by the event type and chat ID. Finding subscriptions of the update
+    doesn't depend on the number of the plugins and subscriptions
+
+    :ivar plugin_subscriptions: Dictionary with the subscriptions of every plugin
+    :ivar index: Dictionary with the subscriptions by event type, and by chat ID (None key is for all chats)
+    :ivar event_types: Set with the event types, that have been subscribed at least once
+    :ivar on_new_type: Function that is called with the event type, when it is subscribed first time
+                       (:class:`BotInstance` registers the handler of the type in it)
+    :ivar rebuilds: Number of the rebuilds
+    """
+
+    def __init__(self):
+        self.plugin_subscriptions: dict['Plugin', list[Subscription]]                     = {}
+        self.index: dict[type[EventBuilder], dict[int | None, tuple[Subscription, ...]]]  = {}
+        self.event_types: set[type[EventBuilder]]                                         = set()
+
+        self.on_new_type: Callable[[type[EventBuilder]], Any] | None = None
+
+        self.rebuilds: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.plugin_subscriptions)
+
+    def update_plugin(self, plugin: 'Plugin', subscriptions: list[Subscription]):
+        """Sets subscriptions of the plugin and rebuilds the index
+
+        :param plugin: Plugin to update
+        :param subscriptions: List with the subscriptions of the plugin (empty list removes the plugin)
+        """
+
+        self.plugin_subscriptions.pop(plugin, None)
+
+        if subscriptions:
+            self.plugin_subscriptions[plugin] = list(subscriptions)
+
+        index = {}
+
+        for plugin_subscriptions in self.plugin_subscriptions.values():
+            for s in plugin_subscriptions:
+                by_chat = index.setdefault(s.event_type, {})
+
+                for chat_id in (s.chats if s.chats is not None else [None]):
+                    by_chat[chat_id] = by_chat.get(chat_id, ()) + (s, )
+
+        # subscriptions for all chats are added to the every chat, so the dispatching needs one lookup
+        for by_chat in index.values():
+            common = by_chat.get(None, ())
+
+            if common:
+                for chat_id in by_chat:
+                    if chat_id is not None:
+                        by_chat[chat_id] = common + by_chat[chat_id]
+
+        # swap the index, so the dispatching never sees a half-updated index
+        self.index     = index
+        self.rebuilds  += 1
+
+        for event_type in index:
+            if event_type not in self.event_types:
+                self.event_types.add(event_type)
+
+                if self.on_new_type is not None:
+                    self.on_new_type(event_type)
+
+    def get(self, event_type: type[EventBuilder], chat_id: int | None) -> tuple[Subscription, ...]:
+        """Gets the subscriptions to the update
+
+        :param event_type: Type of the event builder
+        :param chat_id: ID of the chat of the update (may be None)
+
+        :returns: Tuple with the subscriptions (without filters checking)
+        """
+
+        by_chat = self.index.get(event_type)
+
+        if by_chat is None:
+            return ()
+
+        subscriptions = by_chat.get(chat_id)
+
+        return subscriptions if subscriptions is not None else by_chat.get(None, ())
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Gets the dispatch statistics of every subscription
+
+        :returns: List with the dictionaries (plugin name, event type, function name, dispatched and filtered events)
+        """
+
+        return [{
+            'plugin': s.plugin.config['name'] if s.plugin.config is not None else None,
+            'event_type': s.event_type.__name__,
+            'function': getattr(s.function, '__name__', repr(s.function)),
+            'dispatched': s.dispatched,
+            'filtered': s.filtered
+        } for subscriptions in self.plugin_subscriptions.values() for s in subscriptions]
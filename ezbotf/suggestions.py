@@ -0,0 +1,151 @@
+"""
+Defines :class:`SuggestionIndex` that helps to find the closest command names ("did you mean")
+"""
+
+from collections import Counter
+from itertools import chain
+
+from typing import Iterable
+
+__all__ = ['pattern_masks', 'levenshtein', 'SuggestionIndex']
+
+
+def pattern_masks(pattern: str) -> dict[str, int]:
+    """Makes the bitmasks of the characters positions in the pattern for :func:`levenshtein`
+
+    :param pattern: Pattern string
+
+    :returns: Dictionary with the bitmasks by characters
+    """
+
+    masks = {}
+
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+
+    return masks
+
+
+def levenshtein(pattern: str, text: str, masks: dict[str, int] | None = None) -> int:
+    """Calculates the Levenshtein distance between two strings by the bit-parallel algorithm (Myers, Hyyrö).
+    Columns of the distance matrix are calculated as the bitwise operations on the integers, so it takes
+    one pass over the text
+
+    :param pattern: First string
+    :param text: Second string
+    :param masks: Result of the :func:`pattern_masks` for the pattern (it may be reused for many texts)
+
+    :returns: Distance between the strings
+    """
+
+    length = len(pattern)
+
+    if not length:
+        return len(text)
+
+    if masks is None:
+        masks = pattern_masks(pattern)
+
+    full      = (1 << length) - 1
+    last      = 1 << (length - 1)
+    positive  = full
+    negative  = 0
+    distance  = length
+
+    for char in text:
+        equal       = masks.get(char, 0)
+        vertical    = equal | negative
+        horizontal  = (((equal & positive) + positive) ^ positive) | equal
+
+        h_positive  = negative | (~(horizontal | positive) & full)
+        h_negative  = positive & horizontal
+
+        if h_positive & last:
+            distance += 1
+        elif h_negative & last:
+            distance -= 1
+
+        h_positive  = ((h_positive << 1) | 1) & full
+        h_negative  = (h_negative << 1) & full
+
+        positive  = h_negative | (~(vertical | h_positive) & full)
+        negative  = h_positive & vertical
+
+    return distance
+
+
+class SuggestionIndex:
+    """Index of the names by the character bigrams. Every edit changes at most two bigrams, so the close names
+    must share the most bigrams with the searched name. Only these candidates are compared by the distance,
+    and counting of the shared bigrams is done over the short postings lists instead of all names
+
+    :ivar names: List with the indexed names
+    :ivar lengths: List with the lengths of the names
+    :ivar postings: Dictionary with the indexes of the names by bigram
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        """
+        :param names: Names to index (duplicates are skipped)
+        """
+
+        self.names: list[str]                = list(dict.fromkeys(names))
+        self.lengths: list[int]              = [len(n) for n in self.names]
+        self.postings: dict[str, list[int]]  = {}
+
+        for i, name in enumerate(self.names):
+            for bigram in self._bigrams(name):
+                self.postings.setdefault(bigram, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @staticmethod
+    def _bigrams(name: str) -> set[str]:
+        """Gets the bigrams of the name (with the start and end marks)
+
+        :param name: Name to split
+
+        :returns: Set with the bigrams
+        """
+
+        name = f'\x02{name}\x03'
+
+        return {name[i:i + 2] for i in range(len(name) - 1)}
+
+    def search(self, name: str, max_distance: int = 2, limit: int | None = None) -> list[str]:
+        """Finds the names close to the given name
+
+        :param name: Name to search
+        :param max_distance: Maximal Levenshtein distance of the found names
+        :param limit: Maximum number of the found names (None is unlimited)
+
+        :returns: List with the found names, sorted by the distance
+        """
+
+        bigrams    = self._bigrams(name)
+        threshold  = len(bigrams) - 2 * max_distance
+
+        # too short name may have no shared bigrams with the close names, so all names are candidates
+        if threshold <= 0:
+            candidates = range(len(self.names))
+        else:
+            counts      = Counter(chain.from_iterable(self.postings.get(b, ()) for b in bigrams))
+            candidates  = [i for i, count in counts.items() if count >= threshold]
+
+        masks   = pattern_masks(name)
+        length  = len(name)
+        found   = []
+
+        for i in candidates:
+            if abs(self.lengths[i] - length) > max_distance:
+                continue
+
+            distance = levenshtein(name, self.names[i], masks)
+
+            if distance <= max_distance:
+                found.append((distance, self.names[i]))
+
+        found.sort()
+
+        return [n for _, n in found[:limit]]
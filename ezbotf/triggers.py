@@ -0,0 +1,297 @@
+"""
+Defines :class:`TriggerEngine` that matches all triggers (keywords and regular expressions) of the plugins
+with the message text by the one pass
+"""
+
+import re
+
+from .types import PluginTrigger
+
+from typing import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .plugin import Plugin
+
+__all__ = ['Trigger', 'KeywordAutomaton', 'TriggerEngine']
+
+# matches start of the named group in the regular expression
+_GROUP_NAME_RE = re.compile(r'\(\?P<\w+>')
+
+# matches references to the groups (numbers of the groups are shifted in the alternation, names are removed)
+_GROUP_REFERENCE_RE = re.compile(r'\\[1-9]|\\g<|\(\?P=|\(\?\(')
+
+
+def _merged_pattern(pattern: str, ignore_case: bool) -> str:
+    """Makes the pattern of the regular expression for the alternation of the :class:`TriggerEngine`
+
+    :param pattern: Regular expression of the trigger
+    :param ignore_case: Ignore case of the text
+
+    :returns: Pattern without the group names, wrapped to the group with the flags
+    """
+
+    return f'{"(?i:" if ignore_case else "(?:"}{_GROUP_NAME_RE.sub("(", pattern)})'
+
+
+class Trigger:
+    """Trigger of the plugin
+
+    :ivar function: Function to call, when trigger is matched
+    :ivar pattern: Keyword or regular expression
+    :ivar regex: Pattern is a regular expression
+    :ivar ignore_case: Ignore case of the text
+    :ivar plugin: Parent plugin of the trigger
+    :ivar compiled: Compiled regular expression (None if trigger is a keyword)
+    :ivar mergeable: Regular expression may be matched in the alternation of the :class:`TriggerEngine`
+                     (it doesn't have references to the groups and global flags)
+    """
+
+    __slots__ = ('function', 'pattern', 'regex', 'ignore_case', 'plugin', 'compiled', 'mergeable')
+
+    def __init__(self, function: PluginTrigger, pattern: str, regex: bool, ignore_case: bool, plugin: 'Plugin'):
+        """
+        :param function: Function to call, when trigger is matched
+        :param pattern: Keyword or regular expression
+        :param regex: Pattern is a regular expression
+        :param ignore_case: Ignore case of the text
+        :param plugin: Parent plugin of the trigger
+
+        :raises re.error: When the regular expression is incorrect
+        """
+
+        self.function     = function
+        self.pattern      = pattern
+        self.regex        = regex
+        self.ignore_case  = ignore_case
+        self.plugin       = plugin
+        self.compiled     = re.compile(pattern, re.IGNORECASE if ignore_case else 0) if regex else None
+        self.mergeable    = regex and _GROUP_REFERENCE_RE.search(pattern) is None
+
+        # global flags (such as "(?s)") are allowed only at the start of the whole expression
+        if self.mergeable:
+            try:
+                re.compile(_merged_pattern(pattern, ignore_case))
+            except re.error:
+                self.mergeable = False
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton. Finds all keywords in the text by the one pass
+
+    :ivar goto: List with the transitions of the states (dict: character, next state)
+    :ivar fail: List with the fail links of the states
+    :ivar output: List with the keywords ended in the states (including keywords by the fail links)
+    """
+
+    def __init__(self, keywords: list[str]):
+        """
+        :param keywords: List with the keywords
+        """
+
+        self.goto: list[dict[str, int]]  = [{}]
+        self.fail: list[int]             = [0]
+        self.output: list[tuple[str]]    = [()]
+
+        # build the trie
+        for keyword in keywords:
+            if not keyword:
+                continue
+
+            state = 0
+
+            for char in keyword:
+                next_state = self.goto[state].get(char)
+
+                if next_state is None:
+                    next_state = len(self.goto)
+
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+
+                    self.goto[state][char] = next_state
+
+                state = next_state
+
+            if keyword not in self.output[state]:
+                self.output[state] += (keyword, )
+
+        # build the fail links by the breadth-first traversal
+        queue = list(self.goto[0].values())
+
+        for state in queue:
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+
+                fail_state = self.fail[state]
+
+                while fail_state and char not in self.goto[fail_state]:
+                    fail_state = self.fail[fail_state]
+
+                fail_target = self.goto[fail_state].get(char, 0)
+
+                self.fail[next_state]    = fail_target if fail_target != next_state else 0
+                self.output[next_state]  += self.output[self.fail[next_state]]
+
+    def search(self, text: str) -> set[str]:
+        """Finds all keywords in the text
+
+        :param text: Text to search in
+
+        :returns: Set with the found keywords
+        """
+
+        goto    = self.goto
+        fail    = self.fail
+        output  = self.output
+
+        found  = set()
+        state  = 0
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+
+            state = goto[state].get(char, 0)
+
+            if output[state]:
+                found.update(output[state])
+
+        return found
+
+
+class TriggerEngine:
+    """Combines triggers of all plugins. Keywords are compiled to the one :class:`KeywordAutomaton` (one for the
+    case-sensitive keywords, one for the others), regular expressions are compiled to the one alternation.
+    Texts without the matches are scanned once regardless of the triggers number.
+    The alternation is used as the prefilter: if it matches, every regular expression is matched by itself
+    from the first matched position, so the overlapping matches of the different triggers are found too.
+    Regular expressions, that can't be merged (with references to the groups or global flags), are matched
+    one by one.
+
+    :ivar plugin_triggers: Dictionary with the triggers of every plugin
+    :ivar keywords: Dictionary with the triggers by keywords (key is a tuple: ignore case, keyword)
+    :ivar regexes: List with the triggers by regular expressions, that are merged to the alternation
+    :ivar fallback_regexes: List with the triggers by regular expressions, that are matched one by one
+    :ivar automaton: Automaton of the case-sensitive keywords
+    :ivar automaton_ic: Automaton of the case-insensitive keywords (keywords are lowercased)
+    :ivar pattern: Compiled alternation of the regular expressions
+    :ivar rebuilds: Number of the rebuilds
+    """
+
+    def __init__(self):
+        self.plugin_triggers: dict['Plugin', list[Trigger]]  = {}
+
+        self.keywords: dict[tuple[bool, str], list[Trigger]]  = {}
+        self.regexes: list[Trigger]                           = []
+        self.fallback_regexes: list[Trigger]                  = []
+
+        self.automaton: KeywordAutomaton | None     = None
+        self.automaton_ic: KeywordAutomaton | None  = None
+        self.pattern: re.Pattern | None             = None
+
+        self.rebuilds: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.plugin_triggers)
+
+    def update_plugin(self, plugin: 'Plugin', triggers: list[Trigger]):
+        """Sets triggers of the plugin. Only the changed kind of triggers (keywords or regular expressions) is rebuilt
+
+        :param plugin: Plugin to update
+        :param triggers: List with the triggers of the plugin (empty list removes the plugin)
+        """
+
+        old_triggers = self.plugin_triggers.pop(plugin, [])
+
+        if triggers:
+            self.plugin_triggers[plugin] = list(triggers)
+
+        changed = old_triggers + list(triggers)
+
+        if any(not t.regex for t in changed):
+            self._build_keywords()
+
+        if any(t.regex for t in changed):
+            self._build_regexes()
+
+        self.rebuilds += 1
+
+    def _build_keywords(self):
+        """Builds the keywords automatons"""
+
+        self.keywords = {}
+
+        for triggers in self.plugin_triggers.values():
+            for t in triggers:
+                if not t.regex:
+                    key = (t.ignore_case, t.pattern.lower() if t.ignore_case else t.pattern)
+                    self.keywords.setdefault(key, []).append(t)
+
+        sensitive    = [k for ic, k in self.keywords if not ic]
+        insensitive  = [k for ic, k in self.keywords if ic]
+
+        self.automaton     = KeywordAutomaton(sensitive) if sensitive else None
+        self.automaton_ic  = KeywordAutomaton(insensitive) if insensitive else None
+
+    def _build_regexes(self):
+        """Builds the alternation of the regular expressions"""
+
+        regexes = [t for triggers in self.plugin_triggers.values() for t in triggers if t.regex]
+
+        self.regexes           = [t for t in regexes if t.mergeable]
+        self.fallback_regexes  = [t for t in regexes if not t.mergeable]
+        self.pattern           = None
+
+        if not self.regexes:
+            return
+
+        # names of the groups are removed, because the same names may be used in the different triggers
+        try:
+            self.pattern = re.compile('|'.join(_merged_pattern(t.pattern, t.ignore_case) for t in self.regexes))
+        except re.error:
+            # every expression is compiled by itself, so they still may be matched one by one
+            self.fallback_regexes  = regexes
+            self.regexes           = []
+
+    def match(self, text: str) -> list[tuple[Trigger, Any]]:
+        """Matches the text with all triggers
+
+        :param text: Text to match
+
+        :returns: List with the tuples: matched trigger, matched keyword (str) or match object (re.Match).
+                  Every trigger is returned once
+        """
+
+        matched = []
+
+        if self.automaton is not None:
+            for keyword in self.automaton.search(text):
+                matched += [(t, keyword) for t in self.keywords[(False, keyword)]]
+
+        if self.automaton_ic is not None:
+            for keyword in self.automaton_ic.search(text.lower()):
+                matched += [(t, keyword) for t in self.keywords[(True, keyword)]]
+
+        if self.pattern is not None:
+            # the alternation only finds the first position, where any expression is matched (matched spans are
+            # consumed, so the overlapping matches of the other expressions are lost), so every expression is
+            # matched again by itself from that position
+            m = self.pattern.search(text)
+
+            if m is not None:
+                start = m.start()
+
+                for trigger in self.regexes:
+                    trigger_match = trigger.compiled.search(text, start)
+
+                    if trigger_match is not None:
+                        matched.append((trigger, trigger_match))
+
+        for trigger in self.fallback_regexes:
+            m = trigger.compiled.search(text)
+
+            if m is not None:
+                matched.append((trigger, m))
+
+        return matched
@@ -9,7 +9,8 @@ from typing import Any, Callable, Coroutine, Self
 from telethon.events.raw import EventBuilder
 
 __all__ = ['TOMLDict', 'PermissionsList', 'PermissionsDict', 'VersionSpecific', 'PLUGIN_REQUIREMENT_ONE_CHECK',
-           'PLUGIN_REQUIREMENT_TWO_CHECKS', 'REQUIRED_PLUGINS_LIST', 'PluginEventFunction', 'PluginCommand']
+           'PLUGIN_REQUIREMENT_TWO_CHECKS', 'REQUIRED_PLUGINS_LIST', 'PluginEventFunction', 'PluginCommand',
+           'PluginTrigger', 'PluginUpdateHandler']
 
 
 TOMLDict = dict[str, Any]
@@ -25,3 +26,5 @@ REQUIRED_PLUGINS_LIST          = list[PLUGIN_REQUIREMENT_ONE_CHECK | PLUGIN_REQU
 
 PluginEventFunction = Callable[[Self], None]
 PluginCommand       = Coroutine[EventBuilder, Context, None]
+PluginTrigger       = Coroutine[EventBuilder, Any, None]
+PluginUpdateHandler = Coroutine[EventBuilder, None, None]
@@ -2,6 +2,7 @@
 Some utilities (in most for plugins) of framework
 """
 
+import copy
 import tomlkit
 import pathlib
 import hashlib
@@ -25,7 +26,7 @@ from .types import TOMLDict, PermissionsList, PermissionsDict, VersionSpecific,
 
 nest_asyncio.apply()
 
-__all__ = ['check_config', 'check_config_by_path', 'get_translator_for_plugin', 'load_runtime_config',
+__all__ = ['check_config', 'check_config_by_path', 'set_config_defaults', 'get_translator_for_plugin', 'load_runtime_config',
            'install_requirements_by_path', 'install_requirements', 'check_required_plugins',
            'run_coroutine_without_await', 'compare_versions', 'mask_phone_number', 'sort_by_priority',
            'load_permissions', 'have_permissions']
@@ -72,6 +73,25 @@ def check_config_by_path(config: TOMLDict, requires: TOMLDict) -> bool:
     return True
 
 
+def set_config_defaults(config: TOMLDict, defaults: TOMLDict):
+    """Sets the default values to the config, if they are not defined. Nested dictionaries are processed recursively
+
+    :param config: Config dictionary to fill
+    :param defaults: Dictionary with the default values
+    """
+
+    for key, value in defaults.items():
+        if isinstance(value, dict):
+            if key not in config:
+                config[key] = {}
+
+            set_config_defaults(config[key], value)
+            continue
+
+        if key not in config:
+            config[key] = copy.deepcopy(value)
+
+
 ####
 
 
@@ -392,21 +412,26 @@ def have_permissions(user_id: int,
     :param required_permissions: Required permissions
 
     :returns: True if the user have required permissions (or above), otherwise False
+
+    .. seealso:: :class:`ezbotf.PermissionIndex` - compiled index, that is used by the instance
     """
 
-    if user_id not in permissions:
-        return Permissions.Any in command_permissions
+    # keys of the permissions loaded from the TOML file are strings
+    user_permissions = permissions.get(user_id, permissions.get(str(user_id)))
+
+    if user_permissions is None:
+        return Permissions.Any in required_permissions
 
-    if Permissions.Owner in permissions[user_id]:
+    if Permissions.Owner in user_permissions:
         return True
 
     # check the permissions for user
-    for permission in permissions[user_id]:
-        if permission in command_permissions:
+    for permission in user_permissions:
+        if permission in required_permissions:
             return True
 
         if isinstance(permission, int):
-            for cmd_permission in command_permissions:
+            for cmd_permission in required_permissions:
                 if not isinstance(cmd_permission, int):
                     continue
 